@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""benchmarks.bench_import
+
+Measures how long a fresh interpreter takes to import explicit modules.
+
+Each module is imported in a new subprocess, repeatedly, and the median
+import time (measured inside the subprocess, excluding interpreter
+start up) is compared with a limit. Short-lived worker processes pay
+this cost on every start.
+
+Usage::
+
+    python -m benchmarks.bench_import                 # check against the limits
+    python -m benchmarks.bench_import --repeat 50
+
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+LIMITS = {
+    'explicit': 0.02,
+    'explicit.waiter': 0.04,
+}
+""" dict: Maps each module to the most seconds its median import may take"""
+
+REPEAT = 15
+""" int: Default number of fresh interpreters per module"""
+
+_TIMER = ('import time; started = time.perf_counter(); import {0}; '
+          'print(time.perf_counter() - started)')
+
+
+def measure(module, repeat=REPEAT):
+    """ Return the median seconds taken to import module in a fresh interpreter """
+    times = [float(subprocess.check_output([sys.executable, '-c', _TIMER.format(module)]))
+             for _ in range(repeat)]
+    return statistics.median(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--repeat', type=int, default=REPEAT, help='interpreters per module')
+    args = parser.parse_args(argv)
+
+    regressions = []
+    print('{0:<20} {1:>12} {2:>12}'.format('module', 'median (ms)', 'limit (ms)'))
+    for module, limit in sorted(LIMITS.items()):
+        median = measure(module, repeat=args.repeat)
+        print('{0:<20} {1:>12.1f} {2:>12.1f}'.format(module, median * 1000, limit * 1000))
+        if median > limit:
+            regressions.append('{0}: {1:.1f}ms, limit {2:.1f}ms'.format(
+                module, median * 1000, limit * 1000))
+
+    for regression in regressions:
+        print('REGRESSION ' + regression)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""benchmarks.bench_waiter
+
+Measures the explicit.waiter functions against the fake WebDriver server,
+across simulated network latencies and locator counts.
+
+For each scenario the wall time, the number of WebDriver commands sent and
+the CPU time used are recorded. Results can be saved as a baseline and
+later runs compared against it, failing when a scenario sends more
+commands than the baseline, or runs slower by more than the tolerance.
+
+Usage::
+
+    python -m benchmarks.bench_waiter                  # compare with the baseline
+    python -m benchmarks.bench_waiter --save           # record a new baseline
+    python -m benchmarks.bench_waiter --latency 0.05   # only one latency
+
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from explicit import cache, waiter, CSS, ID
+
+from benchmarks.fake_webdriver import FakeWebDriver
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+""" str: Default location of the stored baseline"""
+
+LATENCIES = (0.0, 0.02, 0.08)
+""" tuple: Simulated per-command latencies, in seconds"""
+
+LOCATOR_COUNTS = (1, 3, 6)
+""" tuple: Numbers of fallback locators given to find_one"""
+
+APPEAR_AFTER = 0.3
+""" float: Seconds before the waited for elements appear"""
+
+TOLERANCE = 0.25
+""" float: Fraction by which a scenario's wall time may exceed the baseline"""
+
+SLACK = 0.05
+""" float: Seconds a scenario's wall time may exceed the baseline by regardless"""
+
+
+def _find_element(driver, server):
+    server.add_element(ID, 'target', appear_after=APPEAR_AFTER)
+    waiter.find_element(driver, 'target', by=ID)
+
+
+def _find_element_observed(driver, server):
+    server.add_element(ID, 'target', appear_after=APPEAR_AFTER)
+    waiter.find_element(driver, 'target', by=ID, observe=True)
+
+
+def _find_elements(driver, server):
+    for _ in range(5):
+        server.add_element(CSS, 'li.row', appear_after=APPEAR_AFTER)
+    waiter.find_elements(driver, 'li.row')
+
+
+def _find_element_repeated(cached):
+    def scenario(driver, server):
+        server.add_element(ID, 'target')
+        if cached:
+            cache.enable(driver)
+        try:
+            for _ in range(5):
+                waiter.find_element(driver, 'target', by=ID)
+        finally:
+            cache.disable(driver)
+    return scenario
+
+
+def _find_write(driver, server):
+    server.add_element(CSS, 'input.name', appear_after=APPEAR_AFTER)
+    waiter.find_write(driver, 'input.name', 'value', send_enter=True)
+
+
+def _find_write_many(driver, server):
+    fields = {}
+    for index in range(6):
+        path = 'input.field-{0}'.format(index)
+        server.add_element(CSS, path, appear_after=APPEAR_AFTER)
+        fields[path] = 'value {0}'.format(index)
+    waiter.find_write_many(driver, fields)
+
+
+def _find_one(count, batch):
+    def scenario(driver, server):
+        locators = ['div.option-{0}'.format(index) for index in range(count)]
+        server.add_element(CSS, locators[-1], appear_after=APPEAR_AFTER)
+        waiter.find_one(driver, locators, batch=batch)
+    return scenario
+
+
+def scenarios():
+    """ Return (name, scenario) pairs. A scenario is called with a driver and the server """
+    found = [
+        ('find_element', _find_element),
+        ('find_element[observe]', _find_element_observed),
+        ('find_elements', _find_elements),
+        ('find_element[x5]', _find_element_repeated(cached=False)),
+        ('find_element[x5,cached]', _find_element_repeated(cached=True)),
+        ('find_write', _find_write),
+        ('find_write_many[6]', _find_write_many),
+    ]
+    for count in LOCATOR_COUNTS:
+        found.append(('find_one[{0}]'.format(count), _find_one(count, batch=False)))
+        found.append(('find_one[{0},batch]'.format(count), _find_one(count, batch=True)))
+    return found
+
+
+def run(latencies=LATENCIES, repeat=1, only=None):
+    """ Run every scenario at every latency
+
+    Args:
+        latencies (iterable): Simulated per-command latencies, in seconds
+        repeat (int): Runs per scenario; the fastest run is kept
+        only (str): Only run scenarios whose names contain this string
+
+    Returns:
+        dict: Maps 'scenario@latency' to a dict of wall, cpu and commands
+    """
+    results = {}
+    with FakeWebDriver() as server:
+        driver = server.new_driver()
+        try:
+            for latency in latencies:
+                server.latency = latency
+                for name, scenario in scenarios():
+                    if only and only not in name:
+                        continue
+                    key = '{0}@{1}ms'.format(name, int(latency * 1000))
+                    results[key] = min((_measure(scenario, driver, server)
+                                        for _ in range(repeat)), key=lambda r: r['wall'])
+        finally:
+            server.latency = 0
+            driver.quit()
+    return results
+
+
+def _measure(scenario, driver, server):
+    """ Run a scenario once, returning its wall time, CPU time and command count """
+    server.reset()
+    wall, cpu = time.perf_counter(), time.process_time()
+    scenario(driver, server)
+    return {'wall': round(time.perf_counter() - wall, 4),
+            'cpu': round(time.process_time() - cpu, 4),
+            'commands': server.total_commands}
+
+
+def compare(results, baseline, tolerance=TOLERANCE, slack=SLACK):
+    """ Return a list of regression messages, comparing results with a baseline """
+    regressions = []
+    for key, result in sorted(results.items()):
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if result['commands'] > base['commands']:
+            regressions.append('{0}: {1} commands, baseline {2}'.format(
+                key, result['commands'], base['commands']))
+        if result['wall'] > base['wall'] * (1 + tolerance) + slack:
+            regressions.append('{0}: {1:.3f}s wall, baseline {2:.3f}s'.format(
+                key, result['wall'], base['wall']))
+    return regressions
+
+
+def report(results, baseline):
+    """ Print a table of results beside the baseline """
+    print('{0:<32} {1:>9} {2:>9} {3:>9} {4:>13}'.format(
+        'scenario', 'wall (s)', 'cpu (s)', 'commands', 'base wall/cmd'))
+    for key, result in sorted(results.items()):
+        base = baseline.get(key)
+        base_text = '{0:.3f}/{1}'.format(base['wall'], base['commands']) if base else '-'
+        print('{0:<32} {1:>9.3f} {2:>9.3f} {3:>9} {4:>13}'.format(
+            key, result['wall'], result['cpu'], result['commands'], base_text))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--baseline', default=BASELINE, help='baseline JSON file')
+    parser.add_argument('--save', action='store_true', help='save results as the baseline')
+    parser.add_argument('--latency', type=float, action='append',
+                        help='simulated latency in seconds (repeatable)')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per scenario')
+    parser.add_argument('--only', help='only run scenarios containing this string')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='allowed fractional wall time increase')
+    args = parser.parse_args(argv)
+
+    results = run(latencies=args.latency or LATENCIES, repeat=args.repeat, only=args.only)
+
+    if args.save:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write('\n')
+        report(results, {})
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    report(results, baseline)
+
+    regressions = compare(results, baseline, tolerance=args.tolerance)
+    for regression in regressions:
+        print('REGRESSION ' + regression)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+"""benchmarks.fake_webdriver
+
+An in-process HTTP server speaking enough of the W3C WebDriver protocol
+to drive the explicit.waiter functions through a real Selenium Remote
+webdriver, without a browser.
+
+The page is a flat list of scripted elements, each appearing a set time
+after the server is reset. Every command can be delayed by a fixed
+latency, simulating the round trip to a remote Grid, and every command
+received is counted.
+
+The scripts explicit runs in the browser are recognised and emulated
+against the scripted elements; any other script returns null.
+
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from selenium import webdriver
+
+from explicit import _scripts
+
+W3C_ELEMENT = 'element-6066-11e4-a52e-4f735466cecf'
+
+SESSION_ID = 'fake-session'
+
+
+class FakeElement(object):
+    """ A scripted element
+
+    Args:
+        elem_id (str): WebDriver element id
+        using (str): W3C locator strategy the element matches
+        value (str): Locator value the element matches
+        appear_after (float): Seconds after a reset before the element is present
+        text (str): The element's text
+        attributes (dict): The element's attributes
+    """
+    def __init__(self, elem_id, using, value, appear_after=0.0, text='', attributes=None):
+        self.id = elem_id
+        self.using = using
+        self.value = value
+        self.appear_after = appear_after
+        self.text = text
+        self.attributes = dict(attributes or {})
+        self.typed = ''
+
+    def ref(self):
+        """ Return the element's W3C reference """
+        return {W3C_ELEMENT: self.id}
+
+
+class FakeWebDriver(ThreadingMixIn, HTTPServer):
+    """ Fake WebDriver server, serving from a background thread
+
+    Use as a context manager, or call start() and stop().
+
+    Args:
+        latency (float): Seconds to delay every command by
+        host (str): Interface to listen on
+        port (int): Port to listen on, 0 to pick a free port
+
+    Attributes:
+        commands (Counter): Number of each command received since the last reset
+    """
+    daemon_threads = True
+
+    def __init__(self, latency=0.0, host='127.0.0.1', port=0):
+        HTTPServer.__init__(self, (host, port), _Handler)
+        self.latency = latency
+        self.commands = Counter()
+        self.elements = []
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def url(self):
+        """ str: Command executor URL for webdriver.Remote """
+        return 'http://{0}:{1}'.format(*self.server_address)
+
+    @property
+    def total_commands(self):
+        """ int: Number of commands received since the last reset """
+        return sum(self.commands.values())
+
+    def start(self):
+        """ Start serving in a background thread """
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """ Stop serving and close the socket """
+        self.shutdown()
+        self.server_close()
+
+    def new_driver(self):
+        """ Return a Selenium Remote webdriver connected to this server """
+        return webdriver.Remote(command_executor=self.url, keep_alive=True,
+                                desired_capabilities={'browserName': 'fake'})
+
+    def reset(self):
+        """ Remove every element, zero the command counts and restart the clock """
+        with self._lock:
+            self.elements = []
+            self.commands.clear()
+            self.started = time.time()
+
+    def add_element(self, by, path, appear_after=0.0, text='', attributes=None):
+        """ Script an element matching a locator
+
+        Args:
+            by (selenium By): Selenium By reference the element matches
+            path (str): Locator path the element matches
+            appear_after (float): Seconds after the last reset before it's present
+            text (str): The element's text
+            attributes (dict): The element's attributes
+
+        Returns:
+            FakeElement: The scripted element
+        """
+        using, value = w3c_locator(by, path)
+        with self._lock:
+            elem = FakeElement('el-{0}'.format(len(self.elements) + 1), using, value,
+                               appear_after=appear_after, text=text, attributes=attributes)
+            self.elements.append(elem)
+        return elem
+
+    def find(self, using, value):
+        """ Return the elements currently present which match a W3C locator """
+        now = time.time() - self.started
+        with self._lock:
+            return [elem for elem in self.elements
+                    if (elem.using, elem.value) == (using, value) and elem.appear_after <= now]
+
+    def element(self, elem_id):
+        """ Return a scripted element by id, or None """
+        with self._lock:
+            for elem in self.elements:
+                if elem.id == elem_id:
+                    return elem
+        return None
+
+    def run_script(self, script, args):
+        """ Emulate one of explicit's scripts, returning its JSON result """
+        if script == _scripts.FIND_ALL:
+            return [[elem.ref() for elem in self.find(*w3c_locator(*loc))] for loc in args[0]]
+
+        if script == _scripts.FILL:
+            found = [self.find(*w3c_locator(by, path)) for by, path, _ in args[0]]
+            if not all(found):
+                return None
+            for elems, field in zip(found, args[0]):
+                elems[0].typed = field[2] if args[1] else elems[0].typed + field[2]
+            return [elems[0].ref() for elems in found]
+
+        if script == _scripts.OBSERVE:
+            end_time = time.time() + args[3] / 1000.0
+            while True:
+                found = self.find(*w3c_locator(args[0], args[1]))
+                if found:
+                    return [elem.ref() for elem in found]
+                if time.time() >= end_time:
+                    return None
+                time.sleep(0.005)
+
+        if 'isConnected' in script:
+            return True
+
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """ Routes WebDriver commands to the FakeWebDriver server """
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    routes = [
+        ('POST', r'^/session$', 'new_session'),
+        ('DELETE', r'^/session/[^/]+$', 'delete_session'),
+        ('POST', r'^/session/[^/]+/element$', 'find_element'),
+        ('POST', r'^/session/[^/]+/elements$', 'find_elements'),
+        ('POST', r'^/session/[^/]+/element/[^/]+/element$', 'find_element'),
+        ('POST', r'^/session/[^/]+/element/[^/]+/elements$', 'find_elements'),
+        ('POST', r'^/session/[^/]+/element/([^/]+)/clear$', 'clear'),
+        ('POST', r'^/session/[^/]+/element/([^/]+)/value$', 'send_keys'),
+        ('POST', r'^/session/[^/]+/element/([^/]+)/click$', 'click'),
+        ('GET', r'^/session/[^/]+/element/([^/]+)/text$', 'text'),
+        ('GET', r'^/session/[^/]+/element/([^/]+)/attribute/([^/]+)$', 'attribute'),
+        ('POST', r'^/session/[^/]+/execute/sync$', 'execute'),
+        ('POST', r'^/session/[^/]+/execute/async$', 'execute'),
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _dispatch(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        params = json.loads(body.decode('utf-8')) if body else {}
+
+        for route_method, pattern, name in self.routes:
+            match = re.match(pattern, self.path)
+            if route_method == method and match:
+                break
+        else:
+            name, match = 'unknown', None
+
+        server = self.server
+        with server._lock:
+            server.commands[name] += 1
+        if server.latency:
+            time.sleep(server.latency)
+
+        if match is None:
+            return self._respond(200, None)
+        getattr(self, '_' + name)(params, *match.groups())
+
+    def _respond(self, status, value):
+        payload = json.dumps({'value': value}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _error(self, error, message):
+        self._respond(404, {'error': error, 'message': message, 'stacktrace': ''})
+
+    def _element_or_error(self, elem_id):
+        elem = self.server.element(elem_id)
+        if elem is None:
+            self._error('no such element', 'Unknown element {0}'.format(elem_id))
+        return elem
+
+    def _new_session(self, params):
+        self._respond(200, {'sessionId': SESSION_ID, 'capabilities': {'browserName': 'fake'}})
+
+    def _delete_session(self, params):
+        self._respond(200, None)
+
+    def _find_element(self, params):
+        found = self.server.find(params['using'], params['value'])
+        if not found:
+            return self._error('no such element', 'Unable to locate element')
+        self._respond(200, found[0].ref())
+
+    def _find_elements(self, params):
+        found = self.server.find(params['using'], params['value'])
+        self._respond(200, [elem.ref() for elem in found])
+
+    def _clear(self, params, elem_id):
+        elem = self._element_or_error(elem_id)
+        if elem is not None:
+            elem.typed = ''
+            self._respond(200, None)
+
+    def _send_keys(self, params, elem_id):
+        elem = self._element_or_error(elem_id)
+        if elem is not None:
+            elem.typed += params.get('text', '')
+            self._respond(200, None)
+
+    def _click(self, params, elem_id):
+        if self._element_or_error(elem_id) is not None:
+            self._respond(200, None)
+
+    def _text(self, params, elem_id):
+        elem = self._element_or_error(elem_id)
+        if elem is not None:
+            self._respond(200, elem.text)
+
+    def _attribute(self, params, elem_id, name):
+        elem = self._element_or_error(elem_id)
+        if elem is not None:
+            self._respond(200, elem.attributes.get(name))
+
+    def _execute(self, params):
+        self._respond(200, self.server.run_script(params['script'], params.get('args', [])))
+
+
+def w3c_locator(by, value):
+    """ Translate a locator to the strategies W3C drivers accept, as Selenium does """
+    if by == 'id':
+        return 'css selector', '[id="{0}"]'.format(value)
+    if by == 'tag name':
+        return 'css selector', value
+    if by == 'class name':
+        return 'css selector', '.{0}'.format(value)
+    if by == 'name':
+        return 'css selector', '[name="{0}"]'.format(value)
+    return by, value
@@ -1,13 +1,36 @@
-from pbr.version import VersionInfo
-from selenium.webdriver.common.by import By
-
-__version__ = VersionInfo('explicit').semantic_version().release_string()
-
-CLASS_NAME = By.CLASS_NAME
-CSS = By.CSS_SELECTOR
-ID = By.ID
-LINK = By.LINK_TEXT
-NAME = By.NAME
-PARTIAL_LINK = By.PARTIAL_LINK_TEXT
-TAG = By.TAG_NAME
-XPATH = By.XPATH
+import importlib
+import sys
+
+# Selenium's By values, repeated here so importing explicit doesn't import selenium.webdriver
+CLASS_NAME = 'class name'
+CSS = 'css selector'
+ID = 'id'
+LINK = 'link text'
+NAME = 'name'
+PARTIAL_LINK = 'partial link text'
+TAG = 'tag name'
+XPATH = 'xpath'
+
+_SUBMODULES = ('aio', 'cache', 'deadline', 'dispatch', 'history', 'metrics', 'pool', 'profile',
+               'ratelimit', 'replay', 'runner', 'schedule', 'snapshot', 'trace', 'waiter')
+
+
+def _version():
+    """ Return the package version, read from its metadata by pbr """
+    from pbr.version import VersionInfo
+    return VersionInfo('explicit').semantic_version().release_string()
+
+
+def __getattr__(name):
+    """ Resolve __version__ and the submodules on first access """
+    if name == '__version__':
+        version = globals()['__version__'] = _version()
+        return version
+    if name in _SUBMODULES:
+        return importlib.import_module('explicit.' + name)
+    raise AttributeError("module 'explicit' has no attribute '{0}'".format(name))
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # Module __getattr__ needs Python 3.7
+    __version__ = _version()
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""explicit._scripts
+
+JavaScript sources executed in the browser by the waiter helpers.
+
+"""
+
+LOCATE = r'''
+var explicitLocate = function (by, path, root) {
+    var doc = root.ownerDocument || root;
+    var toArray = function (nodes) { return Array.prototype.slice.call(nodes); };
+    var quote = function (value) {
+        return '"' + String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"') + '"';
+    };
+    var linkText = function (link) {
+        return (link.innerText || link.textContent || '').trim();
+    };
+    switch (by) {
+    case 'css selector':
+        return toArray(root.querySelectorAll(path));
+    case 'id':
+        return toArray(root.querySelectorAll('[id=' + quote(path) + ']'));
+    case 'name':
+        return toArray(root.querySelectorAll('[name=' + quote(path) + ']'));
+    case 'class name':
+        return toArray(root.getElementsByClassName(path));
+    case 'tag name':
+        return toArray(root.getElementsByTagName(path));
+    case 'link text':
+        return toArray(root.querySelectorAll('a')).filter(function (link) {
+            return linkText(link) === path;
+        });
+    case 'partial link text':
+        return toArray(root.querySelectorAll('a')).filter(function (link) {
+            return linkText(link).indexOf(path) !== -1;
+        });
+    case 'xpath':
+        var snapshot = doc.evaluate(path, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var found = [];
+        for (var i = 0; i < snapshot.snapshotLength; i++) {
+            if (snapshot.snapshotItem(i).nodeType === 1) {
+                found.push(snapshot.snapshotItem(i));
+            }
+        }
+        return found;
+    }
+    throw new Error('Unsupported locator strategy: ' + by);
+};
+'''
+""" str: Defines explicitLocate(by, path, root), resolving a Selenium By locator in JS"""
+
+FIND_ALL = LOCATE + r'''
+var root = arguments[1] || document;
+return arguments[0].map(function (locator) {
+    return explicitLocate(locator[0], locator[1], root);
+});
+'''
+""" str: Resolve a list of [by, path] locators, returning one element list per locator"""
+
+OBSERVE = LOCATE + r'''
+var by = arguments[0], path = arguments[1], root = arguments[2] || document;
+var limit = arguments[3], done = arguments[arguments.length - 1];
+var doc = root.ownerDocument || root;
+var observer = null, timer = null, finished = false;
+var finish = function (found) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    if (observer) {
+        observer.disconnect();
+    }
+    if (timer) {
+        clearTimeout(timer);
+    }
+    done(found);
+};
+var check = function () {
+    var found = explicitLocate(by, path, root);
+    if (found.length) {
+        finish(found);
+    }
+};
+check();
+if (!finished) {
+    observer = new MutationObserver(check);
+    observer.observe(doc.documentElement || doc,
+                     {childList: true, subtree: true, attributes: true});
+    timer = setTimeout(function () { finish(null); }, limit);
+}
+'''
+""" str: Async script resolving with the located elements as soon as a DOM mutation
+adds them, or with null once the observation window (in milliseconds) expires"""
+
+FILL = LOCATE + r'''
+var fields = arguments[0], clearFirst = arguments[1], root = arguments[2] || document;
+var elems = [];
+for (var i = 0; i < fields.length; i++) {
+    var found = explicitLocate(fields[i][0], fields[i][1], root);
+    if (!found.length) {
+        return null;
+    }
+    elems.push(found[0]);
+}
+elems.forEach(function (elem, index) {
+    var value = (clearFirst ? '' : elem.value) + fields[index][2];
+    // Use the prototype's setter so frameworks tracking the value see the change
+    var descriptor = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(elem), 'value');
+    if (elem.focus) {
+        elem.focus();
+    }
+    if (descriptor && descriptor.set) {
+        descriptor.set.call(elem, value);
+    } else {
+        elem.value = value;
+    }
+    elem.dispatchEvent(new Event('input', {bubbles: true}));
+    elem.dispatchEvent(new Event('change', {bubbles: true}));
+});
+return elems;
+'''
+""" str: Locate every [by, path, value] field and, once all are present, set their
+values firing input and change events. Returns the elements, or null if any are missing"""
+
+SNAPSHOT = LOCATE + r'''
+var by = arguments[0], path = arguments[1], root = arguments[2];
+if (document.readyState !== 'complete') {
+    return null;
+}
+if (path && !explicitLocate(by, path, root || document).length) {
+    return null;
+}
+return (root || document.documentElement).outerHTML;
+'''
+""" str: Return the serialized DOM (of the root element, or the whole document) once
+the document has loaded and, if a [by, path] locator is given, it matches"""
+
+EXTRACT = LOCATE + r'''
+var by = arguments[0], path = arguments[1], names = arguments[2];
+var root = arguments[3] || document, start = arguments[4], count = arguments[5];
+var found = explicitLocate(by, path, root);
+if (!found.length) {
+    return null;
+}
+var read = function (elem) {
+    if (names === null) {
+        var text = elem.innerText === undefined ? elem.textContent : elem.innerText;
+        return (text || '').trim();
+    }
+    return names.map(function (name) {
+        // Prefer the property, as Selenium's get_attribute does
+        var value = elem[name];
+        if (value === undefined || value === null || typeof value === 'object' ||
+                typeof value === 'function') {
+            return elem.getAttribute(name);
+        }
+        return value;
+    });
+};
+var end = count === null ? found.length : Math.min(found.length, start + count);
+var values = [];
+for (var i = start; i < end; i++) {
+    values.push(read(found[i]));
+}
+return {total: found.length, values: values};
+'''
+""" str: Locate elements and read the text, or the list of named attributes, of those
+from start up to count of them. Returns {total, values}, or null if none are located"""
+
+DEEP_FIND = LOCATE + r'''
+var by = arguments[0], path = arguments[1];
+var search = function (root) {
+    // Shadow roots lack the getElementsBy* methods explicitLocate uses for these
+    if (!root.getElementsByTagName && (by === 'class name' || by === 'tag name')) {
+        var selector = by === 'tag name' ? path : '.' + CSS.escape(path);
+        return Array.prototype.slice.call(root.querySelectorAll(selector));
+    }
+    return explicitLocate(by, path, root);
+};
+var roots = [document], found = [], frames = [];
+for (var i = 0; i < roots.length; i++) {
+    found = found.concat(search(roots[i]));
+    var all = roots[i].querySelectorAll('*');
+    for (var j = 0; j < all.length; j++) {
+        if (all[j].shadowRoot) {
+            roots.push(all[j].shadowRoot);
+        }
+        if (all[j].tagName === 'IFRAME' || all[j].tagName === 'FRAME') {
+            frames.push(all[j]);
+        }
+    }
+}
+return {found: found, frames: frames};
+'''
+""" str: Locate elements in the current frame's document and every open shadow root
+within it. Returns {found, frames}, where frames are the frame elements to search next"""
+
+READINESS = r'''
+var explicitReadiness = function () {
+    if (!window.__explicitNetwork) {
+        var net = window.__explicitNetwork = {pending: 0};
+        var finish = function () {
+            net.pending = Math.max(net.pending - 1, 0);
+        };
+        if (window.fetch) {
+            var fetch = window.fetch;
+            window.fetch = function () {
+                net.pending++;
+                try {
+                    return fetch.apply(this, arguments).then(function (response) {
+                        finish();
+                        return response;
+                    }, function (error) {
+                        finish();
+                        throw error;
+                    });
+                } catch (e) {
+                    finish();
+                    throw e;
+                }
+            };
+        }
+        var send = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function () {
+            net.pending++;
+            this.addEventListener('loadend', finish);
+            try {
+                return send.apply(this, arguments);
+            } catch (e) {
+                finish();
+                throw e;
+            }
+        };
+    }
+    var pending = window.__explicitNetwork.pending;
+    return {ready: document.readyState === 'complete' && pending === 0,
+            state: document.readyState, pending: pending};
+};
+'''
+""" str: Defines explicitReadiness(), which instruments fetch and XMLHttpRequest on first
+call and returns {ready, state, pending}. Requests started before that first call aren't
+counted, and navigating away removes the instrumentation"""
+
+READY = READINESS + r'''
+return explicitReadiness();
+'''
+""" str: Return the page's readiness as {ready, state, pending}"""
+
+READY_FIND = LOCATE + READINESS + r'''
+if (!explicitReadiness().ready) {
+    return null;
+}
+return explicitLocate(arguments[0], arguments[1], arguments[2] || document);
+'''
+""" str: Locate elements once the page is ready, returning null until then"""
+
+VANISHED = LOCATE + r'''
+var explicitVanished = function (locators, visibleOnly, root) {
+    var shown = function (elem) {
+        var style = window.getComputedStyle(elem);
+        return style.display !== 'none' && style.visibility !== 'hidden' &&
+            parseFloat(style.opacity) !== 0 && elem.getClientRects().length > 0;
+    };
+    return locators.every(function (locator) {
+        var found = explicitLocate(locator[0], locator[1], root);
+        return visibleOnly ? !found.some(shown) : !found.length;
+    });
+};
+'''
+""" str: Defines explicitVanished(locators, visibleOnly, root), returning whether no
+[by, path] locator matches any element, or, with visibleOnly, any displayed element"""
+
+GONE = VANISHED + r'''
+return explicitVanished(arguments[0], arguments[1], arguments[2] || document);
+'''
+""" str: Return whether every locator has vanished, or become invisible"""
+
+OBSERVE_GONE = VANISHED + r'''
+var locators = arguments[0], visibleOnly = arguments[1], root = arguments[2] || document;
+var limit = arguments[3], done = arguments[arguments.length - 1];
+var doc = root.ownerDocument || root;
+var observer = null, timer = null, finished = false;
+var finish = function (gone) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    if (observer) {
+        observer.disconnect();
+    }
+    if (timer) {
+        clearTimeout(timer);
+    }
+    done(gone);
+};
+var check = function () {
+    if (explicitVanished(locators, visibleOnly, root)) {
+        finish(true);
+    }
+};
+check();
+if (!finished) {
+    observer = new MutationObserver(check);
+    observer.observe(doc.documentElement || doc,
+                     {childList: true, subtree: true, attributes: true});
+    timer = setTimeout(function () { finish(false); }, limit);
+}
+'''
+""" str: Async script resolving with true as soon as a DOM mutation makes every locator
+vanish (or become invisible), or with false once the observation window expires"""
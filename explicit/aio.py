@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""explicit.aio
+
+Coroutine versions of the explicit.waiter helpers.
+
+Rather than blocking a thread inside WebDriverWait, these talk to the
+driver's WebDriver HTTP endpoint with a small non-blocking client built on
+asyncio streams, and sleep between polls with asyncio.sleep. A single
+event loop can then wait on many remote sessions at once.
+
+The driver passed in is a regular Selenium remote webdriver (or element);
+only its endpoint, session id and protocol dialect are used, and located
+elements are returned as ordinary Selenium elements.
+
+"""
+
+import asyncio
+import base64
+import json
+import time
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.common.utils import keys_to_typing
+from selenium.webdriver.remote.webelement import WebElement
+
+from explicit import CLASS_NAME, CSS, ID, NAME, TAG, schedule
+from explicit.waiter import TIMEOUT
+
+_W3C_ELEMENT = 'element-6066-11e4-a52e-4f735466cecf'
+
+
+async def find_element(driver, elem_path, by=CSS, timeout=TIMEOUT, poll_frequency=0.5):
+    """ Find and return an element once located
+
+    Args:
+        driver (selenium webdriver or element): A driver or element
+        elem_path (str): String used to located the element
+        by (selenium By): Selenium By reference
+        timeout (int): Wait timeout, in seconds
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule
+
+    Returns:
+        element: Selenium element
+
+    Raises:
+        TimeoutException: Raised when target element isn't located
+    """
+    elems = await find_elements(driver, elem_path, by=by, timeout=timeout,
+                                poll_frequency=poll_frequency)
+    return elems[0]
+
+
+async def find_elements(driver, elem_path, by=CSS, timeout=TIMEOUT, poll_frequency=0.5):
+    """ Find and return all elements once located
+
+    Args:
+        driver (selenium webdriver or element): A driver or element
+        elem_path (str): String used to located the element
+        by (selenium By): Selenium By reference
+        timeout (int): Wait timeout, in seconds
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule
+
+    Returns:
+        list of elements: Selenium element
+
+    Raises:
+        TimeoutException: Raised when target element isn't located
+    """
+    client = _Client(driver)
+
+    async def _find_elements():
+        return await client.find_elements(by, elem_path)
+
+    return await _until(_find_elements, timeout, poll_frequency)
+
+
+async def find_one(driver, locator_list, elem_type=CSS, timeout=TIMEOUT, poll_frequency=0.5):
+    """ Find and return the first of several possible elements
+
+    Every locator is queried concurrently on each poll.
+
+    Args:
+        driver (selenium webdriver): Selenium webdriver object
+        locator_list (:obj: `list` of :obj: `str`): List of CSS selector strings
+        elem_type (Selenium By types): Selenium By type (i.e. By.CSS_SELECTOR)
+        timeout (int): Number of seconds to wait before timing out
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule
+
+    Returns:
+        Selenium Element
+
+    Raises:
+        TimeoutException: Raised if no elements are found within the TIMEOUT
+    """
+    client = _Client(driver)
+
+    async def _find_one():
+        elems = await asyncio.gather(*[client.find_elements(elem_type, loc)
+                                       for loc in locator_list])
+        if any([len(elem_list) > 0 for elem_list in elems]):
+            return elems
+        return False
+
+    raw_results = await _until(_find_one, timeout, poll_frequency)
+
+    # Pull out any found elements from lists
+    results = [elem for elem_list in raw_results for elem in elem_list]
+
+    return results.pop() if len(results) == 1 else results
+
+
+async def find_write(driver, elem_path, write_str, clear_first=True, send_enter=False,
+                     by=CSS, timeout=TIMEOUT, poll_frequency=0.5):
+    """ Find a writable element and write to it
+
+    Args:
+        driver (selenium webdriver or element): A driver or element
+        elem_path (str): String used to located the element
+        write_str (str): String to write
+        clear_first (bool): Clear the contents before writing (default True)
+        send_enter (bool): Send a keyboard ENTER after writing string
+        by (selenium By): Selenium By reference
+        timeout (int): Wait timeout, in seconds
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule
+
+    Returns:
+        element: Selenium element
+
+    Raises:
+        TimeoutException: Raised when target element isn't located
+    """
+    elem = await find_element(driver, elem_path=elem_path, by=by, timeout=timeout,
+                              poll_frequency=poll_frequency)
+    client = _Client(driver)
+
+    if clear_first:
+        await client.element_command(elem, 'clear', {})
+
+    await client.send_keys(elem, write_str)
+
+    if send_enter:
+        await client.send_keys(elem, Keys.ENTER)
+
+    return elem
+
+
+async def _until(method, timeout, poll_frequency):
+    """ Await method until it returns a truthy value, sleeping per the poll schedule """
+    intervals = schedule.as_schedule(poll_frequency).intervals()
+
+    end_time = time.time() + timeout
+    while True:
+        value = await method()
+        if value:
+            return value
+
+        remaining = end_time - time.time()
+        if remaining <= 0:
+            break
+        await asyncio.sleep(min(next(intervals), remaining))
+    raise TimeoutException()
+
+
+class _Client(object):
+    """ Minimal asyncio HTTP client for a driver's WebDriver session
+
+    Args:
+        driver (selenium webdriver or element): A remote driver, or an
+            element to search from
+    """
+    def __init__(self, driver):
+        if isinstance(driver, WebElement):
+            self.driver, self.root = driver.parent, driver
+        else:
+            self.driver, self.root = driver, None
+
+        url = urlparse(self.driver.command_executor._url)
+        self.ssl = url.scheme == 'https'
+        self.host = url.hostname
+        self.port = url.port or (443 if self.ssl else 80)
+        self.base_path = url.path.rstrip('/')
+        self.session_path = '/session/{0}'.format(self.driver.session_id)
+
+        # Credentials in the URL are sent as basic auth, as Selenium's RemoteConnection does
+        self.auth = ''
+        if url.username:
+            credentials = '{0.username}:{0.password}'.format(url).encode()
+            self.auth = 'Authorization: Basic {0}\r\n'.format(
+                base64.b64encode(credentials).decode())
+
+    async def find_elements(self, by, value):
+        """ Return all elements currently matching a locator """
+        if self.driver.w3c:
+            by, value = _w3c_locator(by, value)
+
+        path = self.session_path
+        if self.root is not None:
+            path += '/element/{0}'.format(self.root.id)
+
+        found = await self.request('POST', path + '/elements', {'using': by, 'value': value})
+        return [self.driver.create_web_element(_element_id(ref)) for ref in found or []]
+
+    async def send_keys(self, elem, value):
+        """ Type a string into an element """
+        typing = keys_to_typing(value)
+        await self.element_command(elem, 'value', {'text': ''.join(typing), 'value': typing})
+
+    async def element_command(self, elem, command, params):
+        """ Send a command to an element, returning its value """
+        path = '{0}/element/{1}/{2}'.format(self.session_path, elem.id, command)
+        return await self.request('POST', path, params)
+
+    async def request(self, method, path, params=None):
+        """ Send a command to the session, returning the response value
+
+        Errors are raised as the matching Selenium exception.
+        """
+        body = json.dumps(params).encode('utf-8') if params is not None else b''
+        head = ('{0} {1}{2} HTTP/1.1\r\n'
+                'Host: {3}:{4}\r\n'
+                'Accept: application/json\r\n'
+                'Content-Type: application/json;charset=UTF-8\r\n'
+                'Content-Length: {5}\r\n'
+                '{6}'
+                'Connection: close\r\n\r\n').format(method, self.base_path, path, self.host,
+                                                    self.port, len(body), self.auth)
+
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        try:
+            writer.write(head.encode('ascii') + body)
+            status, data = await _read_response(reader)
+        finally:
+            writer.close()
+
+        if 399 < status <= 500:
+            response = {'status': status, 'value': data}
+        else:
+            response = json.loads(data) if data.strip() else {}
+            response.setdefault('value', None)
+        self.driver.error_handler.check_response(response)
+        return response['value']
+
+
+async def _read_response(reader):
+    """ Read an HTTP response, returning its status code and decoded body """
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        body = b''
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                break
+            body += await reader.readexactly(size)
+            await reader.readline()
+    elif 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+    else:
+        body = await reader.read()
+
+    return status, body.decode('utf-8')
+
+
+def _w3c_locator(by, value):
+    """ Translate a locator to the strategies W3C drivers accept, as Selenium does """
+    if by == ID:
+        return CSS, '[id="{0}"]'.format(value)
+    if by == TAG:
+        return CSS, value
+    if by == CLASS_NAME:
+        return CSS, '.{0}'.format(value)
+    if by == NAME:
+        return CSS, '[name="{0}"]'.format(value)
+    return by, value
+
+
+def _element_id(ref):
+    """ Return the id from a W3C or JSON wire protocol element reference """
+    return ref.get(_W3C_ELEMENT, ref.get('ELEMENT'))
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""explicit.cache
+
+An opt-in, per-driver cache of elements located by waiter.find_element.
+
+Once enabled for a driver, repeated find_element calls for the same
+locator return the cached element without locating it again. An element
+located or checked within the last trust seconds is returned with no
+WebDriver command at all; older entries get a single liveness check,
+which costs as much as locating a present element, so the saving comes
+from the trusted window.
+
+A trusted entry isn't checked, so an element the page replaced within
+that window is returned stale, and raises StaleElementReferenceException
+when used. find_write, find_click and find_select discard the entry and
+locate the element again when that happens; set trust=0 to check every
+hit instead.
+
+Entries are evicted when the element goes stale (which includes
+navigating away from its page), when they outlive the cache's TTL, or
+when the cache is full and they are the least recently used.
+
+"""
+
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.abstract_event_listener import AbstractEventListener
+
+from explicit import dispatch, metrics
+
+MAX_SIZE = 256
+""" int: Default number of elements held by a cache"""
+
+TRUST = 1.0
+""" float: Default seconds a located or checked element is served without a liveness check"""
+
+_LIVENESS = 'return arguments[0].isConnected !== false;'
+
+_caches = weakref.WeakKeyDictionary()
+
+
+class ElementCache(object):
+    """ LRU cache of located elements for a single driver
+
+    Args:
+        max_size (int): Number of elements to hold before evicting the least recently used
+        ttl (float): Seconds an entry may be served for, or None for no limit
+        trust (float): Seconds after being located or checked that an entry is
+            served without a liveness check
+
+    Attributes:
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups which had to locate the element
+        evictions (int): Entries removed because they were stale, expired or least recently used
+    """
+    def __init__(self, max_size=MAX_SIZE, ttl=None, trust=TRUST):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.trust = trust
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, driver, by, elem_path):
+        """ Return the cached, still attached element for a locator, or None
+
+        Args:
+            driver (selenium webdriver or element): The driver or element searched from
+            by (selenium By): Selenium By reference
+            elem_path (str): String used to located the element
+        """
+        key = _key(driver, by, elem_path)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and now - entry[1] > self.ttl:
+                self._evict(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            if now - entry[2] < self.trust:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+        elem = entry[0]
+        metrics.count()
+        try:
+            with dispatch.lock_for(elem.parent):
+                alive = elem.parent.execute_script(_LIVENESS, elem)
+        except StaleElementReferenceException:
+            alive = False
+
+        with self._lock:
+            if not alive:
+                if self._entries.get(key) is entry:
+                    self._evict(key)
+                self.misses += 1
+                return None
+            if self._entries.get(key) is entry:
+                self._entries[key] = (elem, entry[1], time.time())
+                self._entries.move_to_end(key)
+            self.hits += 1
+        return elem
+
+    def put(self, driver, by, elem_path, elem):
+        """ Cache the element located for a locator
+
+        Args:
+            driver (selenium webdriver or element): The driver or element searched from
+            by (selenium By): Selenium By reference
+            elem_path (str): String used to located the element
+            elem (element): The located element
+        """
+        key = _key(driver, by, elem_path)
+        with self._lock:
+            now = time.time()
+            self._entries[key] = (elem, now, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._evict(next(iter(self._entries)))
+
+    def discard(self, driver, by, elem_path):
+        """ Remove the entry for a locator, e.g. after its element went stale """
+        key = _key(driver, by, elem_path)
+        with self._lock:
+            if key in self._entries:
+                self._evict(key)
+
+    def clear(self):
+        """ Remove every entry, e.g. after navigating to a new page """
+        with self._lock:
+            self.evictions += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        """ Return a dict of the cache's size and hit, miss and eviction counters """
+        return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions}
+
+    def _evict(self, key):
+        """ Remove an entry. The caller must hold the lock """
+        del self._entries[key]
+        self.evictions += 1
+
+
+class CacheListener(AbstractEventListener):
+    """ EventFiringWebDriver listener clearing a driver's cache on navigation
+
+    Entries for a previous page go stale and are evicted on their next
+    lookup anyway; registering this listener drops them up front instead.
+    """
+    def _clear(self, driver):
+        elem_cache = cache_for(driver)
+        if elem_cache is not None:
+            elem_cache.clear()
+
+    def after_navigate_to(self, url, driver):
+        self._clear(driver)
+
+    def after_navigate_back(self, driver):
+        self._clear(driver)
+
+    def after_navigate_forward(self, driver):
+        self._clear(driver)
+
+
+def enable(driver, max_size=MAX_SIZE, ttl=None, trust=TRUST):
+    """ Enable element caching for a driver
+
+    Args:
+        driver (selenium webdriver): Selenium webdriver object
+        max_size (int): Number of elements to hold before evicting the least recently used
+        ttl (float): Seconds an entry may be served for, or None for no limit
+        trust (float): Seconds after being located or checked that an entry is
+            served without a liveness check
+
+    Returns:
+        ElementCache: The driver's cache
+    """
+    elem_cache = ElementCache(max_size=max_size, ttl=ttl, trust=trust)
+    _caches[metrics.owner(driver)] = elem_cache
+    return elem_cache
+
+
+def disable(driver):
+    """ Disable element caching for a driver, dropping its cache """
+    _caches.pop(metrics.owner(driver), None)
+
+
+def cache_for(driver):
+    """ Return the cache enabled for a driver (or an element's driver), or None """
+    if not _caches:
+        return None
+    return _caches.get(metrics.owner(driver))
+
+
+def _key(driver, by, elem_path):
+    """ Return the cache key for a locator searched from a driver or element """
+    root = driver.id if isinstance(driver, WebElement) else None
+    return (by, elem_path, root)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""explicit.deadline
+
+A shared deadline for a sequence of waits.
+
+Inside a Deadline block, every explicit.waiter call in the same thread
+waits for at most the smaller of its own timeout and the time left until
+the deadline. A flow that breaks halfway then fails as soon as its overall
+budget is spent, instead of waiting out the full timeout of every step::
+
+    with Deadline(60):
+        waiter.find_write(driver, "login_field", "my_username", by=ID)
+        waiter.find_write(driver, "password", "my_password", by=ID, send_enter=True)
+        waiter.find_element(driver, "div.dashboard")
+
+Deadlines can be nested; the earliest one applies.
+
+"""
+
+import threading
+import time
+
+_local = threading.local()
+
+
+class Deadline(object):
+    """ Context manager bounding the waits made inside it
+
+    Args:
+        seconds (float): Time budget for every wait made inside the block
+    """
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires = None
+
+    def __enter__(self):
+        self.expires = time.time() + self.seconds
+        _stack().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _stack().remove(self)
+        return False
+
+    def remaining(self):
+        """ Return the seconds left before the deadline, never less than 0 """
+        return max(self.expires - time.time(), 0)
+
+    @property
+    def expired(self):
+        """ bool: Whether the deadline has passed """
+        return time.time() >= self.expires
+
+
+def remaining():
+    """ Return the seconds left before the earliest active deadline, or None if there isn't one """
+    stack = getattr(_local, 'stack', None)
+    if not stack:
+        return None
+    return max(min(entry.expires for entry in stack) - time.time(), 0)
+
+
+def clip(timeout):
+    """ Return a timeout shortened to the time left before the earliest active deadline """
+    left = remaining()
+    if left is None:
+        return timeout
+    return min(timeout, left)
+
+
+def _stack():
+    """ Return this thread's stack of active deadlines """
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
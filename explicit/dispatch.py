@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""explicit.dispatch
+
+Safe sharing of one driver between threads.
+
+Selenium drivers aren't thread safe, and page objects waiting on the same
+driver from several threads send duplicate lookups which race each other.
+With a dispatcher enabled for a driver, every command explicit sends to
+it (each poll, and the clicks, writes and script calls made outside a
+poll) is sent while holding the dispatcher's lock, and identical
+find_element or find_elements calls in flight at the same time (same
+function, locator and search root) share a single poll loop, whose
+result is handed to every caller::
+
+    dispatch.enable(driver)
+
+    # from any number of threads
+    waiter.find_element(driver, "div.results")
+
+Code sending its own commands to the shared driver can hold the same
+lock, available as dispatch.dispatcher_for(driver).lock.
+
+"""
+
+import threading
+import time
+import weakref
+
+from selenium.common.exceptions import TimeoutException
+
+from explicit import metrics
+
+_dispatchers = weakref.WeakKeyDictionary()
+
+
+class Dispatcher(object):
+    """ Serializes a driver's commands and coalesces identical lookups
+
+    Attributes:
+        lock (threading.RLock): Held while commands are sent
+        coalesced (int): Calls which joined a lookup already in flight
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.coalesced = 0
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+
+    def coalesce(self, key, timeout, lookup):
+        """ Run lookup, or wait for the identical lookup already in flight
+
+        A caller whose in-flight lookup timed out before its own timeout
+        is up starts a new lookup for the time it has left.
+
+        Args:
+            key (tuple): Identifies the lookup
+            timeout (float): Seconds the caller may wait
+            lookup (callable): Called with a timeout, returning the lookup's result
+
+        Raises:
+            TimeoutException: Raised when the lookup doesn't complete within timeout
+        """
+        end_time = time.time() + timeout
+        joined = False
+        while True:
+            with self._flights_lock:
+                flight = self._flights.get(key)
+                leading = flight is None
+                if leading:
+                    flight = self._flights[key] = _Flight()
+                elif not joined:
+                    self.coalesced += 1
+                    joined = True
+
+            if leading:
+                return self._lead(key, flight, max(end_time - time.time(), 0), lookup)
+
+            if not flight.done.wait(max(end_time - time.time(), 0)):
+                raise TimeoutException()
+            if flight.error is None:
+                return flight.result
+            if not isinstance(flight.error, TimeoutException) or time.time() >= end_time:
+                raise flight.error
+
+    def _lead(self, key, flight, timeout, lookup):
+        """ Run a lookup, publishing its outcome to the callers which joined it """
+        try:
+            flight.result = lookup(timeout)
+            return flight.result
+        except Exception as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+            flight.done.set()
+
+
+class _Flight(object):
+    """ A lookup in progress """
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _Unlocked(object):
+    """ Stand in for a dispatcher's lock when a driver has no dispatcher """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_UNLOCKED = _Unlocked()
+
+
+def enable(driver):
+    """ Enable a dispatcher for a driver, returning it
+
+    Enabling a driver which already has a dispatcher returns the existing one.
+    """
+    owner = metrics.owner(driver)
+    dispatcher = _dispatchers.get(owner)
+    if dispatcher is None:
+        dispatcher = _dispatchers[owner] = Dispatcher()
+    return dispatcher
+
+
+def disable(driver):
+    """ Remove a driver's dispatcher """
+    _dispatchers.pop(metrics.owner(driver), None)
+
+
+def dispatcher_for(driver):
+    """ Return the dispatcher enabled for a driver (or an element's driver), or None """
+    if not _dispatchers:
+        return None
+    return _dispatchers.get(metrics.owner(driver))
+
+
+def lock_for(driver):
+    """ Return the lock to hold while sending a driver's commands
+
+    Drivers without a dispatcher get a lock which does nothing.
+    """
+    dispatcher = dispatcher_for(driver)
+    return _UNLOCKED if dispatcher is None else dispatcher.lock
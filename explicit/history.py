@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""explicit.history
+
+Hit history for find_one's fallback locator lists.
+
+A LocatorHistory counts how often each locator in a list is the one that
+matches. find_one uses it to try the locator that usually matches first,
+so with short_circuit=True most polls cost a single command. Histories
+live in memory, and can be saved to and loaded from a JSON file so the
+ordering carries over between runs.
+
+"""
+
+import atexit
+import json
+import os
+import threading
+
+
+class LocatorHistory(object):
+    """ Per locator list hit counts
+
+    Args:
+        path (str): JSON file to load the history from, and save it to
+        autosave (bool): Save the history to path when the interpreter exits
+    """
+    def __init__(self, path=None, autosave=False):
+        self.path = path
+        self._hits = {}
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            with open(path) as history_file:
+                self._hits = json.load(history_file)
+        if autosave:
+            atexit.register(self.save)
+
+    def order(self, locator_list, elem_type):
+        """ Return the locators, the most frequently matched first
+
+        Locators with equal hit counts keep their original order.
+        """
+        with self._lock:
+            hits = dict(self._hits.get(_key(locator_list, elem_type), {}))
+        return sorted(locator_list, key=lambda loc: -hits.get(loc, 0))
+
+    def record(self, locator_list, elem_type, locator):
+        """ Count a match of locator, from a list of locators """
+        key = _key(locator_list, elem_type)
+        with self._lock:
+            hits = self._hits.setdefault(key, {})
+            hits[locator] = hits.get(locator, 0) + 1
+
+    def hits(self, locator_list, elem_type):
+        """ Return a dict of the match count for each locator in a list """
+        with self._lock:
+            return dict(self._hits.get(_key(locator_list, elem_type), {}))
+
+    def save(self, path=None):
+        """ Write the history to a JSON file
+
+        Args:
+            path (str): File to write, defaulting to the path the history was created with
+        """
+        path = path or self.path
+        with self._lock:
+            data = json.dumps(self._hits, indent=2, sort_keys=True)
+        with open(path, 'w') as history_file:
+            history_file.write(data)
+
+
+_shared = LocatorHistory()
+
+
+def shared():
+    """ Return the in-memory history used by find_one when none is given """
+    return _shared
+
+
+def _key(locator_list, elem_type):
+    """ Return the JSON-friendly key for a list of locators """
+    return json.dumps([elem_type] + sorted(locator_list))
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""explicit.metrics
+
+Per-call instrumentation for the explicit.waiter functions.
+
+Every waiter call produces a CallRecord holding the function name, the
+locator, the number of polls and WebDriver commands it took, how long it
+ran and whether it found its target or timed out. Records are handed to
+each registered sink, which is any callable taking a record. Aggregate
+and JsonLines are provided; a plain function works as a callback sink.
+
+While no sinks are registered, nothing is recorded.
+
+"""
+
+import functools
+import json
+import threading
+import time
+
+_sinks = []
+_local = threading.local()
+_signatures = {}
+
+
+class CallRecord(object):
+    """ Measurements for a single waiter call
+
+    Attributes:
+        function (str): Name of the waiter function
+        by (selenium By): Selenium By reference used
+        locator (str or list): The locator, or list of locators, waited for
+        polls (int): Number of times the wait condition was checked
+        commands (int): Number of WebDriver commands sent
+        elapsed (float): Seconds the call took
+        found (bool): Whether the call located its target
+        timed_out (bool): Whether the call raised a TimeoutException
+        error (str): Name of any other exception raised, else None
+        matched (str): For find_one, the locator which matched
+        throttled (float): Seconds polls spent waiting on explicit.ratelimit
+        retries (int): Times a stale element was located again
+        session (str): Session ID of the driver the call was made with, if known
+    """
+    def __init__(self, function, by, locator, session=None):
+        self.function = function
+        self.by = by
+        self.locator = locator
+        self.session = session
+        self.polls = 0
+        self.commands = 0
+        self.started = None
+        self.elapsed = None
+        self.found = False
+        self.timed_out = False
+        self.error = None
+        self.matched = None
+        self.throttled = 0.0
+        self.retries = 0
+
+    def __enter__(self):
+        _local.record = self
+        self.started = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.elapsed = time.time() - self.started
+        _local.record = None
+        if exc_type is None:
+            self.found = True
+        elif exc_type.__name__ == 'TimeoutException':
+            self.timed_out = True
+        else:
+            self.error = exc_type.__name__
+        for sink in list(_sinks):
+            sink(self)
+        return False
+
+    def to_dict(self):
+        """ Return the record as a JSON serializable dict """
+        return {'function': self.function, 'by': self.by, 'locator': self.locator,
+                'polls': self.polls, 'commands': self.commands, 'started': self.started,
+                'elapsed': self.elapsed, 'found': self.found, 'timed_out': self.timed_out,
+                'error': self.error, 'matched': self.matched, 'throttled': self.throttled,
+                'retries': self.retries, 'session': self.session}
+
+
+class Aggregate(object):
+    """ Sink keeping running totals per function and locator
+
+    Attributes:
+        stats (dict): Maps (function, by, locator) to a dict of calls,
+            found, timeouts, polls, commands, total_time, max_time, throttled and retries
+    """
+    def __init__(self):
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        locator = record.locator
+        if isinstance(locator, list):
+            locator = tuple(locator)
+        key = (record.function, record.by, locator)
+
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = {'calls': 0, 'found': 0, 'timeouts': 0, 'polls': 0,
+                                           'commands': 0, 'total_time': 0.0, 'max_time': 0.0,
+                                           'throttled': 0.0, 'retries': 0}
+            stats['calls'] += 1
+            stats['found'] += record.found
+            stats['timeouts'] += record.timed_out
+            stats['polls'] += record.polls
+            stats['commands'] += record.commands
+            stats['total_time'] += record.elapsed
+            stats['max_time'] = max(stats['max_time'], record.elapsed)
+            stats['throttled'] += record.throttled
+            stats['retries'] += record.retries
+
+    def summary(self):
+        """ Return (key, stats) pairs, the most total time spent waiting first """
+        with self._lock:
+            items = [(key, dict(stats)) for key, stats in self.stats.items()]
+        return sorted(items, key=lambda item: item[1]['total_time'], reverse=True)
+
+    def reset(self):
+        """ Discard all totals """
+        with self._lock:
+            self.stats.clear()
+
+
+class JsonLines(object):
+    """ Sink appending each record to a file as a line of JSON
+
+    Args:
+        path (str): File to append to
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a')
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        line = json.dumps(record.to_dict(), default=repr)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self):
+        """ Close the file """
+        self._file.close()
+
+
+def add_sink(sink):
+    """ Register a sink to receive every CallRecord
+
+    Args:
+        sink (callable): Called with each CallRecord once its call finishes
+
+    Returns:
+        The sink, so it can be registered inline
+    """
+    _sinks.append(sink)
+    return sink
+
+
+def remove_sink(sink):
+    """ Unregister a sink """
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+
+def clear_sinks():
+    """ Unregister every sink, disabling recording """
+    del _sinks[:]
+
+
+def instrumented(locator_arg, by_arg='by'):
+    """ Decorator recording each call of a waiter function
+
+    Calls are passed straight through while no sinks are registered, or
+    when nested inside another recorded call in the same thread (e.g.
+    find_write calling find_element), in which case the outer record
+    accumulates the measurements.
+
+    Args:
+        locator_arg (str): Name of the function's locator argument, or None
+        by_arg (str): Name of the function's Selenium By argument
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _sinks or getattr(_local, 'record', None) is not None:
+                return func(*args, **kwargs)
+
+            bound = _signature(func).bind(*args, **kwargs)
+            bound.apply_defaults()
+            locator = bound.arguments[locator_arg] if locator_arg else None
+            if isinstance(locator, dict):
+                locator = list(locator)
+            session = session_id(bound.arguments.get('driver'))
+            with CallRecord(func.__name__, bound.arguments.get(by_arg), locator, session):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _signature(func):
+    """ Return a function's signature, worked out on its first recorded call
+
+    inspect is slow to import, and only needed once a sink is registered.
+    """
+    signature = _signatures.get(func)
+    if signature is None:
+        import inspect
+        signature = _signatures[func] = inspect.signature(func)
+    return signature
+
+
+def current():
+    """ Return the CallRecord for the call in progress in this thread, or None """
+    if not _sinks:
+        return None
+    return getattr(_local, 'record', None)
+
+
+def sent():
+    """ Return the number of commands counted by this thread so far, recorded or not """
+    return getattr(_local, 'sent', 0)
+
+
+def is_element(driver):
+    """ Return whether driver is a WebElement, rather than a webdriver """
+    # Imported here, as importing any of selenium.webdriver loads every browser's driver
+    from selenium.webdriver.remote.webelement import WebElement
+    return isinstance(driver, WebElement)
+
+
+def owner(driver):
+    """ Return the webdriver owning a driver or element, unwrapping an EventFiringWebDriver """
+    if is_element(driver):
+        return driver.parent
+    return getattr(driver, 'wrapped_driver', driver)
+
+
+def session_id(driver):
+    """ Return the session ID of a driver, or of an element's driver, or None """
+    return getattr(owner(driver), 'session_id', None)
+
+
+def count(commands=1):
+    """ Count WebDriver commands sent by the call in progress, if it's being recorded
+
+    Commands are also added to this thread's running total (see sent).
+    """
+    _local.sent = getattr(_local, 'sent', 0) + commands
+    rec = current()
+    if rec is not None:
+        rec.commands += commands
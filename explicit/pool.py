@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""explicit.pool
+
+A pool of warm WebDriver sessions, reset and reused between leases.
+
+Starting a browser costs seconds, so short scripts spend most of their
+time waiting for drivers. A DriverPool keeps sessions alive and hands
+them out with a context manager; the drivers are ordinary Selenium
+webdrivers, used with the waiter functions as usual::
+
+    pool = DriverPool(webdriver.Chrome, size=4)
+
+    with pool.lease() as driver:
+        driver.get("https://github.com/this/doesntexist")
+        waiter.find_write(driver, "login_field", "my_username", by=ID)
+
+    pool.close()
+
+When a lease ends the session is reset: extra windows are closed, the
+cookies and local and session storage of the page the first window is on
+are cleared, and the browser is sent to about:blank. WebDriver can only
+reach the current origin, so cookies and storage other sites set during
+the lease survive the reset, as do IndexedDB and caches; where leases
+must be fully isolated, set max_uses=1 to give each lease a new browser.
+Sessions are health checked before being handed out, and replaced after
+a set number of uses, or when a reset or health check fails.
+
+"""
+
+import threading
+import time
+from collections import deque
+
+from explicit import cache
+
+_CLEAR_STORAGE = '''
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+'''
+
+
+class PoolExhausted(Exception):
+    """ Raised when no driver becomes free before a lease's timeout """
+
+
+class DriverPool(object):
+    """ Keeps up to size warm drivers and leases them out one at a time
+
+    Args:
+        factory (callable): Called with no arguments to start a new driver
+        size (int): Most drivers the pool will hold
+        max_uses (int): Leases a driver serves before it's replaced, or None
+        warm (int): Drivers to start up front, defaulting to size
+        reset_url (str): URL drivers are sent to between leases
+
+    Attributes:
+        created (int): Drivers started
+        recycled (int): Drivers quit for reaching max_uses, or failing a reset or health check
+    """
+    def __init__(self, factory, size=2, max_uses=None, warm=None, reset_url='about:blank'):
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.reset_url = reset_url
+        self.created = 0
+        self.recycled = 0
+        self._idle = deque()
+        self._uses = {}
+        self._leased = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        for _ in range(size if warm is None else min(warm, size)):
+            self._idle.append(self._start())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def lease(self, timeout=None):
+        """ Return a context manager leasing a driver from the pool
+
+        Args:
+            timeout (float): Seconds to wait for a free driver, or None to wait forever
+
+        Raises:
+            PoolExhausted: Raised when no driver is free within timeout
+        """
+        return _Lease(self, timeout)
+
+    def acquire(self, timeout=None):
+        """ Take a healthy driver from the pool, starting one if there's room
+
+        Prefer lease(), which returns the driver automatically.
+
+        Args:
+            timeout (float): Seconds to wait for a free driver, or None to wait forever
+
+        Raises:
+            PoolExhausted: Raised when no driver is free within timeout
+        """
+        end_time = None if timeout is None else time.time() + timeout
+        while True:
+            with self._cond:
+                driver, start_new = self._take(end_time)
+            if start_new:
+                try:
+                    return self._start()
+                except Exception:
+                    with self._cond:
+                        self._leased -= 1
+                        self._cond.notify()
+                    raise
+            healthy = False
+            try:
+                healthy = self._healthy(driver)
+                if not healthy:
+                    self._retire(driver)
+            finally:
+                if not healthy:
+                    with self._cond:
+                        self._leased -= 1
+                        self._cond.notify()
+            if healthy:
+                return driver
+
+    def release(self, driver):
+        """ Reset a leased driver and return it to the pool
+
+        Drivers that have served max_uses leases, or fail to reset, are quit.
+        """
+        keep = False
+        try:
+            with self._cond:
+                uses = self._uses.get(driver, 0) + 1
+                self._uses[driver] = uses
+
+            keep = not self._closed and (self.max_uses is None or uses < self.max_uses)
+            if keep:
+                keep = self._reset(driver)
+
+            if not keep:
+                self._retire(driver)
+        finally:
+            with self._cond:
+                self._leased -= 1
+                if keep:
+                    self._idle.append(driver)
+                self._cond.notify()
+
+    def close(self):
+        """ Quit every idle driver. Drivers still leased are quit when released """
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._cond.notify_all()
+        for driver in idle:
+            self._quit(driver)
+
+    def stats(self):
+        """ Return a dict of the pool's idle, leased, created and recycled counts """
+        with self._cond:
+            return {'idle': len(self._idle), 'leased': self._leased, 'created': self.created,
+                    'recycled': self.recycled}
+
+    def _take(self, end_time):
+        """ Wait for an idle driver or room for a new one. The caller holds the lock
+
+        Returns:
+            tuple: (idle driver or None, whether to start a new driver)
+        """
+        while True:
+            if self._closed:
+                raise PoolExhausted('The pool is closed')
+            if self._idle:
+                self._leased += 1
+                return self._idle.popleft(), False
+            if self._leased + len(self._idle) < self.size:
+                self._leased += 1
+                return None, True
+
+            remaining = None if end_time is None else end_time - time.time()
+            if remaining is not None and remaining <= 0:
+                raise PoolExhausted('No driver became free within the timeout')
+            self._cond.wait(remaining)
+
+    def _start(self):
+        """ Start a new driver """
+        driver = self.factory()
+        with self._cond:
+            self._uses[driver] = 0
+            self.created += 1
+        return driver
+
+    def _healthy(self, driver):
+        """ Return whether a driver's session still responds
+
+        A dead browser or driver process raises connection errors rather
+        than WebDriverException, so any error fails the check.
+        """
+        try:
+            driver.current_window_handle
+        except Exception:
+            return False
+        return True
+
+    def _reset(self, driver):
+        """ Return a driver to a clean state, returning False if that fails
+
+        Only the current origin's cookies and storage can be cleared.
+        """
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.execute_script(_CLEAR_STORAGE)
+            driver.delete_all_cookies()
+            driver.get(self.reset_url)
+        except Exception:
+            return False
+
+        elem_cache = cache.cache_for(driver)
+        if elem_cache is not None:
+            elem_cache.clear()
+        return True
+
+    def _retire(self, driver):
+        """ Quit a driver leaving the pool, making room for a replacement """
+        with self._cond:
+            self.recycled += 1
+        self._quit(driver)
+
+    def _quit(self, driver):
+        """ Quit a driver, ignoring errors from sessions which already died """
+        with self._cond:
+            self._uses.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+class _Lease(object):
+    """ Context manager acquiring a driver on entry and releasing it on exit """
+    def __init__(self, pool, timeout):
+        self.pool = pool
+        self.timeout = timeout
+        self.driver = None
+
+    def __enter__(self):
+        self.driver = self.pool.acquire(timeout=self.timeout)
+        return self.driver
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.pool.release(self.driver)
+        return False
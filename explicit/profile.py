@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""explicit.profile
+
+Timeouts and poll schedules tuned from how long locators took to be found.
+
+A ProfileStore keeps the recent time-to-found of each locator, and can
+be saved to and loaded from a JSON file so the profile builds up across
+runs. Once a store is enabled, find_element and find_elements record
+every successful lookup in it, and, once a locator has enough samples,
+replace the default timeout and poll frequency with tuned ones::
+
+    profile.enable(path='locators.profile.json', autosave=True)
+
+The tuned timeout is the slowest recorded time-to-found times a safety
+margin (but never less than a floor, nor more than the timeout asked
+for), so a locator which has stopped matching fails in seconds instead
+of after the full default timeout. The first sleep is set to the median
+time-to-found and later polls follow closely, so fast elements are
+caught without waiting out a whole poll interval.
+
+Passing timeout or poll_frequency to a waiter function overrides the
+tuning for that call, and ProfileStore.pin sets fixed values for a
+locator.
+
+Samples can also be kept per page, with a pattern function mapping the
+driver's current URL to a page key; this costs one extra command per
+lookup. url_pattern is a ready made one.
+
+"""
+
+import atexit
+import json
+import os
+import re
+import threading
+
+from explicit import dispatch, metrics, schedule
+
+_store = None
+
+
+class ProfileStore(object):
+    """ Recent time-to-found samples per locator, and the tuning derived from them
+
+    Args:
+        path (str): JSON file to load the profile from, and save it to
+        autosave (bool): Save the profile to path when the interpreter exits
+        pattern (callable): Maps the driver's current URL to a page key, or None
+            to keep one profile per locator across all pages
+        min_samples (int): Samples needed before a locator is tuned
+        keep (int): Most recent samples kept per locator
+        margin (float): Multiple of the slowest sample used as the timeout
+        floor (float): Shortest tuned timeout, in seconds
+    """
+    def __init__(self, path=None, autosave=False, pattern=None, min_samples=5, keep=50,
+                 margin=3.0, floor=2.0):
+        self.path = path
+        self.pattern = pattern
+        self.min_samples = min_samples
+        self.keep = keep
+        self.margin = margin
+        self.floor = floor
+        self._samples = {}
+        self._pins = {}
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            with open(path) as profile_file:
+                self._samples = json.load(profile_file)
+        if autosave:
+            atexit.register(self.save)
+
+    def key(self, driver, by, elem_path):
+        """ Return the profile key for a locator searched from a driver """
+        page = None
+        if self.pattern is not None:
+            metrics.count()
+            with dispatch.lock_for(driver):
+                url = metrics.owner(driver).current_url
+            page = self.pattern(url)
+        return json.dumps([page, by, elem_path])
+
+    def record(self, key, elapsed):
+        """ Add a time-to-found sample, in seconds """
+        with self._lock:
+            samples = self._samples.setdefault(key, [])
+            samples.append(round(elapsed, 4))
+            del samples[:-self.keep]
+
+    def pin(self, by, elem_path, timeout=None, poll_frequency=None, page=None):
+        """ Fix the timeout and/or poll frequency used for a locator, whatever its samples """
+        with self._lock:
+            self._pins[json.dumps([page, by, elem_path])] = (timeout, poll_frequency)
+
+    def samples(self, key):
+        """ Return a copy of a key's samples, oldest first """
+        with self._lock:
+            return list(self._samples.get(key, []))
+
+    def tuned(self, key, timeout, poll_frequency):
+        """ Return the (timeout, poll_frequency) to use for a key
+
+        Pinned values are returned as they are. Otherwise, keys with fewer
+        than min_samples samples keep the values given.
+        """
+        with self._lock:
+            pinned = self._pins.get(key)
+            samples = sorted(self._samples.get(key, []))
+        if pinned is not None:
+            return (pinned[0] if pinned[0] is not None else timeout,
+                    pinned[1] if pinned[1] is not None else poll_frequency)
+        if len(samples) < self.min_samples:
+            return timeout, poll_frequency
+
+        median = samples[len(samples) // 2]
+        slow = samples[int(len(samples) * 0.9)]
+        tuned_timeout = min(timeout, max(self.floor, samples[-1] * self.margin))
+        interval = min(max((slow - median) / 4, 0.02), schedule.POLL_FREQUENCY)
+        return tuned_timeout, schedule.Delayed(median, interval)
+
+    def save(self, path=None):
+        """ Write the samples to a JSON file
+
+        Args:
+            path (str): File to write, defaulting to the path the store was created with
+        """
+        path = path or self.path
+        with self._lock:
+            data = json.dumps(self._samples, indent=2, sort_keys=True)
+        with open(path, 'w') as profile_file:
+            profile_file.write(data)
+
+
+def url_pattern(url):
+    """ Return a URL without its query and fragment, and with runs of digits as {n} """
+    url = url.split('#')[0].split('?')[0]
+    return re.sub(r'\d+', '{n}', url)
+
+
+def enable(store=None, **kwargs):
+    """ Tune find_element and find_elements from a profile store
+
+    Args:
+        store (ProfileStore): Store to use, or None to create one from kwargs
+
+    Returns:
+        ProfileStore: The store now in use
+    """
+    global _store
+    _store = store if store is not None else ProfileStore(**kwargs)
+    return _store
+
+
+def disable():
+    """ Stop recording and tuning """
+    global _store
+    _store = None
+
+
+def store():
+    """ Return the ProfileStore in use, or None """
+    return _store
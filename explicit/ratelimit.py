@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""explicit.ratelimit
+
+An optional limit on the rate of WebDriver commands sent by waiter polls.
+
+Hundreds of sessions polling on the same fixed interval hit a Selenium
+Grid hub with synchronized bursts of commands. With a limit enabled,
+every poll made by the explicit.waiter functions first takes tokens from
+a token bucket, one per command it will send, and waits while the
+bucket is empty. Polls whose command count isn't known up front (short
+circuited find_one, and the frame searches) take one token first and
+pay for the rest of the commands they sent afterwards::
+
+    ratelimit.enable(rate=200, burst=50)
+
+Waiting polls are granted in round-robin order across drivers, so one
+driver polling from several threads can't starve the others. Passing a
+path shares the bucket between processes on the same machine through a
+locked state file (POSIX only)::
+
+    ratelimit.enable(rate=200, path='/tmp/grid-hub.bucket')
+
+Time spent throttled is added to the waiter call's metrics record, and
+totalled per driver on the limiter.
+
+"""
+
+import json
+import threading
+import time
+from collections import deque
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from explicit import metrics
+
+_limiter = None
+
+
+class TokenBucket(object):
+    """ Token bucket refilled at a steady rate
+
+    Args:
+        rate (float): Tokens added per second
+        burst (float): Most tokens the bucket holds, defaulting to rate
+        path (str): File holding the bucket's state, to share it between processes
+    """
+    def __init__(self, rate, burst=None, path=None):
+        if path is not None and fcntl is None:  # pragma: no cover
+            raise RuntimeError('Sharing a bucket between processes requires fcntl')
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else rate)
+        self.path = path
+        self._tokens = self.burst
+        self._updated = time.time()
+
+    def take(self, tokens=1):
+        """ Take tokens if the bucket holds enough
+
+        Requests for more than burst tokens are granted once the bucket is
+        full, leaving it in debt.
+
+        Returns:
+            float: 0 if the tokens were taken, else the seconds until they'll be available
+        """
+        if self.path is None:
+            return self._take(tokens)
+
+        with open(self.path, 'a+') as state_file:
+            fcntl.flock(state_file, fcntl.LOCK_EX)
+            try:
+                state_file.seek(0)
+                self._tokens, self._updated = self._load(state_file.read())
+
+                wait = self._take(tokens)
+
+                state_file.seek(0)
+                state_file.truncate()
+                state_file.write(json.dumps({'tokens': self._tokens, 'updated': self._updated}))
+                state_file.flush()
+            finally:
+                fcntl.flock(state_file, fcntl.LOCK_UN)
+        return wait
+
+    def _load(self, data):
+        """ Return the (tokens, updated) state saved in a state file
+
+        A new, empty or unreadable file (e.g. one left partly written by a
+        process killed while saving) is read as a full bucket.
+        """
+        try:
+            state = json.loads(data)
+            return float(state['tokens']), float(state['updated'])
+        except (ValueError, TypeError, KeyError):
+            return self.burst, time.time()
+
+    def _take(self, tokens):
+        """ Refill the bucket for the time passed, then take tokens from it """
+        now = time.time()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        needed = min(tokens, self.burst)
+        if self._tokens >= needed:
+            self._tokens -= tokens
+            return 0
+        return (needed - self._tokens) / self.rate
+
+
+class RateLimiter(object):
+    """ Grants tokens from a bucket to waiting polls, round-robin across drivers
+
+    Args:
+        rate (float): Commands per second
+        burst (float): Commands which may be sent at once after a quiet period
+        path (str): State file shared with other processes, or None
+
+    Attributes:
+        throttled (float): Total seconds polls spent waiting for tokens
+        waits (int): Polls which had to wait
+    """
+    def __init__(self, rate, burst=None, path=None):
+        self.bucket = TokenBucket(rate, burst=burst, path=path)
+        self.throttled = 0.0
+        self.waits = 0
+        self._per_driver = {}
+        self._queues = {}
+        self._turns = deque()
+        self._cond = threading.Condition()
+
+    def acquire(self, driver=None, tokens=1):
+        """ Block until tokens are granted for a driver's poll
+
+        Args:
+            driver (selenium webdriver or element): The driver sending the commands
+            tokens (int): Number of commands to be sent
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        key = id(metrics.owner(driver)) if driver is not None else None
+        ticket = object()
+        started = time.time()
+
+        with self._cond:
+            queue = self._queues.setdefault(key, deque())
+            queue.append(ticket)
+            if len(queue) == 1:
+                self._turns.append(key)
+
+            try:
+                while True:
+                    if self._turns[0] == key and queue[0] is ticket:
+                        wait = self.bucket.take(tokens)
+                        if not wait:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+            finally:
+                # Also when take() fails, so later polls aren't left waiting on this one
+                self._leave(key, queue, ticket)
+
+            waited = time.time() - started
+            if waited > 0.001:
+                self.waits += 1
+                self.throttled += waited
+                self._per_driver[key] = self._per_driver.get(key, 0.0) + waited
+        return waited
+
+    def _leave(self, key, queue, ticket):
+        """ Remove a ticket from its driver's queue, passing the turn on if it held it.
+        The caller holds the lock """
+        had_turn = self._turns[0] == key and queue[0] is ticket
+        queue.remove(ticket)
+        if had_turn:
+            self._turns.popleft()
+            if queue:
+                self._turns.append(key)
+        elif not queue:
+            self._turns.remove(key)
+        if not queue:
+            del self._queues[key]
+        self._cond.notify_all()
+
+    def throttled_for(self, driver):
+        """ Return the seconds a driver's polls have spent waiting for tokens """
+        with self._cond:
+            return self._per_driver.get(id(metrics.owner(driver)), 0.0)
+
+
+def enable(rate, burst=None, path=None):
+    """ Limit the rate of commands sent by waiter polls, across every driver
+
+    Args:
+        rate (float): Commands per second
+        burst (float): Commands which may be sent at once, defaulting to rate
+        path (str): State file to share the limit with other processes, or None
+
+    Returns:
+        RateLimiter: The limiter now in use
+    """
+    global _limiter
+    _limiter = RateLimiter(rate, burst=burst, path=path)
+    return _limiter
+
+
+def disable():
+    """ Remove the rate limit """
+    global _limiter
+    _limiter = None
+
+
+def limiter():
+    """ Return the RateLimiter in use, or None """
+    return _limiter
+
+
+def throttle(driver, tokens=1):
+    """ Wait for tokens for a poll, if a limit is enabled, counting the wait in metrics """
+    current = _limiter
+    if current is None or not tokens:
+        return
+    waited = current.acquire(driver, tokens)
+    rec = metrics.current()
+    if rec is not None:
+        rec.throttled += waited
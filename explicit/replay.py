@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""explicit.replay
+
+Record a WebDriver session's commands and responses, and replay them
+without a browser.
+
+A RecordingConnection is a selenium RemoteConnection which saves every
+command sent and the response received to a file. A ReplayConnection
+answers the same commands from that file, so code using explicit.waiter
+can be regression tested and benchmarked in milliseconds::
+
+    connection = RecordingConnection('http://127.0.0.1:4444/wd/hub', 'login.replay')
+    driver = webdriver.Remote(connection, desired_capabilities=DesiredCapabilities.CHROME)
+    log_in(driver)
+    driver.quit()
+    connection.close()
+
+    driver = webdriver.Remote(ReplayConnection('login.replay'), desired_capabilities={})
+    log_in(driver)
+
+Responses are replayed with no delay, or with the latency they were
+recorded with when realtime=True. A wait which polled a few more times
+in replay than when recorded (because commands now answer instantly)
+is given the last response again; any other command which differs from
+the recording, in name or params, raises ReplayError. The capabilities
+requested when starting the session aren't compared, so a session
+recorded against one browser can be replayed with any.
+
+Without a browser, replay time goes on the sleeps between polls. Inside
+a VirtualClock block, the explicit modules' clocks run on virtual time:
+sleeps return at once, advancing the clock, and each replayed command
+advances it by the latency it was recorded with. Waits then poll as
+often, and time out after as many polls, as when recorded, but finish
+in milliseconds::
+
+    with VirtualClock():
+        log_in(driver)
+
+The virtual clock is shared by every thread, so it suits replaying a
+single threaded session.
+
+Recordings are JSON lines, gzipped when the path ends in .gz. Each
+distinct script source is stored once.
+
+"""
+
+import gzip
+import importlib
+import json
+import threading
+import time
+
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+FORMAT_VERSION = 1
+""" int: Version of the recording file format written"""
+
+_CLOCKED = ('explicit.cache', 'explicit.deadline', 'explicit.dispatch', 'explicit.metrics',
+            'explicit.waiter')
+""" tuple: Modules whose time.time and time.sleep run on a VirtualClock while one is active"""
+
+_UNCOMPARED = ('newSession',)
+""" tuple: Commands matched by name alone, as their params name the local browser setup"""
+
+_clock = None
+
+
+class ReplayError(Exception):
+    """ Raised when a replayed command doesn't match the recording """
+
+
+class RecordingConnection(RemoteConnection):
+    """ RemoteConnection saving each command and its response to a file
+
+    Args:
+        remote_server_addr (str): URL of the remote WebDriver server
+        path (str): File to record to
+        keep_alive (bool): Reuse HTTP connections
+        resolve_ip (bool): Resolve the server's hostname up front
+    """
+    def __init__(self, remote_server_addr, path, keep_alive=False, resolve_ip=True):
+        super().__init__(remote_server_addr, keep_alive=keep_alive, resolve_ip=resolve_ip)
+        self.path = path
+        self._file = _open(path, 'w')
+        self._sources = {}
+        self._lock = threading.Lock()
+        self._write({'version': FORMAT_VERSION})
+
+    def execute(self, command, params):
+        recorded = self._compact(params)
+        started = time.time()
+        response = super().execute(command, params)
+        elapsed = time.time() - started
+        with self._lock:
+            self._write({'command': command, 'params': recorded, 'response': response,
+                         'elapsed': round(elapsed, 6)})
+        return response
+
+    def close(self):
+        """ Finish the recording """
+        with self._lock:
+            self._file.close()
+
+    def _compact(self, params):
+        """ Return a copy of params, without the session ID and with any script
+        replaced by a reference to its source """
+        recorded = dict(params or {})
+        recorded.pop('sessionId', None)
+        script = recorded.get('script')
+        if script is not None:
+            with self._lock:
+                ref = self._sources.get(script)
+                if ref is None:
+                    ref = self._sources[script] = '#{0}'.format(len(self._sources))
+                    self._write({'source': ref, 'script': script})
+            recorded['script'] = ref
+        return recorded
+
+    def _write(self, entry):
+        """ Append an entry to the file. The caller holds the lock, if needed """
+        self._file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+
+
+class ReplayConnection(RemoteConnection):
+    """ RemoteConnection answering commands from a recording
+
+    Args:
+        path (str): Recording to replay
+        realtime (bool): Delay each response by the latency it was recorded with
+
+    Attributes:
+        repeated (int): Commands answered by repeating the previous response
+    """
+    def __init__(self, path, realtime=False):
+        super().__init__('http://replay.invalid', resolve_ip=False)
+        self.path = path
+        self.realtime = realtime
+        self.repeated = 0
+        self._entries = _load(path)
+        self._position = 0
+        self._previous = None
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self):
+        """ int: Recorded commands not yet replayed """
+        return len(self._entries) - self._position
+
+    def execute(self, command, params):
+        # Round trip through JSON so tuples compare equal to the recorded lists
+        sent = json.loads(json.dumps(params or {}))
+        sent.pop('sessionId', None)
+        with self._lock:
+            entry = self._next(command, sent)
+        clock = _clock
+        if self.realtime:
+            time.sleep(entry['elapsed'])
+        elif clock is not None:
+            clock.sleep(entry['elapsed'])
+        return json.loads(json.dumps(entry['response']))
+
+    def _next(self, command, params):
+        """ Return the recorded entry answering a command. The caller holds the lock """
+        entry = self._entries[self._position] if self.remaining else None
+        if entry is not None and _matches(entry, command, params):
+            self._position += 1
+            self._previous = entry
+            return entry
+
+        if self._previous is not None and _matches(self._previous, command, params):
+            self.repeated += 1
+            return self._previous
+
+        if entry is None:
+            message = 'Command {0} sent where the recording has ended'.format(command)
+        elif entry['command'] == command:
+            message = 'Command {0} sent with params {1!r} where the recording has {2!r}'.format(
+                command, params, entry['params'])
+        else:
+            message = 'Command {0} sent where the recording has {1}'.format(
+                command, entry['command'])
+        raise ReplayError(message)
+
+
+class VirtualClock(object):
+    """ Context manager running the explicit modules' clocks on virtual time
+
+    Args:
+        start (float): Virtual time to start from, defaulting to the current time
+
+    Attributes:
+        now (float): The current virtual time
+    """
+    def __init__(self, start=None):
+        self.now = time.time() if start is None else start
+        self._lock = threading.Lock()
+        self._patched = []
+
+    def __enter__(self):
+        global _clock
+        if _clock is not None:
+            raise RuntimeError('A VirtualClock is already active')
+        _clock = self
+        proxy = _ClockedTime(self)
+        for name in _CLOCKED:
+            module = importlib.import_module(name)
+            self._patched.append((module, module.time))
+            module.time = proxy
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _clock
+        for module, original in self._patched:
+            module.time = original
+        self._patched = []
+        _clock = None
+        return False
+
+    def time(self):
+        """ Return the virtual time, in seconds since the epoch """
+        return self.now
+
+    def sleep(self, seconds):
+        """ Advance the virtual time, without waiting """
+        with self._lock:
+            self.now += max(seconds, 0)
+
+
+class _ClockedTime(object):
+    """ Stand in for the time module, answering time() and sleep() from a VirtualClock """
+    def __init__(self, clock):
+        self.time = clock.time
+        self.sleep = clock.sleep
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+def _matches(entry, command, params):
+    """ Return whether a recorded entry is for the command sent """
+    return entry['command'] == command and (command in _UNCOMPARED or entry['params'] == params)
+
+
+def _load(path):
+    """ Read a recording, restoring script sources into each entry's params """
+    sources = {}
+    entries = []
+    with _open(path, 'r') as recording:
+        for line in recording:
+            entry = json.loads(line)
+            if 'source' in entry:
+                sources[entry['source']] = entry['script']
+            elif 'command' in entry:
+                params = entry['params']
+                if 'script' in params:
+                    params['script'] = sources[params['script']]
+                entries.append(entry)
+    return entries
+
+
+def _open(path, mode):
+    """ Open a recording as text, gzipped if its name ends in .gz """
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't')
+    return open(path, mode)
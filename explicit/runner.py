@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""explicit.runner
+
+Runs many page workflows in parallel across a set of drivers.
+
+A workflow is any callable taking a driver, typically built from the
+waiter functions. Runner gives each driver its own worker thread and
+queue of workflows; a worker whose queue runs dry steals work from the
+back of the longest remaining queue, so every driver stays busy until
+the whole batch is done::
+
+    runner = Runner([webdriver.Remote(grid_url) for _ in range(8)])
+    tasks = runner.run([partial(check_out, sku) for sku in skus], deadline=120)
+
+Each task runs inside an explicit.deadline.Deadline, so its waits share
+the task's time budget. Tasks failing with an infrastructure error (a
+dropped connection or dead session) are retried on a fresh driver, leased
+from a pool or started by a factory; any other exception is the
+workflow's own failure and is recorded on the task::
+
+    runner = Runner([make_driver() for _ in range(8)], factory=make_driver)
+
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPException
+
+from selenium.common.exceptions import InvalidSessionIdException, SessionNotCreatedException
+from urllib3.exceptions import HTTPError
+
+from explicit.deadline import Deadline
+from explicit.pool import DriverPool
+
+# Selenium's RemoteConnection raises urllib3's errors, e.g. MaxRetryError for a refused
+# connection, and http.client's for a malformed response; neither derives from OSError
+INFRASTRUCTURE_ERRORS = (OSError, HTTPError, HTTPException, InvalidSessionIdException,
+                         SessionNotCreatedException)
+""" tuple: Exceptions treated as infrastructure failures, and retried"""
+
+
+class Task(object):
+    """ A workflow to run, and the outcome of running it
+
+    Args:
+        workflow (callable): Called with a driver
+        deadline (float): Seconds all of the task's attempts and waits may take, or None
+        retries (int): Attempts to make after an infrastructure error, or None
+            for the runner's default
+
+    Attributes:
+        result: The workflow's return value
+        error (Exception): The exception the workflow finally failed with, or None
+        attempts (int): Times the workflow was started
+        worker (int): Index of the worker which ran the task
+        elapsed (float): Seconds spent on the task, over all attempts
+    """
+    def __init__(self, workflow, deadline=None, retries=None):
+        self.workflow = workflow
+        self.deadline = deadline
+        self.retries = retries
+        self.result = None
+        self.error = None
+        self.attempts = 0
+        self.worker = None
+        self.elapsed = None
+
+    def __repr__(self):
+        return '<{0} {1!r} attempts={2} error={3!r}>'.format(
+            type(self).__name__, self.workflow, self.attempts, self.error)
+
+    @property
+    def ok(self):
+        """ bool: Whether the task completed without an error """
+        return self.attempts > 0 and self.error is None
+
+
+class Runner(object):
+    """ Distributes workflows over drivers with work stealing
+
+    Args:
+        drivers (list or explicit.pool.DriverPool): Drivers, one worker each,
+            or a pool to lease a driver from for every attempt
+        retries (int): Default attempts to make after an infrastructure error
+        retry_on (tuple): Exception classes treated as infrastructure errors
+        workers (int): With a pool, the number of workers (defaults to the pool size)
+        factory (callable): With a list of drivers, called with no arguments to
+            start a replacement for a driver which failed with an infrastructure
+            error. Without one, infrastructure errors aren't retried, since the
+            retry would run on the same dead driver
+
+    Attributes:
+        drivers (list): Each worker's driver, including replacements started by factory
+        stats (list of dict): Per worker tasks, stolen, busy (seconds) and
+            utilization (busy fraction of the last run's wall time)
+    """
+    def __init__(self, drivers, retries=1, retry_on=INFRASTRUCTURE_ERRORS, workers=None,
+                 factory=None):
+        self.retries = retries
+        self.retry_on = retry_on
+        self.factory = factory
+        if isinstance(drivers, DriverPool):
+            self.pool = drivers
+            self.drivers = [None] * (workers or drivers.size)
+        else:
+            self.pool = None
+            self.drivers = list(drivers)
+        self.stats = []
+        self._queues = []
+        self._lock = threading.Lock()
+
+    def run(self, workflows, deadline=None):
+        """ Run workflows across the workers, returning once all are done
+
+        Args:
+            workflows (iterable): Callables taking a driver, or Task objects
+            deadline (float): Default per task deadline, in seconds, or None
+
+        Returns:
+            list of Task: The tasks, in the order given
+        """
+        tasks = [wf if isinstance(wf, Task) else Task(wf) for wf in workflows]
+        for task in tasks:
+            if task.deadline is None:
+                task.deadline = deadline
+            if task.retries is None:
+                task.retries = self.retries
+
+        count = len(self.drivers)
+        self._queues = [deque(tasks[index::count]) for index in range(count)]
+        self.stats = [{'tasks': 0, 'stolen': 0, 'busy': 0.0, 'utilization': 0.0}
+                      for _ in range(count)]
+
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            for future in [executor.submit(self._work, index) for index in range(count)]:
+                future.result()
+
+        wall = time.time() - started
+        for stats in self.stats:
+            stats['utilization'] = stats['busy'] / wall if wall else 0.0
+        return tasks
+
+    def _work(self, index):
+        """ Worker loop: run tasks from this worker's queue, then steal from others """
+        while True:
+            task = self._next(index)
+            if task is None:
+                return
+
+            started = time.time()
+            self._run_task(index, task)
+            task.elapsed = time.time() - started
+            task.worker = index
+
+            stats = self.stats[index]
+            stats['tasks'] += 1
+            stats['busy'] += task.elapsed
+
+    def _next(self, index):
+        """ Return the next task for a worker, stealing one if its queue is empty """
+        with self._lock:
+            if self._queues[index]:
+                return self._queues[index].popleft()
+
+            victim = max(self._queues, key=len)
+            if not victim:
+                return None
+            self.stats[index]['stolen'] += 1
+            return victim.pop()
+
+    def _run_task(self, index, task):
+        """ Run a task's attempts within its deadline, retrying infrastructure errors """
+        with Deadline(task.deadline if task.deadline is not None else float('inf')) as budget:
+            while True:
+                task.attempts += 1
+                try:
+                    task.result = self._attempt(index, task)
+                    task.error = None
+                    return
+                except self.retry_on as exc:
+                    task.error = exc
+                    if not self._replace(index) or task.attempts > task.retries \
+                            or budget.expired:
+                        return
+                except Exception as exc:
+                    task.error = exc
+                    return
+
+    def _attempt(self, index, task):
+        """ Run a task's workflow once, on the worker's driver or a leased one """
+        if self.pool is None:
+            if self.drivers[index] is None:
+                self.drivers[index] = self.factory()
+            return task.workflow(self.drivers[index])
+        with self.pool.lease() as driver:
+            return task.workflow(driver)
+
+    def _replace(self, index):
+        """ Discard a worker's driver after an infrastructure error
+
+        The pool retires and replaces its own drivers. A driver from a list
+        is quit, to be replaced by factory on the next attempt.
+
+        Returns:
+            bool: Whether the task can be retried on a fresh driver
+        """
+        if self.pool is not None:
+            return True
+        if self.factory is None:
+            return False
+        driver, self.drivers[index] = self.drivers[index], None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        return True
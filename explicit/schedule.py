@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""explicit.schedule
+
+Poll schedules control how long the waiter functions sleep between polls.
+Any of them can be passed as the poll_frequency of a waiter function in
+place of a fixed number of seconds.
+
+A schedule is any object with an intervals() method, returning an
+iterator of sleep durations (in seconds) for a single wait.
+
+"""
+
+import itertools
+import random
+
+POLL_FREQUENCY = 0.5
+""" float: Polling interval used when a schedule isn't given, in seconds"""
+
+
+class Constant(object):
+    """ Poll at a fixed interval, as Selenium's WebDriverWait does
+
+    Args:
+        interval (float): Seconds to sleep between polls
+    """
+    def __init__(self, interval=POLL_FREQUENCY):
+        self.interval = interval
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(type(self).__name__, self.interval)
+
+    def intervals(self):
+        """ Return an iterator of sleep durations for a single wait """
+        return itertools.repeat(self.interval)
+
+
+class Backoff(object):
+    """ Poll quickly at first, then back off exponentially
+
+    The first fast_polls polls are made every initial seconds, catching
+    elements that are already there or load right away. After that the
+    interval grows by factor on each poll, up to max_interval. Each interval
+    is then randomly spread by up to +/- jitter (a fraction of the interval)
+    so that many sessions waiting at once don't poll in lockstep.
+
+    Args:
+        initial (float): First polling interval, in seconds
+        factor (float): Multiplier applied to the interval after the fast polls
+        max_interval (float): Longest interval, in seconds, before jitter
+        fast_polls (int): Number of polls made at the initial interval
+        jitter (float): Fraction of each interval to randomly add or remove
+        rng (random.Random): Random number generator used for jitter
+    """
+    def __init__(self, initial=0.05, factor=2.0, max_interval=2.0, fast_polls=3, jitter=0.1,
+                 rng=None):
+        self.initial = initial
+        self.factor = factor
+        self.max_interval = max_interval
+        self.fast_polls = fast_polls
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+
+    def __repr__(self):
+        return ('{0}(initial={1!r}, factor={2!r}, max_interval={3!r}, fast_polls={4!r}, '
+                'jitter={5!r})').format(type(self).__name__, self.initial, self.factor,
+                                        self.max_interval, self.fast_polls, self.jitter)
+
+    def intervals(self):
+        """ Return an iterator of sleep durations for a single wait """
+        for _ in range(self.fast_polls):
+            yield self._spread(self.initial)
+
+        interval = self.initial
+        while True:
+            interval = min(interval * self.factor, self.max_interval)
+            yield self._spread(interval)
+
+    def _spread(self, interval):
+        """ Apply jitter to an interval """
+        if not self.jitter:
+            return interval
+        return max(interval * self.rng.uniform(1 - self.jitter, 1 + self.jitter), 0)
+
+
+class Delayed(object):
+    """ Sleep once for a set delay, then poll at a fixed interval
+
+    Suits elements known to take roughly delay seconds to appear: the
+    first poll catches elements already there, the second is made about
+    when the element is expected, and later polls follow closely.
+
+    Args:
+        delay (float): Seconds to sleep after the first poll
+        interval (float): Seconds to sleep between later polls
+    """
+    def __init__(self, delay, interval=POLL_FREQUENCY):
+        self.delay = delay
+        self.interval = interval
+
+    def __repr__(self):
+        return '{0}({1!r}, {2!r})'.format(type(self).__name__, self.delay, self.interval)
+
+    def intervals(self):
+        """ Return an iterator of sleep durations for a single wait """
+        return itertools.chain([self.delay], itertools.repeat(self.interval))
+
+
+def as_schedule(poll_frequency):
+    """ Return a poll schedule for a waiter function's poll_frequency argument
+
+    Args:
+        poll_frequency (float or schedule): Seconds between polls, or a schedule
+
+    Returns:
+        schedule: The schedule itself, or a Constant schedule for a number.
+            As with WebDriverWait, a frequency of 0 uses POLL_FREQUENCY.
+    """
+    if hasattr(poll_frequency, 'intervals'):
+        return poll_frequency
+    return Constant(poll_frequency or POLL_FREQUENCY)
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""explicit.snapshot
+
+Read-only DOM snapshots, taken with waiter.snapshot.
+
+A Snapshot parses the page's serialized DOM, pulled from the browser in
+a single call, and resolves Selenium locators against it locally. Reading
+the text and attributes of hundreds of nodes then costs no WebDriver
+commands at all; live WebElements are only fetched, in one batched call,
+for the nodes that need to be interacted with.
+
+Snapshots require the optional lxml and cssselect packages, installable
+with ``pip install explicit[snapshot]``.
+
+"""
+
+try:
+    import lxml.html
+except ImportError:  # pragma: no cover
+    lxml = None
+
+from explicit import CLASS_NAME, CSS, ID, LINK, NAME, PARTIAL_LINK, TAG, XPATH
+from explicit import _scripts, dispatch
+
+_XPATHS = {
+    ID: './/*[@id=$value]',
+    NAME: './/*[@name=$value]',
+    TAG: './/*[local-name()=$value]',
+    CLASS_NAME: ".//*[contains(concat(' ', normalize-space(@class), ' '), "
+                "concat(' ', $value, ' '))]",
+    LINK: './/a[normalize-space(string(.))=$value]',
+    PARTIAL_LINK: './/a[contains(string(.), $value)]',
+}
+
+
+class Snapshot(object):
+    """ A parsed copy of the page's DOM, or of the subtree beneath an element
+
+    Args:
+        driver (selenium webdriver): The driver the snapshot was taken from
+        html (str): Serialized DOM
+        root (element): The element the snapshot was taken beneath, or None
+            for the whole document
+    """
+    def __init__(self, driver, html, root=None):
+        if lxml is None:
+            raise ImportError('DOM snapshots require lxml and cssselect: '
+                              'pip install explicit[snapshot]')
+        self.driver = driver
+        self.root = root
+        self.tree = lxml.html.fromstring(html)
+
+    def find_all(self, path, by=CSS):
+        """ Return a SnapshotNode for every node matching a locator
+
+        Args:
+            path (str): String used to locate the nodes
+            by (selenium By): Selenium By reference
+        """
+        return [SnapshotNode(self, node) for node in _resolve(self.tree, path, by)]
+
+    def find(self, path, by=CSS):
+        """ Return a SnapshotNode for the first node matching a locator, or None """
+        found = self.find_all(path, by=by)
+        return found[0] if found else None
+
+    def live(self, nodes):
+        """ Fetch the live WebElements for snapshot nodes, with one script call
+
+        Args:
+            nodes (list of SnapshotNode): Nodes to fetch elements for
+
+        Returns:
+            list of elements, in node order; None for any node no longer in the page
+        """
+        if not nodes:
+            return []
+        with dispatch.lock_for(self.driver):
+            found = self.driver.execute_script(
+                _scripts.FIND_ALL, [[XPATH, node.xpath] for node in nodes], self.root)
+        return [elems[0] if elems else None for elems in found]
+
+
+class SnapshotNode(object):
+    """ A node in a Snapshot
+
+    Attributes:
+        tag_name (str): The node's tag name
+        xpath (str): XPath locating the node in the live page; absolute for
+            document snapshots, relative to the root element otherwise
+    """
+    def __init__(self, snapshot, node):
+        self.snapshot = snapshot
+        self.node = node
+        self.tag_name = node.tag
+        self.xpath = _xpath(node, snapshot.tree, absolute=snapshot.root is None)
+
+    def __repr__(self):
+        return '<{0} {1}>'.format(type(self).__name__, self.xpath)
+
+    @property
+    def text(self):
+        """ str: The node's text content, with whitespace collapsed """
+        return ' '.join(self.node.text_content().split())
+
+    def get_attribute(self, name):
+        """ Return an attribute's value, or None if the node doesn't have it """
+        return self.node.get(name)
+
+    def find_all(self, path, by=CSS):
+        """ Return SnapshotNodes for the nodes beneath this one matching a locator """
+        return [SnapshotNode(self.snapshot, node) for node in _resolve(self.node, path, by)]
+
+    def live(self):
+        """ Fetch the live WebElement for this node, or None if it's no longer in the page """
+        return self.snapshot.live([self])[0]
+
+
+def _resolve(node, path, by):
+    """ Return the element nodes beneath node matching a locator """
+    if by == CSS:
+        found = node.cssselect(path)
+    elif by == XPATH:
+        found = node.xpath(path)
+    else:
+        found = node.xpath(_XPATHS[by], value=path)
+    return [match for match in found if isinstance(getattr(match, 'tag', None), str)]
+
+
+def _xpath(node, top, absolute):
+    """ Return an XPath from top (the snapshot's root node) down to node """
+    steps = []
+    while node is not top:
+        parent = node.getparent()
+        siblings = [sib for sib in parent if sib.tag == node.tag]
+        steps.append("*[local-name()='{0}'][{1}]".format(node.tag, siblings.index(node) + 1))
+        node = parent
+    steps.reverse()
+
+    if absolute:
+        steps.insert(0, "/*[local-name()='{0}']".format(top.tag))
+        return '/'.join(steps)
+    return '/'.join(['.'] + steps)
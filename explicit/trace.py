@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""explicit.trace
+
+Timeline export of wait activity in the Chrome trace event format.
+
+While a Tracer is started, every waiter call, every poll and every
+WebDriver command sent through selenium's RemoteConnection is recorded
+as a span. Each driver session gets its own lane, so a parallel run
+opened in chrome://tracing or https://ui.perfetto.dev shows where each
+session sits idle between polls and where it's blocked on the server::
+
+    tracer = trace.start('run.trace.json')
+    run_the_suite()
+    trace.stop()
+
+Tracing only one block of code works the same way, with the tracer as a
+context manager::
+
+    with trace.Tracer('login.trace.json'):
+        waiter.find_write(driver, "login_field", "my_username", by=ID)
+
+"""
+
+import json
+import os
+import threading
+import time
+
+from explicit import metrics
+
+_tracer = None
+_original_execute = None
+
+
+class Tracer(object):
+    """ Collects spans as Chrome trace events
+
+    Args:
+        path (str): File the trace is written to when the tracer stops, or None
+
+    Attributes:
+        events (list of dict): Trace events recorded so far
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.events = []
+        self._lanes = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return start(tracer=self)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        stop()
+        return False
+
+    def __call__(self, record):
+        """ Record a finished waiter call, as a metrics sink """
+        args = {'by': record.by, 'locator': record.locator, 'polls': record.polls,
+                'commands': record.commands, 'found': record.found}
+        self.add(record.function, 'call', record.session, record.started, record.elapsed, args)
+
+    def add(self, name, category, session, started, elapsed, args=None):
+        """ Record a span
+
+        Args:
+            name (str): Span name
+            category (str): Span category: 'call', 'poll' or 'command'
+            session (str): Session ID of the driver, or None for the calling thread's lane
+            started (float): Start time, as returned by time.time()
+            elapsed (float): Duration, in seconds
+            args (dict): Extra values shown with the span
+        """
+        event = {'name': name, 'cat': category, 'ph': 'X', 'pid': os.getpid(),
+                 'ts': started * 1e6, 'dur': elapsed * 1e6}
+        if args:
+            event['args'] = args
+        with self._lock:
+            event['tid'] = self._lane(session)
+            self.events.append(event)
+
+    def span(self, name, category, session, args=None):
+        """ Return a context manager recording the block it wraps as a span """
+        return _Span(self, name, category, session, args)
+
+    def save(self, path=None):
+        """ Write the trace as JSON
+
+        Args:
+            path (str): File to write, defaulting to the path the tracer was created with
+        """
+        with self._lock:
+            data = json.dumps({'traceEvents': list(self.events), 'displayTimeUnit': 'ms'},
+                              default=repr)
+        with open(path or self.path, 'w') as trace_file:
+            trace_file.write(data)
+
+    def _lane(self, session):
+        """ Return the trace thread ID for a session's lane. The caller holds the lock """
+        name = session or threading.current_thread().name
+        lane = self._lanes.get(name)
+        if lane is None:
+            lane = self._lanes[name] = len(self._lanes) + 1
+            self.events.append({'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(),
+                                'tid': lane, 'args': {'name': name}})
+        return lane
+
+
+class _Span(object):
+    """ Context manager timing a block for a tracer """
+    def __init__(self, tracer, name, category, session, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.session = session
+        self.args = args
+        self.started = None
+
+    def __enter__(self):
+        self.started = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tracer.add(self.name, self.category, self.session, self.started,
+                        time.time() - self.started, self.args)
+        return False
+
+
+class _Untraced(object):
+    """ Stand in for a span while no tracer is started """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_UNTRACED = _Untraced()
+
+
+def start(path=None, tracer=None):
+    """ Start tracing waiter calls, polls and WebDriver commands
+
+    Args:
+        path (str): File the trace is written to when tracing stops, or None
+        tracer (Tracer): Tracer to record into, instead of a new one
+
+    Returns:
+        Tracer: The tracer now recording
+    """
+    global _tracer, _original_execute
+    # Imported here, as it loads urllib3, which waiting without tracing doesn't need
+    from selenium.webdriver.remote.remote_connection import RemoteConnection
+    stop()
+    _tracer = tracer or Tracer(path)
+    metrics.add_sink(_tracer)
+    if _original_execute is None:
+        _original_execute = RemoteConnection.execute
+    RemoteConnection.execute = _traced_execute
+    return _tracer
+
+
+def stop():
+    """ Stop tracing, writing the trace to the tracer's path if it has one
+
+    Returns:
+        Tracer: The tracer which was recording, or None
+    """
+    global _tracer
+    current, _tracer = _tracer, None
+    if current is None:
+        return None
+    from selenium.webdriver.remote.remote_connection import RemoteConnection
+    RemoteConnection.execute = _original_execute
+    metrics.remove_sink(current)
+    if current.path is not None:
+        current.save()
+    return current
+
+
+def tracer():
+    """ Return the Tracer recording, or None """
+    return _tracer
+
+
+def poll(driver):
+    """ Return a context manager recording a poll made with driver, if tracing """
+    current = _tracer
+    if current is None:
+        return _UNTRACED
+    return current.span('poll', 'poll', metrics.session_id(driver))
+
+
+def _traced_execute(connection, command, params):
+    """ RemoteConnection.execute, recording each command as a span """
+    current = _tracer
+    if current is None:
+        return _original_execute(connection, command, params)
+    session = params.get('sessionId') if isinstance(params, dict) else None
+    with current.span(command, 'command', session):
+        return _original_execute(connection, command, params)
@@ -4,32 +4,71 @@
 A collection of helper functions to make working with Selenium's
 explicit wait functionality easier.
 
+Selenium's webdriver package, and the optional subsystems (element
+cache, dispatcher, rate limit, profile, history and tracing), are
+imported where they're used, so importing this module stays cheap.
+
 """
 
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import time
+from collections import OrderedDict
+
+from selenium.common.exceptions import (
+    NoSuchElementException, NoSuchFrameException, NoSuchWindowException,
+    StaleElementReferenceException, TimeoutException, WebDriverException)
 
 from explicit import (
     CLASS_NAME, CSS, ID, LINK, NAME, PARTIAL_LINK, TAG, XPATH)
+from explicit import _scripts, deadline, metrics, schedule
 
 TIMEOUT = 30
 """ int: Default timeout value, in seconds"""
 
+OBSERVE_WINDOW = 5
+""" int: Longest time, in seconds, a single in-browser observation may block for"""
+
+CHUNK_SIZE = 500
+""" int: Default number of elements read per script call by iter_texts and iter_attrs"""
 
-def find_element(driver, elem_path, by=CSS, timeout=TIMEOUT, poll_frequency=0.5):
+RETRIES = 3
+""" int: Default number of times find_write, find_click and find_select re-locate a stale element"""
+
+
+@metrics.instrumented('elem_path')
+def find_element(driver, elem_path, by=CSS, timeout=None, poll_frequency=None,
+                 observe=False, ready_first=False):
     """ Find and return an element once located
 
     find_element locates an element on the page, waiting
     for up to timeout seconds. The element, when located,
     is returned. If not located, a TimeoutException is raised.
 
+    If caching is enabled for the driver (see explicit.cache), a
+    previously located element that is still attached is returned
+    without locating it again, unless ready_first is set, as the page
+    may still be loading.
+
+    If a dispatcher is enabled for the driver (see explicit.dispatch),
+    identical calls made from other threads at the same time share one
+    poll loop.
+
+    If a profile store is enabled (see explicit.profile), a timeout or
+    poll_frequency which isn't passed is tuned from the locator's
+    recorded time-to-found.
+
     Args:
         driver (selenium webdriver or element): A driver or element
         elem_path (str): String used to located the element
         by (selenium By): Selenium By reference
-        timeout (int): Selenium Wait timeout, in seconds
-        poll_frequency (float): Selenium Wait polling frequency, in seconds
+        timeout (int): Selenium Wait timeout, in seconds. Defaults to TIMEOUT,
+            or to the tuned timeout when a profile store is enabled
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule. Defaults to 0.5 seconds, or to
+            the tuned schedule when a profile store is enabled
+        observe (bool): Wait in the browser with a MutationObserver, returning
+            as soon as the element is added, rather than polling
+        ready_first (bool): Also wait for the page to be ready (see wait_ready),
+            checking readiness and presence in one script per poll. Overrides observe
 
     Returns:
         element: Selenium element
@@ -37,11 +76,37 @@ def find_element(driver, elem_path, by=CSS, timeout=TIMEOUT, poll_frequency=0.5)
     Raises:
         TimeoutException: Raised when target element isn't located
     """
-    wait = WebDriverWait(driver, timeout, poll_frequency)
-    return wait.until(EC.presence_of_element_located((by, elem_path)))
+    from selenium.webdriver.support import expected_conditions as EC
+    from explicit import cache
+
+    elem_cache = cache.cache_for(driver)
+    if elem_cache is not None and not ready_first:
+        elem = elem_cache.get(driver, by, elem_path)
+        if elem is not None:
+            return elem
+
+    profile_key, timeout, poll_frequency = _tuning(driver, by, elem_path, timeout, poll_frequency)
 
+    def _locate(timeout):
+        wait = _Wait(driver, timeout, poll_frequency)
+        if ready_first:
+            return wait.until(_ready_find(driver, by, elem_path))[0]
+        if observe:
+            return wait.until(_Observe(by, elem_path, wait._timeout))[0]
+        return wait.until(EC.presence_of_element_located((by, elem_path)))
 
-def find_elements(driver, elem_path, by=CSS, timeout=TIMEOUT, poll_frequency=0.5):
+    started = time.time()
+    elem = _coalesce(driver, ('find_element', by, elem_path, observe, ready_first), timeout,
+                     _locate)
+    _profile_found(profile_key, started)
+    if elem_cache is not None:
+        elem_cache.put(driver, by, elem_path, elem)
+    return elem
+
+
+@metrics.instrumented('elem_path')
+def find_elements(driver, elem_path, by=CSS, timeout=None, poll_frequency=None,
+                  observe=False, ready_first=False):
     """ Find and return all elements once located
 
     find_elements locates all elements on the page, waiting
@@ -52,8 +117,15 @@ def find_elements(driver, elem_path, by=CSS, timeout=TIMEOUT, poll_frequency=0.5
         driver (selenium webdriver or element): A driver or element
         elem_path (str): String used to located the element
         by (selenium By): Selenium By reference
-        timeout (int): Selenium Wait timeout, in seconds
-        poll_frequency (float): Selenium Wait polling frequency, in seconds
+        timeout (int): Selenium Wait timeout, in seconds. Defaults to TIMEOUT,
+            or to the tuned timeout when a profile store is enabled
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule. Defaults to 0.5 seconds, or to
+            the tuned schedule when a profile store is enabled
+        observe (bool): Wait in the browser with a MutationObserver, returning
+            as soon as the elements are added, rather than polling
+        ready_first (bool): Also wait for the page to be ready (see wait_ready),
+            checking readiness and presence in one script per poll. Overrides observe
 
     Returns:
         list of elements: Selenium element
@@ -61,17 +133,110 @@ def find_elements(driver, elem_path, by=CSS, timeout=TIMEOUT, poll_frequency=0.5
     Raises:
         TimeoutException: Raised when target element isn't located
     """
-    wait = WebDriverWait(driver, timeout, poll_frequency)
-    return wait.until(EC.presence_of_all_elements_located((by, elem_path)))
+    from selenium.webdriver.support import expected_conditions as EC
+
+    profile_key, timeout, poll_frequency = _tuning(driver, by, elem_path, timeout, poll_frequency)
+
+    def _locate(timeout):
+        wait = _Wait(driver, timeout, poll_frequency)
+        if ready_first:
+            return wait.until(_ready_find(driver, by, elem_path))
+        if observe:
+            return wait.until(_Observe(by, elem_path, wait._timeout))
+        return wait.until(EC.presence_of_all_elements_located((by, elem_path)))
+
+    started = time.time()
+    elems = _coalesce(driver, ('find_elements', by, elem_path, observe, ready_first), timeout,
+                      _locate)
+    _profile_found(profile_key, started)
+    return elems
+
+
+@metrics.instrumented('elem_path')
+def find_element_in_frames(driver, elem_path, by=CSS, timeout=TIMEOUT, poll_frequency=0.5):
+    """ Find an element in any frame or open shadow root, once located
+
+    Every frame in the page is searched, with one script per frame which
+    also looks inside the frame's open shadow roots. The frame the element
+    was last found in is searched first on later polls. Elements can only
+    be used from their own frame, so the driver is left switched into the
+    frame the element was found in; switch_to_frame_path returns to it
+    later.
+
+    Args:
+        driver (selenium webdriver): Selenium webdriver object
+        elem_path (str): String used to located the element
+        by (selenium By): Selenium By reference
+        timeout (int): Selenium Wait timeout, in seconds
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule
+
+    Returns:
+        tuple: (element, list of the frame elements leading to it, outermost first)
+
+    Raises:
+        TimeoutException: Raised when target element isn't located
+    """
+    search = _FrameSearch(by, elem_path)
+    elems = _Wait(driver, timeout, poll_frequency, commands_per_poll=0).until(search)
+    return elems[0], search.frame_path
+
+
+@metrics.instrumented('elem_path')
+def find_elements_in_frames(driver, elem_path, by=CSS, timeout=TIMEOUT, poll_frequency=0.5):
+    """ Find all elements in the first frame, or its shadow roots, containing any
+
+    Like find_element_in_frames, but every element located in that frame
+    is returned.
+
+    Returns:
+        tuple: (list of elements, list of the frame elements leading to them)
+
+    Raises:
+        TimeoutException: Raised when target elements aren't located
+    """
+    search = _FrameSearch(by, elem_path)
+    elems = _Wait(driver, timeout, poll_frequency, commands_per_poll=0).until(search)
+    return elems, search.frame_path
+
+
+def switch_to_frame_path(driver, frame_path):
+    """ Switch the driver into a frame returned by find_element_in_frames
+
+    Args:
+        driver (selenium webdriver): Selenium webdriver object
+        frame_path (list of elements): Frame elements, outermost first
+    """
+    with _sending(driver, 1 + len(frame_path)):
+        _switch_to_frame_path(driver, frame_path)
 
 
-def find_one(driver, locator_list, elem_type=CSS, timeout=TIMEOUT):
+def _switch_to_frame_path(driver, frame_path):
+    """ Switch into a frame path, for a caller already holding the dispatcher lock """
+    driver.switch_to.default_content()
+    for frame in frame_path:
+        driver.switch_to.frame(frame)
+    metrics.count(1 + len(frame_path))
+
+
+@metrics.instrumented('locator_list', by_arg='elem_type')
+def find_one(driver, locator_list, elem_type=CSS, timeout=TIMEOUT, batch=False,
+             poll_frequency=0.5, short_circuit=False, history=None):
     """
     Args:
         driver (selenium webdriver): Selenium webdriver object
         locator_list (:obj: `list` of :obj: `str`): List of CSS selector strings
         elem_type (Selenium By types): Selenium By type (i.e. By.CSS_SELECTOR)
         timeout (int): Number of seconds to wait before timing out
+        batch (bool): Resolve every locator in a single execute_script call
+            per poll, instead of one find_elements call per locator
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule
+        short_circuit (bool): Stop each poll at the first locator which
+            matches, trying locators in order of past matches
+        history (explicit.history.LocatorHistory): Match history used to
+            order the locators. Defaults to the shared in-memory history
+            when short_circuit is set
 
     Returns:
         Selenium Element
@@ -79,27 +244,37 @@ def find_one(driver, locator_list, elem_type=CSS, timeout=TIMEOUT):
     Raises:
         TimeoutException: Raised if no elements are found within the TIMEOUT
     """
+    if short_circuit and history is None:
+        from explicit import history as locator_history
+        history = locator_history.shared()
+    search_order = history.order(locator_list, elem_type) if history else locator_list
+    finder = _FINDERS[elem_type]
+
     def _find_one(driver):
         """ Expected Condition to find and return first located element """
-        finders = {
-            CLASS_NAME: driver.find_elements_by_class_name,
-            CSS: driver.find_elements_by_css_selector,
-            ID: driver.find_elements_by_id,
-            LINK: driver.find_elements_by_link_text,
-            NAME: driver.find_elements_by_name,
-            PARTIAL_LINK: driver.find_elements_by_partial_link_text,
-            TAG: driver.find_elements_by_tag_name,
-            XPATH: driver.find_elements_by_xpath
-        }
-
-        elems = [finders[elem_type](loc) for loc in locator_list]
+        if batch:
+            elems = _locate_all(driver, [(elem_type, loc) for loc in locator_list])
+        elif short_circuit:
+            elems = _first_match(getattr(driver, finder), locator_list, search_order)
+        else:
+            elems = [getattr(driver, finder)(loc) for loc in locator_list]
 
         if any([len(elem_list) > 0 for elem_list in elems]):
             return elems
         else:
             return False
 
-    raw_results = WebDriverWait(driver, timeout).until(_find_one)
+    # Short circuited polls count their commands as they're sent
+    commands_per_poll = 1 if batch else 0 if short_circuit else len(locator_list)
+    raw_results = _Wait(driver, timeout, poll_frequency,
+                        commands_per_poll=commands_per_poll).until(_find_one)
+
+    matched = next(loc for loc in search_order if raw_results[locator_list.index(loc)])
+    if history is not None:
+        history.record(locator_list, elem_type, matched)
+    rec = metrics.current()
+    if rec is not None:
+        rec.matched = matched
 
     # Pull out any found elements from lists
     results = [elem for elem_list in raw_results for elem in elem_list]
@@ -107,14 +282,20 @@ def find_one(driver, locator_list, elem_type=CSS, timeout=TIMEOUT):
     return results.pop() if len(results) == 1 else results
 
 
+@metrics.instrumented('elem_path')
 def find_write(driver, elem_path, write_str, clear_first=True, send_enter=False,
-               by=CSS, timeout=TIMEOUT, poll_frequency=0.5):
+               by=CSS, timeout=None, poll_frequency=None, retries=RETRIES, wait_for=None,
+               ready_first=False):
     """ Find a writable element and write to it
 
     find_write locates a writable element on the page, waiting
     for up to timeout seconds. Once found, it writes the string
     to it.
 
+    If the element goes stale before the string is written, because the
+    page re-rendered it, it is located again and the write retried, up to
+    retries times, all within the original timeout.
+
     Args:
         driver (selenium webdriver or element): A driver or element
         elem_path (str): String used to located the element
@@ -122,24 +303,990 @@ def find_write(driver, elem_path, write_str, clear_first=True, send_enter=False,
         clear_first (bool): Clear the contents before writing (default True)
         send_enter (bool): Send a keyboard ENTER after writing string
         by (selenium By): Selenium By reference
-        timeout (int): Selenium Wait timeout, in seconds
-        poll_frequency (float): Selenium Wait polling frequency, in seconds
+        timeout (int): Selenium Wait timeout, in seconds. Defaults to TIMEOUT,
+            or to the tuned timeout when a profile store is enabled
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule. Defaults to 0.5 seconds, or to
+            the tuned schedule when a profile store is enabled
+        retries (int): Times to re-locate the element if it goes stale
+        wait_for (str): Also wait for the element to be 'enabled' or 'clickable'
+            (displayed and enabled) before writing, or None
+        ready_first (bool): Also wait for the page to be ready (see wait_ready)
+            while locating the element, in one script per poll
 
     Returns:
         element: Selenium element
 
     Raises:
         TimeoutException: Raised when target element isn't located
+        StaleElementReferenceException: Raised when the element is still
+            going stale after all retries
     """
-    elem = find_element(driver, elem_path=elem_path, by=by, timeout=timeout,
-                        poll_frequency=poll_frequency)
+    def _write(elem):
+        if clear_first:
+            elem.clear()
 
-    if clear_first:
-        elem.clear()
+        elem.send_keys(write_str)
 
-    elem.send_keys(write_str)
+        if send_enter:
+            elem.send_keys(_ENTER)
 
-    if send_enter:
-        elem.send_keys(Keys.ENTER)
+        metrics.count(1 + clear_first + send_enter)
 
-    return elem
+    return _act(driver, elem_path, by, timeout, poll_frequency, retries, wait_for, ready_first,
+                _write, 1 + clear_first + send_enter)
+
+
+@metrics.instrumented('elem_path')
+def find_click(driver, elem_path, by=CSS, timeout=None, poll_frequency=None,
+               retries=RETRIES, wait_for='clickable', ready_first=False):
+    """ Find an element and click it
+
+    find_click locates an element on the page, waiting for up to
+    timeout seconds, and by default for it to be displayed and
+    enabled, then clicks it. A stale element is located again and
+    the click retried, as in find_write.
+
+    Args:
+        driver (selenium webdriver or element): A driver or element
+        elem_path (str): String used to located the element
+        by (selenium By): Selenium By reference
+        timeout (int): Selenium Wait timeout, in seconds. Defaults to TIMEOUT,
+            or to the tuned timeout when a profile store is enabled
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule. Defaults to 0.5 seconds, or to
+            the tuned schedule when a profile store is enabled
+        retries (int): Times to re-locate the element if it goes stale
+        wait_for (str): Wait for the element to be 'enabled' or 'clickable'
+            (displayed and enabled) before clicking, or None
+        ready_first (bool): Also wait for the page to be ready (see wait_ready)
+            while locating the element, in one script per poll
+
+    Returns:
+        element: Selenium element
+
+    Raises:
+        TimeoutException: Raised when target element isn't located, or isn't clickable
+        StaleElementReferenceException: Raised when the element is still
+            going stale after all retries
+    """
+    def _click(elem):
+        elem.click()
+        metrics.count()
+
+    return _act(driver, elem_path, by, timeout, poll_frequency, retries, wait_for, ready_first,
+                _click, 1)
+
+
+@metrics.instrumented('elem_path')
+def find_select(driver, elem_path, option, select_by='text', by=CSS, timeout=None,
+                poll_frequency=None, retries=RETRIES, wait_for='enabled', ready_first=False):
+    """ Find a select element and choose one of its options
+
+    find_select locates a select element on the page, waiting for up
+    to timeout seconds, and by default for it to be enabled, then
+    selects an option. A stale element is located again and the
+    selection retried, as in find_write.
+
+    Args:
+        driver (selenium webdriver or element): A driver or element
+        elem_path (str): String used to located the select element
+        option (str or int): The option's visible text, value or index
+        select_by (str): What option is: 'text', 'value' or 'index'
+        by (selenium By): Selenium By reference
+        timeout (int): Selenium Wait timeout, in seconds. Defaults to TIMEOUT,
+            or to the tuned timeout when a profile store is enabled
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule. Defaults to 0.5 seconds, or to
+            the tuned schedule when a profile store is enabled
+        retries (int): Times to re-locate the element if it goes stale
+        wait_for (str): Wait for the element to be 'enabled' or 'clickable'
+            (displayed and enabled) before selecting, or None
+        ready_first (bool): Also wait for the page to be ready (see wait_ready)
+            while locating the element, in one script per poll
+
+    Returns:
+        element: Selenium element
+
+    Raises:
+        TimeoutException: Raised when target element isn't located
+        NoSuchElementException: Raised when the select has no such option
+        StaleElementReferenceException: Raised when the element is still
+            going stale after all retries
+    """
+    from selenium.webdriver.support.ui import Select
+
+    select_option = _SELECTORS[select_by]
+
+    def _select(elem):
+        getattr(Select(elem), select_option)(option)
+        # Select reads the tag name and multiple attribute, then finds and clicks the option
+        metrics.count(4)
+
+    return _act(driver, elem_path, by, timeout, poll_frequency, retries, wait_for, ready_first,
+                _select, 4)
+
+
+@metrics.instrumented('fields')
+def find_write_many(driver, fields, clear_first=True, send_enter=False, by=CSS,
+                    timeout=TIMEOUT, poll_frequency=0.5, use_js=True):
+    """ Find several writable elements and write to all of them
+
+    find_write_many waits for up to timeout seconds for every field
+    to be present, then writes each field's string to it. Fields are
+    located together, with one execute_script call per poll.
+
+    By default the values are set with that same script, which fires
+    input and change events for each field, so a whole form can be
+    filled with a single WebDriver command. With use_js=False the
+    fields are typed into with clear and send_keys instead, for pages
+    which only react to real keyboard input.
+
+    Args:
+        driver (selenium webdriver or element): A driver or element
+        fields (dict): Maps each locator to the string to write. A locator
+            is either a path, located with by, or a (by, path) tuple
+        clear_first (bool): Clear the contents before writing (default True)
+        send_enter (bool): Send a keyboard ENTER to the last field after writing
+        by (selenium By): Selenium By reference for locators given as paths
+        timeout (int): Selenium Wait timeout, in seconds
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule
+        use_js (bool): Set the values with JavaScript rather than send_keys
+
+    Returns:
+        dict: Maps each locator to its element, empty when fields is
+
+    Raises:
+        TimeoutException: Raised when any target element isn't located
+    """
+    if not fields:
+        return {}
+
+    locators = list(fields)
+    targets = [_as_locator(loc, by) for loc in locators]
+    wait = _Wait(driver, timeout, poll_frequency)
+
+    if use_js:
+        executor, root = _script_target(driver)
+        fill = [[loc_by, path, fields[loc]] for loc, (loc_by, path) in zip(locators, targets)]
+        elems = wait.until(
+            lambda _: executor.execute_script(_scripts.FILL, fill, clear_first, root))
+    else:
+        def _find_all(driver):
+            """ Expected Condition to find every field, or False if any are missing """
+            found = _locate_all(driver, targets)
+            return found if all(found) else False
+
+        elems = [found[0] for found in wait.until(_find_all)]
+        with _sending(driver, len(elems) * (1 + clear_first)):
+            for loc, elem in zip(locators, elems):
+                if clear_first:
+                    elem.clear()
+                elem.send_keys(fields[loc])
+        metrics.count(len(elems) * (1 + clear_first))
+
+    if send_enter and elems:
+        with _sending(driver):
+            elems[-1].send_keys(_ENTER)
+        metrics.count()
+
+    return dict(zip(locators, elems))
+
+
+@metrics.instrumented('locators')
+def wait_all(driver, locators, by=CSS, timeout=TIMEOUT, poll_frequency=0.5):
+    """ Wait for all of several locators or conditions, in one poll loop
+
+    wait_all waits for up to timeout seconds for every locator to match
+    and every condition to be met. All the locators are resolved with a
+    single execute_script call per poll, so waiting for N elements costs
+    one poll loop bounded by the slowest, rather than N serial waits.
+
+    Args:
+        driver (selenium webdriver or element): A driver or element
+        locators (iterable): Paths, located with by, (by, path) tuples, or
+            Expected Condition callables taking the driver
+        by (selenium By): Selenium By reference for locators given as paths
+        timeout (int): Selenium Wait timeout, in seconds
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule
+
+    Returns:
+        dict: Maps each locator to its list of elements, and each condition
+            to the value it returned. Empty, without polling, when locators is
+
+    Raises:
+        TimeoutException: Raised when any locator or condition isn't satisfied
+    """
+    locators = list(locators)
+    if not locators:
+        return {}
+    return _wait_many(driver, locators, by, timeout, poll_frequency, need_all=True)
+
+
+@metrics.instrumented('locators')
+def wait_any(driver, locators, by=CSS, timeout=TIMEOUT, poll_frequency=0.5):
+    """ Wait for any of several locators or conditions, in one poll loop
+
+    wait_any waits for up to timeout seconds for at least one locator to
+    match or condition to be met. All the locators are resolved with a
+    single execute_script call per poll.
+
+    Args:
+        driver (selenium webdriver or element): A driver or element
+        locators (iterable): Paths, located with by, (by, path) tuples, or
+            Expected Condition callables taking the driver
+        by (selenium By): Selenium By reference for locators given as paths
+        timeout (int): Selenium Wait timeout, in seconds
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule
+
+    Returns:
+        dict: Maps each satisfied locator to its list of elements, and each
+            satisfied condition to the value it returned
+
+    Raises:
+        TimeoutException: Raised when no locator or condition is satisfied
+        ValueError: Raised when locators is empty, as nothing could satisfy it
+    """
+    locators = list(locators)
+    if not locators:
+        raise ValueError('wait_any needs at least one locator or condition')
+    return _wait_many(driver, locators, by, timeout, poll_frequency, need_all=False)
+
+
+@metrics.instrumented('locators')
+def wait_gone(driver, locators, by=CSS, timeout=TIMEOUT, poll_frequency=0.5, observe=False):
+    """ Wait until none of several locators match any element
+
+    Waits for spinners, overlays and the like to be removed from the
+    page. Every locator is checked with a single execute_script call per
+    poll, so no elements are fetched and none can go stale.
+
+    Args:
+        driver (selenium webdriver or element): A driver or element
+        locators (str or iterable): A path, or paths located with by and
+            (by, path) tuples
+        by (selenium By): Selenium By reference for locators given as paths
+        timeout (int): Selenium Wait timeout, in seconds
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule
+        observe (bool): Wait in the browser with a MutationObserver, returning
+            as soon as the last element is removed, rather than polling
+
+    Returns:
+        bool: True
+
+    Raises:
+        TimeoutException: Raised when a locator still matches at the timeout
+    """
+    return _wait_vanished(driver, locators, by, False, timeout, poll_frequency, observe)
+
+
+@metrics.instrumented('locators')
+def wait_invisible(driver, locators, by=CSS, timeout=TIMEOUT, poll_frequency=0.5, observe=False):
+    """ Wait until none of several locators match a displayed element
+
+    Like wait_gone, but elements still in the page count as gone once
+    they're hidden: not rendered, visibility hidden or fully transparent.
+
+    Returns:
+        bool: True
+
+    Raises:
+        TimeoutException: Raised when a locator still matches a displayed
+            element at the timeout
+    """
+    return _wait_vanished(driver, locators, by, True, timeout, poll_frequency, observe)
+
+
+def _wait_vanished(driver, locators, by, visible_only, timeout, poll_frequency, observe):
+    """ Wait for locators to vanish, for wait_gone and wait_invisible """
+    if isinstance(locators, (str, tuple)):
+        locators = [locators]
+    targets = [list(_as_locator(loc, by)) for loc in locators]
+
+    wait = _Wait(driver, timeout, poll_frequency)
+    if observe:
+        return wait.until(_ObserveGone(targets, visible_only, wait._timeout))
+    return wait.until(_vanished(targets, visible_only))
+
+
+def _vanished(targets, visible_only):
+    """ Return a condition checking in one script whether [by, path] locators have vanished """
+    def _check(driver):
+        executor, root = _script_target(driver)
+        return executor.execute_script(_scripts.GONE, targets, visible_only, root)
+    return _check
+
+
+def _wait_many(driver, entries, by, timeout, poll_frequency, need_all):
+    """ Poll a mix of locators and conditions together, for wait_all and wait_any """
+    # A locator given twice is one entry, matched once
+    entries = list(OrderedDict.fromkeys(entries))
+    conditions = [entry for entry in entries if callable(entry)]
+    locators = [entry for entry in entries if not callable(entry)]
+    targets = [_as_locator(loc, by) for loc in locators]
+
+    def _satisfied(driver):
+        """ Expected Condition returning the satisfied entries, once enough are """
+        results = {}
+        if targets:
+            for loc, found in zip(locators, _locate_all(driver, targets)):
+                if found:
+                    results[loc] = found
+        for condition in conditions:
+            try:
+                value = condition(driver)
+            except (NoSuchElementException, StaleElementReferenceException):
+                value = False
+            if value:
+                results[condition] = value
+
+        done = len(results) == len(entries) if need_all else bool(results)
+        if done:
+            return dict((entry, results[entry]) for entry in entries if entry in results)
+        return False
+
+    commands_per_poll = (1 if targets else 0) + len(conditions)
+    return _Wait(driver, timeout, poll_frequency,
+                 commands_per_poll=commands_per_poll).until(_satisfied)
+
+
+@metrics.instrumented(None)
+def wait_ready(driver, timeout=TIMEOUT, poll_frequency=0.5):
+    """ Wait for the page to finish loading and its network requests to settle
+
+    The page is ready once document.readyState is complete and no fetch
+    or XMLHttpRequest calls are in flight. Both are checked with a single
+    script per poll. The script instruments fetch and XMLHttpRequest the
+    first time it runs on a page, so only requests started after that are
+    counted; navigation steps should wait again on every new page.
+
+    Args:
+        driver (selenium webdriver or element): A driver or element
+        timeout (int): Selenium Wait timeout, in seconds
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule
+
+    Returns:
+        dict: The final readiness check: ready, state (document.readyState)
+            and pending (requests in flight)
+
+    Raises:
+        TimeoutException: Raised when the page isn't ready in time
+    """
+    executor, _ = _script_target(driver)
+
+    def _ready(_):
+        readiness = executor.execute_script(_scripts.READY)
+        return readiness if readiness['ready'] else False
+
+    return _Wait(driver, timeout, poll_frequency).until(_ready)
+
+
+@metrics.instrumented('ready_path')
+def snapshot(driver, ready_path=None, by=CSS, timeout=TIMEOUT, poll_frequency=0.5):
+    """ Wait for the page to be ready and return a read-only DOM snapshot
+
+    snapshot waits for up to timeout seconds for the document to finish
+    loading and, if ready_path is given, for it to be located. The DOM is
+    then pulled from the browser in the same script call, and returned as
+    an explicit.snapshot.Snapshot whose locators are resolved locally.
+    Requires the optional lxml and cssselect packages.
+
+    Args:
+        driver (selenium webdriver or element): A driver, or an element to
+            snapshot the subtree of
+        ready_path (str): String used to locate an element which must be
+            present before the snapshot is taken
+        by (selenium By): Selenium By reference for ready_path
+        timeout (int): Selenium Wait timeout, in seconds
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule
+
+    Returns:
+        explicit.snapshot.Snapshot: The parsed DOM
+
+    Raises:
+        TimeoutException: Raised when the page isn't ready in time
+    """
+    executor, root = _script_target(driver)
+    html = _Wait(driver, timeout, poll_frequency).until(
+        lambda _: executor.execute_script(_scripts.SNAPSHOT, by, ready_path, root))
+    # Imported here, as it loads lxml, which most callers never need
+    from explicit import snapshot as dom_snapshot
+    return dom_snapshot.Snapshot(executor, html, root=root)
+
+
+@metrics.instrumented('elem_path')
+def find_texts(driver, elem_path, by=CSS, timeout=TIMEOUT, poll_frequency=0.5):
+    """ Find all elements once located and return their text
+
+    find_texts waits for up to timeout seconds for elements to be
+    located, then returns the text of every one. Locating and reading
+    happen in one execute_script call per poll, rather than a .text
+    round trip per element.
+
+    Args:
+        driver (selenium webdriver or element): A driver or element
+        elem_path (str): String used to located the elements
+        by (selenium By): Selenium By reference
+        timeout (int): Selenium Wait timeout, in seconds
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule
+
+    Returns:
+        list of str: Each element's visible text
+
+    Raises:
+        TimeoutException: Raised when target elements aren't located
+    """
+    return _extract(driver, elem_path, by, None, timeout, poll_frequency, 0, None)['values']
+
+
+@metrics.instrumented('elem_path')
+def find_attrs(driver, elem_path, names, by=CSS, timeout=TIMEOUT, poll_frequency=0.5):
+    """ Find all elements once located and return their attributes
+
+    find_attrs waits for up to timeout seconds for elements to be
+    located, then returns the named attributes of every one. Locating
+    and reading happen in one execute_script call per poll, rather than
+    a get_attribute round trip per element per attribute.
+
+    Args:
+        driver (selenium webdriver or element): A driver or element
+        elem_path (str): String used to located the elements
+        names (:obj: `list` of :obj: `str`): Attribute names to read
+        by (selenium By): Selenium By reference
+        timeout (int): Selenium Wait timeout, in seconds
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule
+
+    Returns:
+        list of dicts: Maps each name to the element's attribute value,
+            or None if it doesn't have one
+
+    Raises:
+        TimeoutException: Raised when target elements aren't located
+    """
+    names = list(names)
+    values = _extract(driver, elem_path, by, names, timeout, poll_frequency, 0, None)['values']
+    return [dict(zip(names, row)) for row in values]
+
+
+def iter_texts(driver, elem_path, by=CSS, chunk_size=CHUNK_SIZE, timeout=TIMEOUT,
+               poll_frequency=0.5):
+    """ Lazily yield the text of every located element, a chunk at a time
+
+    Like find_texts, but only chunk_size elements are read per script
+    call, so memory stays flat for very large result sets.
+
+    Args:
+        driver (selenium webdriver or element): A driver or element
+        elem_path (str): String used to located the elements
+        by (selenium By): Selenium By reference
+        chunk_size (int): Number of elements read per script call
+        timeout (int): Selenium Wait timeout for the first chunk, in seconds
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule
+
+    Yields:
+        str: Each element's visible text
+
+    Raises:
+        TimeoutException: Raised when target elements aren't located
+    """
+    return _iter_extract(driver, elem_path, by, None, chunk_size, timeout, poll_frequency)
+
+
+def iter_attrs(driver, elem_path, names, by=CSS, chunk_size=CHUNK_SIZE, timeout=TIMEOUT,
+               poll_frequency=0.5):
+    """ Lazily yield the attributes of every located element, a chunk at a time
+
+    Like find_attrs, but only chunk_size elements are read per script
+    call, so memory stays flat for very large result sets.
+
+    Args:
+        driver (selenium webdriver or element): A driver or element
+        elem_path (str): String used to located the elements
+        names (:obj: `list` of :obj: `str`): Attribute names to read
+        by (selenium By): Selenium By reference
+        chunk_size (int): Number of elements read per script call
+        timeout (int): Selenium Wait timeout for the first chunk, in seconds
+        poll_frequency (float or schedule): Seconds between polls, or a poll
+            schedule from explicit.schedule
+
+    Yields:
+        dict: Maps each name to the element's attribute value
+
+    Raises:
+        TimeoutException: Raised when target elements aren't located
+    """
+    names = list(names)
+    rows = _iter_extract(driver, elem_path, by, names, chunk_size, timeout, poll_frequency)
+    return (dict(zip(names, row)) for row in rows)
+
+
+def _extract(driver, elem_path, by, names, timeout, poll_frequency, start, count):
+    """ Wait for elements, then read a slice of their texts or attributes in one script """
+    executor, root = _script_target(driver)
+    return _Wait(driver, timeout, poll_frequency).until(
+        lambda _: executor.execute_script(
+            _scripts.EXTRACT, by, elem_path, names, root, start, count))
+
+
+def _iter_extract(driver, elem_path, by, names, chunk_size, timeout, poll_frequency):
+    """ Return a generator of texts or attributes, read chunk by chunk """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1, not {0!r}'.format(chunk_size))
+    return _chunks(driver, elem_path, by, names, chunk_size, timeout, poll_frequency)
+
+
+def _chunks(driver, elem_path, by, names, chunk_size, timeout, poll_frequency):
+    """ Generate texts or attributes chunk by chunk, waiting only for the first """
+    chunk = _extract(driver, elem_path, by, names, timeout, poll_frequency, 0, chunk_size)
+    start = 0
+    while True:
+        for value in chunk['values']:
+            yield value
+
+        start += chunk_size
+        if start >= chunk['total']:
+            return
+        executor, root = _script_target(driver)
+        with _sending(driver):
+            chunk = executor.execute_script(
+                _scripts.EXTRACT, by, elem_path, names, root, start, chunk_size)
+        if chunk is None:
+            return
+
+
+class _Wait(object):
+    """ Explicit wait, like WebDriverWait, which sleeps between polls according to a poll schedule
+
+    The final sleep is cut short at the timeout, so the last poll happens
+    right at the deadline instead of up to one interval after it. Inside
+    an explicit.deadline.Deadline block, the timeout is shortened to the
+    time left before the deadline.
+
+    Each poll is counted towards the waiter call being recorded, if any, and
+    waits for explicit.ratelimit when a command rate limit is enabled. With
+    a dispatcher enabled for the driver, the poll's commands are sent while
+    holding its lock (see explicit.dispatch). While an explicit.trace
+    tracer is started, each poll is recorded as a span.
+
+    Args:
+        driver (selenium webdriver or element): A driver or element
+        timeout (int): Wait timeout, in seconds
+        poll_frequency (float or schedule): Seconds between polls, or a poll schedule
+        ignored_exceptions (iterable): Extra exception classes to ignore while polling,
+            besides NoSuchElementException
+        commands_per_poll (int): WebDriver commands sent by each call of the condition
+    """
+    def __init__(self, driver, timeout, poll_frequency=schedule.POLL_FREQUENCY,
+                 ignored_exceptions=None, commands_per_poll=1):
+        self._driver = driver
+        self._timeout = deadline.clip(timeout)
+        self._ignored_exceptions = (NoSuchElementException,) + tuple(ignored_exceptions or ())
+        self._schedule = schedule.as_schedule(poll_frequency)
+        self._commands_per_poll = commands_per_poll
+
+    def until(self, method, message=''):
+        """ Call method with the driver until it returns a truthy value """
+        screen = None
+        stacktrace = None
+        intervals = self._schedule.intervals()
+        rec = metrics.current()
+
+        end_time = time.time() + self._timeout
+        while True:
+            if rec is not None:
+                rec.polls += 1
+                rec.commands += self._commands_per_poll
+            try:
+                value = self._poll(method)
+                if value:
+                    return value
+            except self._ignored_exceptions as exc:
+                screen = getattr(exc, 'screen', None)
+                stacktrace = getattr(exc, 'stacktrace', None)
+
+            remaining = end_time - time.time()
+            if remaining <= 0:
+                break
+            time.sleep(min(next(intervals), remaining))
+        raise TimeoutException(message, screen, stacktrace)
+
+    def _poll(self, method):
+        """ Call method once, throttled and holding the driver's dispatcher lock
+
+        A condition sending a varying number of commands (commands_per_poll=0)
+        counts them with metrics.count as it sends them. Its poll takes a
+        token for the first up front, and one for each of the rest once the
+        lock is released.
+        """
+        from explicit import dispatch, ratelimit, trace
+
+        ratelimit.throttle(self._driver, self._commands_per_poll or 1)
+        sent = metrics.sent()
+        try:
+            with trace.poll(self._driver), dispatch.lock_for(self._driver):
+                return method(self._driver)
+        finally:
+            if not self._commands_per_poll:
+                ratelimit.throttle(self._driver, max(metrics.sent() - sent - 1, 0))
+
+
+_FRAME_ERRORS = (NoSuchFrameException, NoSuchWindowException, StaleElementReferenceException)
+""" tuple: Errors raised when a frame detaches while it's being searched"""
+
+
+class _FrameSearch(object):
+    """ Wait condition searching every frame, and the open shadow roots within them
+
+    Frames are searched depth first from the top level document, with
+    one script each. The frame path of the last match is tried first. A
+    frame detaching part way through a search ends the poll, back at the
+    top level document, and the next poll searches again.
+
+    Attributes:
+        frame_path (list of elements): Frames leading to the located elements
+    """
+    def __init__(self, by, elem_path):
+        self.by = by
+        self.elem_path = elem_path
+        self.frame_path = None
+        self._last = None
+
+    def __call__(self, driver):
+        try:
+            if self._last is not None:
+                found = self._search_path(driver, self._last)
+                if found:
+                    return found
+
+            driver.switch_to.default_content()
+            metrics.count()
+            return self._search(driver, [])
+        except _FRAME_ERRORS:
+            self._last = None
+            driver.switch_to.default_content()
+            metrics.count()
+            return False
+
+    def _run(self, driver):
+        """ Run the search script in the driver's current frame """
+        metrics.count()
+        return driver.execute_script(_scripts.DEEP_FIND, self.by, self.elem_path)
+
+    def _search_path(self, driver, frame_path):
+        """ Search the single frame at the end of a frame path """
+        try:
+            _switch_to_frame_path(driver, frame_path)
+        except _FRAME_ERRORS:
+            self._last = None
+            return None
+        found = self._run(driver)['found']
+        if found:
+            self.frame_path = frame_path
+        return found
+
+    def _search(self, driver, frame_path):
+        """ Search the current frame, then each frame within it """
+        result = self._run(driver)
+        if result['found']:
+            self.frame_path = self._last = frame_path
+            return result['found']
+
+        for frame in result['frames']:
+            try:
+                driver.switch_to.frame(frame)
+            except _FRAME_ERRORS:
+                continue
+            metrics.count()
+            found = self._search(driver, frame_path + [frame])
+            if found:
+                return found
+            driver.switch_to.parent_frame()
+            metrics.count()
+        return None
+
+
+_ENTER = '\ue007'
+""" str: selenium's Keys.ENTER, repeated here so typing it doesn't import selenium.webdriver"""
+
+_SELECTORS = {
+    'text': 'select_by_visible_text',
+    'value': 'select_by_value',
+    'index': 'select_by_index',
+}
+
+_READY = {
+    'enabled': (lambda elem: elem.is_enabled(), 1),
+    'clickable': (lambda elem: elem.is_displayed() and elem.is_enabled(), 2),
+}
+
+
+def _act(driver, elem_path, by, timeout, poll_frequency, retries, wait_for, ready_first, action,
+         commands):
+    """ Locate an element and act on it, re-locating it whenever it goes stale
+
+    Every attempt shares the original timeout, tuned by any profile store
+    enabled as find_element's is, and each retry is counted towards the
+    waiter call being recorded, if any. The readiness wait locks each poll
+    as usual, leaving the driver to other threads between polls. Once the
+    element is ready the driver's dispatcher lock is taken, readiness
+    checked again and the action sent under it, so no other thread's
+    commands run between the last check and the action.
+
+    Args:
+        wait_for (str): Key into _READY of a state to wait for before acting, or None
+        ready_first (bool): Locate the element with find_element's ready_first
+        action (callable): Called with the element
+        commands (int): WebDriver commands sent by the action
+    """
+    # Tuned here, as find_element only tunes a timeout which isn't passed
+    _, timeout, poll_frequency = _tuning(driver, by, elem_path, timeout, poll_frequency)
+    end_time = time.time() + deadline.clip(timeout)
+    attempt = 0
+    while True:
+        elem = find_element(driver, elem_path, by=by, timeout=max(end_time - time.time(), 0),
+                            poll_frequency=poll_frequency, ready_first=ready_first)
+        try:
+            _when_ready(driver, elem, wait_for, end_time, poll_frequency, action, commands)
+            return elem
+        except StaleElementReferenceException:
+            _discard_cached(driver, by, elem_path)
+            attempt += 1
+            if attempt > retries or time.time() >= end_time:
+                raise
+            rec = metrics.current()
+            if rec is not None:
+                rec.retries += 1
+
+
+def _when_ready(driver, elem, wait_for, end_time, poll_frequency, action, commands):
+    """ Wait until an element is ready, then act on it under the dispatcher lock if it still is
+
+    Raises:
+        TimeoutException: Raised when the element isn't ready by end_time
+    """
+    if wait_for is None:
+        with _sending(driver, commands):
+            action(elem)
+        return
+
+    ready, checks = _READY[wait_for]
+    while True:
+        _Wait(driver, max(end_time - time.time(), 0), poll_frequency,
+              commands_per_poll=checks).until(lambda _: ready(elem))
+        with _sending(driver, checks + commands):
+            metrics.count(checks)
+            if ready(elem):
+                action(elem)
+                return
+
+
+def _discard_cached(driver, by, elem_path):
+    """ Drop a stale element from the driver's element cache, if it has one """
+    from explicit import cache
+
+    elem_cache = cache.cache_for(driver)
+    if elem_cache is not None:
+        elem_cache.discard(driver, by, elem_path)
+
+
+def _sending(driver, commands=1):
+    """ Wait for any rate limit, then return the driver's dispatcher lock to send commands under
+
+    For commands sent outside a _Wait, which throttles and locks each of its polls.
+    """
+    from explicit import dispatch, ratelimit
+
+    ratelimit.throttle(driver, commands)
+    return dispatch.lock_for(driver)
+
+
+def _tuning(driver, by, elem_path, timeout, poll_frequency):
+    """ Return the profile key, timeout and poll frequency for a lookup
+
+    A timeout or poll frequency of None means the caller didn't pass one.
+    It's replaced by the profile store's tuning, or with no store enabled
+    (when the key is None) by TIMEOUT or schedule.POLL_FREQUENCY.
+    """
+    from explicit import profile
+
+    default_timeout = TIMEOUT if timeout is None else timeout
+    default_poll = schedule.POLL_FREQUENCY if poll_frequency is None else poll_frequency
+    store = profile.store()
+    if store is None:
+        return None, default_timeout, default_poll
+    key = store.key(driver, by, elem_path)
+    tuned_timeout, tuned_poll = store.tuned(key, default_timeout, default_poll)
+    return (key, tuned_timeout if timeout is None else timeout,
+            tuned_poll if poll_frequency is None else poll_frequency)
+
+
+def _profile_found(key, started):
+    """ Record a lookup's time-to-found in the profile store, if one is enabled """
+    if key is None:
+        return
+    from explicit import profile
+
+    store = profile.store()
+    if store is not None:
+        store.record(key, time.time() - started)
+
+
+def _coalesce(driver, key, timeout, lookup):
+    """ Run a lookup through the driver's dispatcher, if one is enabled
+
+    Args:
+        driver (selenium webdriver or element): A driver or element
+        key (tuple): Identifies the lookup, excluding the search root
+        timeout (int): Wait timeout, in seconds
+        lookup (callable): Called with a timeout to perform the lookup
+    """
+    from explicit import dispatch
+
+    dispatcher = dispatch.dispatcher_for(driver)
+    if dispatcher is None:
+        return lookup(timeout)
+    root = driver.id if metrics.is_element(driver) else None
+    return dispatcher.coalesce(key + (root,), deadline.clip(timeout), lookup)
+
+
+def _script_target(driver):
+    """ Return the webdriver to run scripts on, and the element to search from
+
+    Scripts can only be executed by the webdriver, so when an element is
+    passed in its parent driver runs the script and the element is handed
+    to the script as the search root. A root of None searches the document.
+    """
+    if metrics.is_element(driver):
+        return driver.parent, driver
+    return driver, None
+
+
+_FINDERS = {
+    CLASS_NAME: 'find_elements_by_class_name',
+    CSS: 'find_elements_by_css_selector',
+    ID: 'find_elements_by_id',
+    LINK: 'find_elements_by_link_text',
+    NAME: 'find_elements_by_name',
+    PARTIAL_LINK: 'find_elements_by_partial_link_text',
+    TAG: 'find_elements_by_tag_name',
+    XPATH: 'find_elements_by_xpath'
+}
+
+
+def _first_match(find, locator_list, search_order):
+    """ Query locators in search order, stopping at the first which matches
+
+    Returns:
+        list of lists of elements, in locator_list order, where only
+        the matching locator's list is populated
+    """
+    elems = [[] for _ in locator_list]
+    for loc in search_order:
+        metrics.count()
+        found = find(loc)
+        if found:
+            elems[locator_list.index(loc)] = found
+            break
+    return elems
+
+
+def _ready_find(driver, by, elem_path):
+    """ Return a wait condition locating elements once the page is ready, with one script """
+    executor, root = _script_target(driver)
+    return lambda _: executor.execute_script(_scripts.READY_FIND, by, elem_path, root)
+
+
+def _as_locator(locator, by):
+    """ Return a (by, path) tuple for a locator given as a path or a tuple """
+    return locator if isinstance(locator, tuple) else (by, locator)
+
+
+def _locate_all(driver, locators):
+    """ Resolve several (by, path) locators with a single execute_script call
+
+    Args:
+        driver (selenium webdriver or element): A driver or element
+        locators (:obj: `list` of :obj: `tuple`): (by, path) pairs
+
+    Returns:
+        list of lists of elements, one list per locator, in locator order
+    """
+    executor, root = _script_target(driver)
+    return executor.execute_script(_scripts.FIND_ALL, [list(loc) for loc in locators], root)
+
+
+class _Observe(object):
+    """ Expected Condition that waits inside the browser for a locator to match
+
+    Each call runs an async script which installs a MutationObserver and
+    resolves as soon as the locator matches, or after an observation window
+    bounded by OBSERVE_WINDOW and the time left in the wait. If the driver
+    can't run async scripts, the condition falls back to polling with
+    presence_of_all_elements_located for the rest of the wait.
+
+    Args:
+        by (selenium By): Selenium By reference
+        elem_path (str): String used to located the element
+        timeout (int): Wait timeout, in seconds, bounding the observation windows
+    """
+    def __init__(self, by, elem_path, timeout):
+        self.by = by
+        self.elem_path = elem_path
+        self.deadline = time.time() + timeout
+        self.fallback = None
+
+    def __call__(self, driver):
+        if self.fallback is not None:
+            return self.fallback(driver)
+
+        window = min(OBSERVE_WINDOW, max(self.deadline - time.time(), 0))
+        executor, root = _script_target(driver)
+        try:
+            return executor.execute_async_script(*self._script(root, int(window * 1000)))
+        except TimeoutException:
+            # The driver's script timeout is shorter than the window
+            return False
+        except WebDriverException:
+            self.fallback = self._poll_condition()
+            return self.fallback(driver)
+
+    def _script(self, root, limit_ms):
+        """ Return the async script, and its arguments, observing for limit_ms """
+        return _scripts.OBSERVE, self.by, self.elem_path, root, limit_ms
+
+    def _poll_condition(self):
+        """ Return the condition polled instead when async scripts aren't supported """
+        from selenium.webdriver.support import expected_conditions as EC
+        return EC.presence_of_all_elements_located((self.by, self.elem_path))
+
+
+class _ObserveGone(_Observe):
+    """ Expected Condition that waits inside the browser for locators to vanish
+
+    Works as _Observe does, resolving once no locator matches an element,
+    or, with visible_only, a displayed element.
+
+    Args:
+        locators (:obj: `list` of :obj: `list`): [by, path] locators
+        visible_only (bool): Only displayed elements count as present
+        timeout (int): Wait timeout, in seconds, bounding the observation windows
+    """
+    def __init__(self, locators, visible_only, timeout):
+        super().__init__(None, None, timeout)
+        self.locators = locators
+        self.visible_only = visible_only
+
+    def _script(self, root, limit_ms):
+        return _scripts.OBSERVE_GONE, self.locators, self.visible_only, root, limit_ms
+
+    def _poll_condition(self):
+        return _vanished(self.locators, self.visible_only)
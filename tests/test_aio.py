@@ -0,0 +1,151 @@
+import asyncio
+import base64
+import json
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+import pytest
+from selenium import webdriver
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+from selenium.webdriver.remote.webelement import WebElement
+
+from explicit import aio, ID, XPATH
+
+W3C_ELEMENT = 'element-6066-11e4-a52e-4f735466cecf'
+
+
+class FakeEndpoint(object):
+    """ Serves scripted WebDriver responses and records the requests made """
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.headers = []
+
+    async def handle(self, reader, writer):
+        request_line = await reader.readline()
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line == b'\r\n':
+                break
+            name, _, value = line.decode().partition(':')
+            headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers['content-length']))
+
+        method, path, _ = request_line.decode().split()
+        self.headers.append(headers)
+        self.requests.append((method, path, json.loads(body.decode()) if body else None))
+
+        status, value = self.responses.pop(0)
+        payload = json.dumps({'value': value}).encode()
+        writer.write('HTTP/1.1 {0} OK\r\nContent-Length: {1}\r\n\r\n'.format(
+            status, len(payload)).encode() + payload)
+        await writer.drain()
+        writer.close()
+
+
+def run(responses, coro_factory, userinfo=''):
+    """ Run a coroutine against a fake endpoint, returning its result and the endpoint """
+    endpoint = FakeEndpoint(responses)
+
+    async def main():
+        server = await asyncio.start_server(endpoint.handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await coro_factory(make_driver(port, userinfo))
+        finally:
+            server.close()
+
+    return asyncio.run(main()), endpoint
+
+
+def make_driver(port, userinfo=''):
+    driver = mock.create_autospec(webdriver.Remote)
+    driver.command_executor = mock.Mock(
+        _url='http://{0}127.0.0.1:{1}/wd/hub'.format(userinfo, port))
+    driver.session_id = 'mock-session'
+    driver.w3c = True
+    driver.error_handler = ErrorHandler()
+    driver.create_web_element.side_effect = lambda elem_id: WebElement(driver, elem_id, w3c=True)
+    return driver
+
+
+def test_find_element_polls_endpoint():
+    """ Verify find_element polls the session's elements endpoint until a match """
+    responses = [(200, []), (200, [{W3C_ELEMENT: 'elem-1'}])]
+
+    elem, endpoint = run(responses, lambda driver: aio.find_element(
+        driver, 'mock_id', by=ID, poll_frequency=0.01))
+
+    assert isinstance(elem, WebElement)
+    assert elem.id == 'elem-1'
+    assert endpoint.requests == [
+        ('POST', '/wd/hub/session/mock-session/elements',
+         {'using': 'css selector', 'value': '[id="mock_id"]'})] * 2
+
+
+def test_credentials_sent_as_basic_auth():
+    """ Verify credentials in the executor URL are sent as an Authorization header,
+        and kept out of the Host header
+    """
+    elem, endpoint = run([(200, [{W3C_ELEMENT: 'elem-1'}])],
+                         lambda driver: aio.find_element(driver, 'div'), userinfo='user:key@')
+
+    headers = endpoint.headers[0]
+    assert headers['authorization'] == 'Basic ' + base64.b64encode(b'user:key').decode()
+    assert headers['host'].startswith('127.0.0.1:')
+
+
+def test_no_auth_header_without_credentials():
+    """ Verify no Authorization header is sent when the URL has no credentials """
+    elem, endpoint = run([(200, [{W3C_ELEMENT: 'elem-1'}])],
+                         lambda driver: aio.find_element(driver, 'div'))
+
+    assert 'authorization' not in endpoint.headers[0]
+
+
+def test_find_one_queries_locators_concurrently():
+    """ Verify find_one returns the single located element across its locators """
+    responses = [(200, []), (200, [{W3C_ELEMENT: 'elem-2'}])]
+
+    elem, endpoint = run(responses, lambda driver: aio.find_one(
+        driver, ['//div[1]', '//div[2]'], elem_type=XPATH))
+
+    assert elem.id == 'elem-2'
+    assert sorted(request[2]['value'] for request in endpoint.requests) == ['//div[1]',
+                                                                            '//div[2]']
+
+
+def test_find_write_sends_element_commands():
+    """ Verify find_write clears and types into the located element """
+    responses = [(200, [{W3C_ELEMENT: 'elem-1'}]), (200, None), (200, None), (200, None)]
+
+    elem, endpoint = run(responses, lambda driver: aio.find_write(
+        driver, 'input.mock', 'hi', send_enter=True))
+
+    assert [request[1] for request in endpoint.requests[1:]] == [
+        '/wd/hub/session/mock-session/element/elem-1/clear',
+        '/wd/hub/session/mock-session/element/elem-1/value',
+        '/wd/hub/session/mock-session/element/elem-1/value']
+    assert endpoint.requests[2][2] == {'text': 'hi', 'value': ['h', 'i']}
+    assert endpoint.requests[3][2]['value'] == [Keys.ENTER]
+
+
+def test_errors_raise_selenium_exceptions():
+    """ Verify WebDriver errors are raised as Selenium exceptions """
+    error = {'error': 'no such element', 'message': 'missing', 'stacktrace': ''}
+
+    with pytest.raises(NoSuchElementException):
+        run([(404, error)], lambda driver: aio.find_element(driver, 'div'))
+
+
+def test_find_element_times_out():
+    """ Verify a TimeoutException is raised when nothing is located """
+    with pytest.raises(TimeoutException):
+        run([(200, [])] * 10, lambda driver: aio.find_element(
+            driver, 'div', timeout=0.05, poll_frequency=0.02))
@@ -0,0 +1,150 @@
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.webelement import WebElement
+
+from explicit import cache, waiter, CSS, ID
+
+
+@pytest.fixture(scope="function")
+def cached_driver(driver, element):
+    ''' Returns a mock driver with element caching enabled
+    '''
+    element.parent = driver
+    element.id = 'element-id'
+    cache.enable(driver, max_size=2, trust=0)
+    yield driver
+    cache.disable(driver)
+
+
+def test_cache_disabled_by_default(driver):
+    """ Verify drivers have no cache unless one is enabled """
+    assert cache.cache_for(driver) is None
+
+
+def test_find_element_served_from_cache(cached_driver, element):
+    """ Verify a second lookup returns the cached element after a liveness check """
+    driver = cached_driver
+    driver.find_element.return_value = element
+    driver.execute_script.return_value = True
+
+    first = waiter.find_element(driver, "div.mock-css-path")
+    second = waiter.find_element(driver, "div.mock-css-path")
+
+    assert first is second is element
+    assert driver.find_element.call_count == 1
+    assert driver.execute_script.call_count == 1
+    assert driver.execute_script.call_args[0][1] is element
+    stats = cache.cache_for(driver).stats()
+    assert stats == {'size': 1, 'hits': 1, 'misses': 1, 'evictions': 0}
+
+
+def test_ready_first_bypasses_cache(cached_driver, element):
+    """ Verify a lookup waiting for the page to be ready isn't served from the cache """
+    driver = cached_driver
+    cache.cache_for(driver).put(driver, CSS, "div.mock-css-path", element)
+    driver.execute_script.side_effect = [None, [element]]
+
+    elem = waiter.find_element(driver, "div.mock-css-path", ready_first=True,
+                               poll_frequency=0.01)
+
+    assert elem is element
+    assert driver.execute_script.call_count == 2
+    assert all(call[0][0] != cache._LIVENESS for call in driver.execute_script.call_args_list)
+    assert cache.cache_for(driver).stats()['hits'] == 0
+
+
+def test_recently_verified_elements_served_without_check(driver, element):
+    """ Verify a hit within the trust window sends no command """
+    element.parent = driver
+    elem_cache = cache.enable(driver, trust=60)
+    driver.find_element.return_value = element
+    try:
+        for _ in range(3):
+            assert waiter.find_element(driver, "div.mock-css-path") is element
+    finally:
+        cache.disable(driver)
+
+    assert driver.find_element.call_count == 1
+    assert not driver.execute_script.called
+    assert elem_cache.hits == 2
+
+
+def test_stale_trusted_element_discarded_on_retry(driver, element):
+    """ Verify find_click locates an element again when its trusted cache entry is stale """
+    stale = mock.create_autospec(WebElement)
+    stale.parent = driver
+    stale.click.side_effect = StaleElementReferenceException()
+    element.parent = driver
+    cache.enable(driver, trust=60).put(driver, CSS, "button", stale)
+    driver.find_element.return_value = element
+    try:
+        assert waiter.find_click(driver, "button", wait_for=None) is element
+    finally:
+        cache.disable(driver)
+
+    assert element.click.called
+
+
+def test_stale_elements_are_evicted(cached_driver, element):
+    """ Verify stale cached elements are evicted and located again """
+    driver = cached_driver
+    driver.find_element.return_value = element
+    driver.execute_script.side_effect = StaleElementReferenceException()
+
+    waiter.find_element(driver, "mock_id", by=ID)
+    waiter.find_element(driver, "mock_id", by=ID)
+
+    assert driver.find_element.call_args_list == [mock.call(ID, "mock_id"),
+                                                  mock.call(ID, "mock_id")]
+    stats = cache.cache_for(driver).stats()
+    assert stats == {'size': 1, 'hits': 0, 'misses': 2, 'evictions': 1}
+
+
+def test_least_recently_used_elements_are_evicted(driver, element):
+    """ Verify the cache holds at most max_size elements """
+    elem_cache = cache.ElementCache(max_size=2)
+
+    elem_cache.put(driver, CSS, 'div.one', element)
+    elem_cache.put(driver, CSS, 'div.two', element)
+    elem_cache.put(driver, CSS, 'div.three', element)
+
+    assert len(elem_cache) == 2
+    assert elem_cache.get(driver, CSS, 'div.one') is None
+    assert elem_cache.evictions == 1
+
+
+def test_expired_elements_are_evicted(driver, element):
+    """ Verify entries older than the TTL aren't served """
+    elem_cache = cache.ElementCache(ttl=10)
+
+    with mock.patch('explicit.cache.time.time', side_effect=[100, 111]):
+        elem_cache.put(driver, CSS, 'div.one', element)
+        assert elem_cache.get(driver, CSS, 'div.one') is None
+
+    assert not driver.execute_script.called
+    assert elem_cache.stats() == {'size': 0, 'hits': 0, 'misses': 1, 'evictions': 1}
+
+
+def test_cache_keys_include_search_root(driver, element):
+    """ Verify lookups from different roots don't share entries """
+    elem_cache = cache.ElementCache()
+    element.id = 'root-id'
+
+    elem_cache.put(element, CSS, 'div.one', element)
+
+    assert elem_cache.get(driver, CSS, 'div.one') is None
+
+
+def test_listener_clears_cache_on_navigation(cached_driver, element):
+    """ Verify the navigation listener empties the driver's cache """
+    elem_cache = cache.cache_for(cached_driver)
+    elem_cache.put(cached_driver, CSS, 'div.one', element)
+
+    cache.CacheListener().after_navigate_to('https://example.com', cached_driver)
+
+    assert len(elem_cache) == 0
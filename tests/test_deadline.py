@@ -0,0 +1,46 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from explicit import deadline, waiter
+from explicit.deadline import Deadline
+
+
+def test_no_deadline_by_default():
+    """ Verify timeouts are untouched outside a deadline block """
+    assert deadline.remaining() is None
+    assert deadline.clip(30) == 30
+
+
+def test_deadline_clips_timeouts():
+    """ Verify timeouts are shortened to the time left before the deadline """
+    with Deadline(5) as budget:
+        assert 4 < deadline.clip(30) <= 5
+        assert deadline.clip(1) == 1
+        assert not budget.expired
+    assert deadline.remaining() is None
+
+
+def test_nested_deadlines_use_earliest():
+    """ Verify the earliest of nested deadlines applies """
+    with Deadline(2):
+        with Deadline(10):
+            assert deadline.remaining() <= 2
+        with Deadline(1):
+            assert deadline.remaining() <= 1
+
+
+def test_waits_share_deadline(driver):
+    """ Verify waits inside a deadline stop at it, and later waits fail fast """
+    mock_css_path = "div.mock-css-path"
+    driver.find_element.return_value = None
+
+    with Deadline(0.1) as budget:
+        with pytest.raises(TimeoutException):
+            waiter.find_element(driver, mock_css_path, poll_frequency=0.01)
+        assert budget.expired
+        calls = driver.find_element.call_count
+
+        with pytest.raises(TimeoutException):
+            waiter.find_element(driver, mock_css_path)
+
+    assert driver.find_element.call_count == calls + 1
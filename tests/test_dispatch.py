@@ -0,0 +1,163 @@
+import threading
+import time
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.remote.webelement import WebElement
+
+from explicit import cache, dispatch, waiter
+
+
+@pytest.fixture(scope="function")
+def dispatcher(driver):
+    ''' Enables a dispatcher for the mock driver, and returns it
+    '''
+    yield dispatch.enable(driver)
+    dispatch.disable(driver)
+
+
+def run_threads(target, count):
+    ''' Runs target in count threads, returning their results in thread order
+    '''
+    results = [None] * count
+
+    def run(index):
+        try:
+            results[index] = target(index)
+        except Exception as exc:
+            results[index] = exc
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.005)
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_lookups_coalesced(dispatcher, driver, element):
+    """ Verify concurrent identical find_element calls share one poll loop """
+    def find(by, path):
+        time.sleep(0.02)
+        return element if driver.find_element.call_count >= 3 else None
+    driver.find_element.side_effect = find
+
+    results = run_threads(
+        lambda _: waiter.find_element(driver, "div.mock-css-path", poll_frequency=0.01), 3)
+
+    assert results == [element] * 3
+    assert dispatcher.coalesced == 2
+    assert driver.find_element.call_count == 3
+
+
+def test_different_lookups_serialized(dispatcher, driver, element):
+    """ Verify polls for different locators never send commands at the same time """
+    active = []
+    overlaps = []
+
+    def find(by, path):
+        active.append(path)
+        overlaps.append(len(active))
+        time.sleep(0.01)
+        active.remove(path)
+        return element
+    driver.find_element.side_effect = find
+
+    results = run_threads(
+        lambda index: waiter.find_element(driver, "div.path-{0}".format(index)), 4)
+
+    assert results == [element] * 4
+    assert max(overlaps) == 1
+    assert dispatcher.coalesced == 0
+
+
+def test_follower_outlives_leader_timeout(dispatcher, driver, element):
+    """ Verify a caller with a longer timeout retries after the shared lookup times out """
+    started = time.time()
+    driver.find_element.side_effect = (
+        lambda by, path: element if time.time() - started > 0.15 else None)
+
+    def find(index):
+        return waiter.find_element(driver, "div.mock-css-path", timeout=[0.05, 1][index],
+                                   poll_frequency=0.01)
+
+    leader, follower = run_threads(find, 2)
+
+    assert isinstance(leader, TimeoutException)
+    assert follower is element
+
+
+def test_commands_outside_polls_locked(dispatcher, driver, element):
+    """ Verify commands sent outside a poll also hold the dispatcher's lock """
+    held = []
+
+    def record_lock(*args):
+        held.append(dispatcher.lock._is_owned())
+    element.parent = driver
+    element.send_keys.side_effect = record_lock
+    driver.execute_script.side_effect = lambda *args: record_lock() or [[element]]
+    driver.switch_to.default_content.side_effect = record_lock
+
+    elem_cache = cache.enable(driver, trust=0)
+    try:
+        elem_cache.put(driver, 'css selector', 'div', element)
+        assert waiter.find_element(driver, 'div') is element
+    finally:
+        cache.disable(driver)
+    waiter.find_write_many(driver, {'input': 'text'}, clear_first=False, use_js=False)
+    waiter.switch_to_frame_path(driver, [])
+
+    assert held == [True] * 4
+    assert not dispatcher.lock._is_owned()
+
+
+def test_action_taken_under_lock_with_readiness_check(dispatcher, driver, element):
+    """ Verify find_click checks readiness again under the lock it clicks with """
+    held = []
+    driver.find_element.return_value = element
+    element.is_displayed.return_value = True
+    element.is_enabled.side_effect = lambda: held.append(dispatcher.lock._is_owned()) or True
+    element.click.side_effect = lambda: held.append(dispatcher.lock._is_owned())
+
+    waiter.find_click(driver, 'button')
+
+    assert held == [True, True, True]
+    assert not dispatcher.lock._is_owned()
+
+
+def test_readiness_wait_leaves_driver_to_other_threads(dispatcher, driver, element):
+    """ Verify another thread's lookup runs while find_click waits for clickable """
+    other_found = threading.Event()
+    other = mock.create_autospec(WebElement)
+
+    def find(by, path):
+        if path == 'div.other':
+            other_found.set()
+            return other
+        return element
+    driver.find_element.side_effect = find
+    element.is_displayed.side_effect = other_found.is_set
+    element.is_enabled.return_value = True
+
+    def target(index):
+        if index == 0:
+            return waiter.find_click(driver, 'button', timeout=2, poll_frequency=0.01)
+        return waiter.find_element(driver, 'div.other', timeout=1)
+
+    results = run_threads(target, 2)
+
+    assert results == [element, other]
+    assert element.click.called
+
+
+def test_no_dispatcher_by_default(driver):
+    """ Verify drivers have no dispatcher unless one is enabled """
+    assert dispatch.dispatcher_for(driver) is None
+    with dispatch.lock_for(driver):
+        pass
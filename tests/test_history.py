@@ -0,0 +1,44 @@
+from explicit import history, CSS, ID
+from explicit.history import LocatorHistory
+
+
+def test_order_by_hits():
+    """ Verify locators are ordered by their match counts """
+    hist = LocatorHistory()
+    locators = ['div.a', 'div.b', 'div.c']
+
+    hist.record(locators, CSS, 'div.c')
+    hist.record(locators, CSS, 'div.c')
+    hist.record(locators, CSS, 'div.b')
+
+    assert hist.order(locators, CSS) == ['div.c', 'div.b', 'div.a']
+    assert hist.order(locators, ID) == locators
+    assert hist.hits(locators, CSS) == {'div.c': 2, 'div.b': 1}
+
+
+def test_history_keyed_on_locator_set():
+    """ Verify the same locators in a different order share a history """
+    hist = LocatorHistory()
+
+    hist.record(['div.a', 'div.b'], CSS, 'div.b')
+
+    assert hist.order(['div.b', 'div.a'], CSS) == ['div.b', 'div.a']
+    assert hist.order(['div.a', 'div.b'], CSS) == ['div.b', 'div.a']
+
+
+def test_save_and_load(tmpdir):
+    """ Verify a history can be saved and loaded across runs """
+    path = str(tmpdir.join('history.json'))
+    locators = ['div.a', 'div.b']
+
+    hist = LocatorHistory(path)
+    hist.record(locators, CSS, 'div.b')
+    hist.save()
+
+    assert LocatorHistory(path).order(locators, CSS) == ['div.b', 'div.a']
+
+
+def test_shared_history():
+    """ Verify the shared history is a single in-memory instance """
+    assert history.shared() is history.shared()
+    assert history.shared().path is None
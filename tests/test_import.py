@@ -0,0 +1,49 @@
+import json
+import subprocess
+import sys
+
+from selenium.webdriver.common.by import By
+
+import explicit
+
+HEAVY = ('selenium', 'pbr', 'lxml', 'urllib3')
+
+
+def imported_after(statement):
+    ''' Returns the heavy modules loaded by running statement in a fresh interpreter
+    '''
+    code = ('import json, sys; {0}; print(json.dumps(sorted(m for m in sys.modules '
+            'if m.split(".")[0] in {1!r})))').format(statement, HEAVY)
+    return json.loads(subprocess.check_output([sys.executable, '-c', code]).decode())
+
+
+def test_package_import_is_lazy():
+    """ Verify importing explicit loads neither selenium nor pbr """
+    assert imported_after('import explicit') == []
+
+
+def test_waiter_import_skips_optional_modules():
+    """ Verify importing the waiter loads neither selenium.webdriver, urllib3 nor lxml,
+        and none of the optional subsystems
+    """
+    code = ('import sys, explicit.waiter; print(" ".join(m for m in sys.modules '
+            'if m.startswith(("selenium.webdriver", "urllib3", "lxml", "explicit."))))')
+    loaded = set(subprocess.check_output([sys.executable, '-c', code]).decode().split())
+
+    assert loaded == {'explicit._scripts', 'explicit.deadline', 'explicit.metrics',
+                      'explicit.schedule', 'explicit.waiter'}
+
+
+def test_by_values_match_selenium():
+    """ Verify the By values repeated in explicit match selenium's """
+    assert (explicit.CLASS_NAME, explicit.CSS, explicit.ID, explicit.LINK, explicit.NAME,
+            explicit.PARTIAL_LINK, explicit.TAG, explicit.XPATH) == (
+        By.CLASS_NAME, By.CSS_SELECTOR, By.ID, By.LINK_TEXT, By.NAME, By.PARTIAL_LINK_TEXT,
+        By.TAG_NAME, By.XPATH)
+
+
+def test_version_and_submodules_resolved_on_access():
+    """ Verify __version__ and submodules are available as attributes """
+    assert isinstance(explicit.__version__, str)
+    assert explicit.deadline.Deadline
+    assert imported_after('import explicit; explicit.schedule') == []
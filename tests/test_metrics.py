@@ -0,0 +1,137 @@
+import json
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.remote.webelement import WebElement
+
+from explicit import metrics, waiter, CSS, ID
+
+
+@pytest.fixture(scope="function")
+def records():
+    ''' Registers a sink collecting CallRecords, and returns the list of records
+    '''
+    collected = []
+    metrics.add_sink(collected.append)
+    yield collected
+    metrics.clear_sinks()
+
+
+def test_nothing_recorded_without_sinks(driver, element):
+    """ Verify no record is made while no sinks are registered """
+    driver.find_element.return_value = element
+
+    with mock.patch('explicit.metrics.CallRecord') as call_record:
+        waiter.find_element(driver, "div.mock-css-path")
+
+    assert not call_record.called
+    assert metrics.current() is None
+
+
+def test_find_element_recorded(records, driver, element):
+    """ Verify find_element records its polls and commands """
+    driver.find_element.side_effect = [None, None, element]
+
+    waiter.find_element(driver, "mock_id", by=ID, poll_frequency=0.01)
+
+    assert len(records) == 1
+    rec = records[0]
+    assert (rec.function, rec.by, rec.locator) == ('find_element', ID, 'mock_id')
+    assert (rec.polls, rec.commands) == (3, 3)
+    assert rec.found and not rec.timed_out
+    assert rec.elapsed >= 0
+
+
+def test_find_one_records_matched_locator(records, driver, element):
+    """ Verify find_one records which locator matched """
+    driver.find_elements_by_css_selector.side_effect = [[], [element, ]]
+
+    waiter.find_one(driver, ['div.mock_1', 'div.mock_2'])
+
+    rec = records[0]
+    assert (rec.function, rec.by) == ('find_one', CSS)
+    assert rec.locator == ['div.mock_1', 'div.mock_2']
+    assert (rec.polls, rec.commands) == (1, 2)
+    assert rec.matched == 'div.mock_2'
+
+
+def test_find_write_recorded_once(records, driver, element):
+    """ Verify find_write's nested find_element is folded into one record """
+    driver.find_element.return_value = element
+
+    waiter.find_write(driver, "input.mock", "text", send_enter=True)
+
+    assert [rec.function for rec in records] == ['find_write']
+    assert (records[0].polls, records[0].commands) == (1, 4)
+
+
+def test_stale_retries_recorded(records, driver, element):
+    """ Verify find_click counts the times it located a stale element again """
+    stale = mock.create_autospec(WebElement)
+    stale.click.side_effect = StaleElementReferenceException()
+    driver.find_element.side_effect = [stale, element]
+
+    waiter.find_click(driver, "button.mock", wait_for=None)
+
+    assert [rec.function for rec in records] == ['find_click']
+    assert records[0].retries == 1
+    assert (records[0].polls, records[0].commands) == (2, 3)
+
+
+def test_call_without_locator_recorded(records, driver):
+    """ Verify functions without a locator, like wait_ready, are recorded """
+    driver.execute_script.return_value = {'ready': True, 'state': 'complete', 'pending': 0}
+
+    waiter.wait_ready(driver)
+
+    assert (records[0].function, records[0].locator) == ('wait_ready', None)
+
+
+def test_timeouts_recorded(records, driver):
+    """ Verify a timed out call is recorded before the exception propagates """
+    driver.find_elements.return_value = []
+
+    with pytest.raises(TimeoutException):
+        waiter.find_elements(driver, "div.missing", timeout=0.02, poll_frequency=0.01)
+
+    assert records[0].timed_out and not records[0].found
+    assert records[0].polls >= 2
+
+
+def test_aggregate_sink(driver, element):
+    """ Verify the aggregate sink totals calls per function and locator """
+    aggregate = metrics.add_sink(metrics.Aggregate())
+    driver.find_element.return_value = element
+    try:
+        waiter.find_element(driver, "div.one")
+        waiter.find_element(driver, "div.one")
+        waiter.find_element(driver, "div.two")
+    finally:
+        metrics.remove_sink(aggregate)
+
+    stats = aggregate.stats[('find_element', CSS, 'div.one')]
+    assert (stats['calls'], stats['found'], stats['polls'], stats['commands']) == (2, 2, 2, 2)
+    assert len(aggregate.summary()) == 2
+
+
+def test_json_lines_sink(tmpdir, driver, element):
+    """ Verify the JSON lines sink writes one line per call """
+    path = str(tmpdir.join('waits.jsonl'))
+    sink = metrics.add_sink(metrics.JsonLines(path))
+    driver.find_element.return_value = element
+    try:
+        waiter.find_element(driver, "div.one")
+    finally:
+        metrics.remove_sink(sink)
+        sink.close()
+
+    with open(path) as lines:
+        entries = [json.loads(line) for line in lines]
+    assert len(entries) == 1
+    assert entries[0]['function'] == 'find_element'
+    assert entries[0]['locator'] == 'div.one'
@@ -0,0 +1,166 @@
+import threading
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from explicit import cache
+from explicit.pool import DriverPool, PoolExhausted
+
+
+def make_driver():
+    driver = mock.MagicMock()
+    driver.window_handles = ['main']
+    return driver
+
+
+@pytest.fixture(scope="function")
+def factory():
+    ''' Returns a mock factory starting mock drivers
+    '''
+    return mock.Mock(side_effect=make_driver)
+
+
+def test_pool_starts_warm_drivers(factory):
+    """ Verify the pool starts its drivers up front """
+    pool = DriverPool(factory, size=3)
+
+    assert factory.call_count == 3
+    assert pool.stats() == {'idle': 3, 'leased': 0, 'created': 3, 'recycled': 0}
+
+
+def test_lease_reuses_and_resets_drivers(factory):
+    """ Verify leased drivers are reset on release and handed out again """
+    pool = DriverPool(factory, size=1)
+
+    with pool.lease() as driver:
+        driver.window_handles = ['main', 'popup']
+        assert pool.stats()['leased'] == 1
+
+    driver.switch_to.window.assert_any_call('popup')
+    assert driver.close.called
+    driver.switch_to.window.assert_called_with('main')
+    assert driver.delete_all_cookies.called
+    driver.get.assert_called_with('about:blank')
+
+    with pool.lease() as second:
+        assert second is driver
+    assert factory.call_count == 1
+
+
+def test_drivers_recycled_after_max_uses(factory):
+    """ Verify drivers are quit and replaced after max_uses leases """
+    pool = DriverPool(factory, size=1, max_uses=2)
+
+    drivers = []
+    for _ in range(3):
+        with pool.lease() as driver:
+            drivers.append(driver)
+
+    assert drivers[0] is drivers[1] is not drivers[2]
+    assert drivers[0].quit.called
+    assert pool.stats() == {'idle': 1, 'leased': 0, 'created': 2, 'recycled': 1}
+
+
+def test_unhealthy_drivers_replaced(factory):
+    """ Verify drivers failing the health check are replaced """
+    pool = DriverPool(factory, size=1)
+    dead = pool.acquire()
+    type(dead).current_window_handle = mock.PropertyMock(side_effect=WebDriverException())
+    pool.release(dead)
+
+    with pool.lease() as driver:
+        assert driver is not dead
+    assert dead.quit.called
+    assert pool.stats()['recycled'] == 1
+
+
+def test_failed_reset_retires_driver(factory):
+    """ Verify a driver which can't be reset isn't returned to the pool """
+    pool = DriverPool(factory, size=1)
+
+    with pool.lease() as driver:
+        driver.delete_all_cookies.side_effect = WebDriverException()
+
+    assert driver.quit.called
+    assert pool.stats() == {'idle': 0, 'leased': 0, 'created': 1, 'recycled': 1}
+
+
+def test_dead_driver_process_frees_its_slot(factory):
+    """ Verify a driver failing with connection errors is retired, not leaked """
+    pool = DriverPool(factory, size=1)
+
+    with pool.lease() as dead:
+        dead.execute_script.side_effect = ConnectionRefusedError()
+        dead.quit.side_effect = ConnectionRefusedError()
+    assert pool.stats() == {'idle': 0, 'leased': 0, 'created': 1, 'recycled': 1}
+
+    with pool.lease(timeout=0.2) as driver:
+        assert driver is not dead
+
+
+def test_unreachable_driver_fails_health_check(factory):
+    """ Verify a health check raising a connection error replaces the driver """
+    pool = DriverPool(factory, size=1)
+    dead = pool.acquire()
+    type(dead).current_window_handle = mock.PropertyMock(side_effect=ConnectionRefusedError())
+    pool.release(dead)
+
+    with pool.lease(timeout=0.2) as driver:
+        assert driver is not dead
+    assert pool.stats()['leased'] == 0
+
+
+def test_reset_clears_element_cache(factory):
+    """ Verify a driver's element cache is emptied between leases """
+    pool = DriverPool(factory, size=1)
+
+    with pool.lease() as driver:
+        elem_cache = cache.enable(driver)
+        elem_cache.put(driver, 'css selector', 'div', mock.Mock())
+
+    assert len(elem_cache) == 0
+    cache.disable(driver)
+
+
+def test_lease_times_out_when_exhausted(factory):
+    """ Verify leasing from a fully leased pool times out """
+    pool = DriverPool(factory, size=1)
+
+    with pool.lease():
+        with pytest.raises(PoolExhausted):
+            pool.acquire(timeout=0.01)
+
+
+def test_lease_waits_for_release(factory):
+    """ Verify a waiting lease is handed the next released driver """
+    pool = DriverPool(factory, size=1, warm=0)
+    first = pool.acquire()
+    leased = []
+
+    waiter_thread = threading.Thread(target=lambda: leased.append(pool.acquire(timeout=5)))
+    waiter_thread.start()
+    pool.release(first)
+    waiter_thread.join()
+
+    assert leased == [first]
+    assert factory.call_count == 1
+
+
+def test_close_quits_drivers():
+    """ Verify closing the pool quits idle drivers, and leased ones on release """
+    drivers = [make_driver(), make_driver()]
+    pool = DriverPool(mock.Mock(side_effect=drivers), size=2)
+    leased = pool.acquire()
+
+    pool.close()
+    assert [driver.quit.called for driver in drivers] == [False, True]
+
+    pool.release(leased)
+    assert leased.quit.called
+    with pytest.raises(PoolExhausted):
+        pool.acquire()
@@ -0,0 +1,112 @@
+import json
+import time
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from explicit import profile, schedule, waiter, ID
+from explicit.profile import ProfileStore
+
+
+@pytest.fixture(scope="function")
+def store():
+    ''' Enables a profile store for the test, and returns it
+    '''
+    yield profile.enable(min_samples=3, floor=1.0)
+    profile.disable()
+
+
+def test_untuned_until_enough_samples():
+    """ Verify the given values are kept until a locator has min_samples samples """
+    store = ProfileStore(min_samples=3)
+    key = json.dumps([None, ID, 'user'])
+    store.record(key, 0.2)
+    store.record(key, 0.3)
+
+    assert store.tuned(key, 30, 0.5) == (30, 0.5)
+
+
+def test_tuned_from_samples():
+    """ Verify the timeout and schedule are derived from the samples """
+    store = ProfileStore(min_samples=3, margin=3.0, floor=1.0)
+    key = json.dumps([None, ID, 'user'])
+    for elapsed in (0.2, 0.1, 0.3, 0.5, 0.2):
+        store.record(key, elapsed)
+
+    timeout, poll = store.tuned(key, 30, 0.5)
+
+    assert timeout == pytest.approx(1.5)
+    assert isinstance(poll, schedule.Delayed)
+    assert poll.delay == 0.2
+    assert 0.02 <= poll.interval <= 0.5
+
+
+def test_pinned_values_override_samples():
+    """ Verify pinned values are used whatever the samples """
+    store = ProfileStore(min_samples=1)
+    key = json.dumps([None, ID, 'slow'])
+    store.record(key, 0.1)
+    store.pin(ID, 'slow', timeout=20)
+
+    assert store.tuned(key, 30, 0.5) == (20, 0.5)
+
+
+def test_samples_saved_and_loaded(tmpdir):
+    """ Verify a saved profile is loaded by a new store, keeping only recent samples """
+    path = str(tmpdir.join('profile.json'))
+    store = ProfileStore(path, keep=2)
+    for elapsed in (0.1, 0.2, 0.3):
+        store.record('key', elapsed)
+    store.save()
+
+    assert ProfileStore(path).samples('key') == [0.2, 0.3]
+
+
+def test_find_element_records_and_uses_tuning(store, driver, element):
+    """ Verify find_element records its time-to-found and then uses tuned values """
+    driver.find_element.return_value = element
+    for _ in range(3):
+        waiter.find_element(driver, "user", by=ID)
+    key = store.key(driver, ID, "user")
+    assert len(store.samples(key)) == 3
+
+    driver.find_element.return_value = None
+    driver.find_element.side_effect = None
+    started = time.time()
+    with pytest.raises(TimeoutException):
+        waiter.find_element(driver, "user", by=ID)
+    assert time.time() - started < 2
+
+
+def test_step_helpers_use_tuning(store, driver):
+    """ Verify find_write and find_click fail within the tuned timeout too """
+    key = store.key(driver, ID, "user")
+    for _ in range(3):
+        store.record(key, 0.01)
+    driver.find_element.return_value = None
+
+    for step in (lambda: waiter.find_write(driver, "user", "text", by=ID),
+                 lambda: waiter.find_click(driver, "user", by=ID)):
+        started = time.time()
+        with pytest.raises(TimeoutException):
+            step()
+        assert time.time() - started < 2
+
+
+def test_explicit_arguments_override_tuning(store, driver, element):
+    """ Verify a timeout passed by the caller isn't replaced, even when it's the default """
+    key = store.key(driver, ID, "user")
+    for _ in range(3):
+        store.record(key, 0.01)
+
+    assert waiter._tuning(driver, ID, "user", 5, 0.1) == (key, 5, 0.1)
+    assert waiter._tuning(driver, ID, "user", waiter.TIMEOUT, 0.5) == (key, waiter.TIMEOUT, 0.5)
+    assert waiter._tuning(driver, ID, "user", None, None)[1] == 1.0
+
+
+def test_pages_keyed_by_url_pattern(driver):
+    """ Verify samples are kept per page when a pattern is given """
+    store = ProfileStore(pattern=profile.url_pattern)
+    driver.current_url = 'https://shop.example/orders/1234?tab=items#top'
+
+    assert json.loads(store.key(driver, ID, "user"))[0] == 'https://shop.example/orders/{n}'
@@ -0,0 +1,139 @@
+import threading
+import time
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+import pytest
+
+from explicit import metrics, ratelimit, waiter
+from explicit.history import LocatorHistory
+from explicit.ratelimit import RateLimiter, TokenBucket
+
+
+@pytest.fixture(scope="function")
+def limited():
+    ''' Enables a command rate limit for the test, and returns the limiter
+    '''
+    yield ratelimit.enable(rate=100, burst=2)
+    ratelimit.disable()
+
+
+def test_bucket_refills_at_rate():
+    """ Verify the bucket allows a burst, then reports the wait for more tokens """
+    bucket = TokenBucket(rate=10, burst=2)
+
+    assert bucket.take() == 0
+    assert bucket.take() == 0
+    assert 0 < bucket.take() <= 0.1
+
+    time.sleep(0.1)
+    assert bucket.take() == 0
+
+
+def test_oversized_request_granted_when_full():
+    """ Verify a request larger than the burst is granted from a full bucket """
+    bucket = TokenBucket(rate=10, burst=2)
+
+    assert bucket.take(5) == 0
+    assert bucket.take() > 0.3
+
+
+def test_bucket_shared_through_file(tmpdir):
+    """ Verify buckets with the same state file share their tokens """
+    path = str(tmpdir.join('bucket'))
+    first = TokenBucket(rate=1, burst=2, path=path)
+    second = TokenBucket(rate=1, burst=2, path=path)
+
+    assert first.take() == 0
+    assert second.take() == 0
+    assert first.take() > 0
+
+
+def test_unreadable_state_file_read_as_full(tmpdir):
+    """ Verify a partly written state file is treated as a full bucket """
+    path = tmpdir.join('bucket')
+    path.write('{"tokens": 0.5, "upd')
+
+    assert TokenBucket(rate=1, burst=2, path=str(path)).take(2) == 0
+
+
+def test_failed_take_releases_turn():
+    """ Verify a poll whose take() raises doesn't block later polls """
+    limiter = RateLimiter(rate=1000)
+    with mock.patch.object(limiter.bucket, 'take', side_effect=OSError('disk full')):
+        with pytest.raises(OSError):
+            limiter.acquire('first')
+
+    thread = threading.Thread(target=limiter.acquire, args=('second',))
+    thread.start()
+    thread.join(1)
+
+    assert not thread.is_alive()
+    assert not limiter._queues and not limiter._turns
+
+
+def test_limiter_round_robin_across_drivers():
+    """ Verify waiting polls are granted alternately between drivers """
+    limiter = RateLimiter(rate=50, burst=1)
+    limiter.acquire('warm-up')
+    granted = []
+
+    def poll(driver):
+        limiter.acquire(driver)
+        granted.append(driver)
+
+    threads = [threading.Thread(target=poll, args=('busy',)) for _ in range(3)]
+    threads.append(threading.Thread(target=poll, args=('quiet',)))
+    for thread in threads:
+        thread.start()
+        time.sleep(0.002)
+    for thread in threads:
+        thread.join()
+
+    assert granted.index('quiet') <= 1
+    assert limiter.throttled_for('quiet') > 0
+    assert limiter.waits == 4
+
+
+def test_waiter_polls_throttled(limited, driver, element):
+    """ Verify waiter polls take tokens and record time spent throttled """
+    collected = []
+    metrics.add_sink(collected.append)
+    driver.find_element.side_effect = [None, None, None, None, element]
+
+    try:
+        waiter.find_element(driver, "div.mock-css-path", poll_frequency=0.001)
+    finally:
+        metrics.clear_sinks()
+
+    assert limited.waits >= 2
+    assert collected[0].throttled > 0
+    assert collected[0].to_dict()['throttled'] == collected[0].throttled
+
+
+def test_short_circuit_polls_take_a_token_per_command(limited, driver, element):
+    """ Verify polls sending a varying number of commands take a token for each
+    """
+    driver.find_elements_by_css_selector.side_effect = [[], [], [], [], [element]]
+
+    with mock.patch.object(limited, 'acquire', return_value=0) as acquire:
+        waiter.find_one(driver, ["div.a", "div.b", "div.c"], short_circuit=True,
+                        history=LocatorHistory(), poll_frequency=0.001)
+
+    assert driver.find_elements_by_css_selector.call_count == 5
+    assert sum(call[0][1] for call in acquire.call_args_list) == 5
+
+
+def test_actions_take_a_token_per_command(limited, driver, element):
+    """ Verify an action takes a token for every command it sends
+    """
+    driver.find_element.return_value = element
+
+    with mock.patch.object(limited, 'acquire', return_value=0) as acquire:
+        waiter.find_write(driver, "input", "text", send_enter=True)
+
+    # One lookup, then clear, send_keys and ENTER
+    assert [call[0][1] for call in acquire.call_args_list] == [1, 3]
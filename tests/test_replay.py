@@ -0,0 +1,155 @@
+import copy
+import json
+import time
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+import pytest
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from explicit import waiter, ID
+from explicit.replay import RecordingConnection, ReplayConnection, ReplayError, VirtualClock
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+NEW_SESSION = {'value': {'sessionId': 'session-1', 'capabilities': {'browserName': 'mock'}}}
+NOT_FOUND = {'status': 404, 'value': json.dumps(
+    {'value': {'error': 'no such element', 'message': 'Unable to locate element'}})}
+FOUND = {'value': {ELEMENT_KEY: 'element-1'}}
+
+
+def record(path, responses, session):
+    ''' Records session(driver) against a server answering with responses
+    '''
+    responses = [copy.deepcopy(response) for response in responses]
+    with mock.patch.object(RemoteConnection, '_request', side_effect=responses):
+        connection = RecordingConnection('http://127.0.0.1:4444', path, resolve_ip=False)
+        try:
+            return session(webdriver.Remote(connection, desired_capabilities={}))
+        finally:
+            connection.close()
+
+
+def replay(path, **kwargs):
+    ''' Returns a driver and connection replaying the recording at path
+    '''
+    connection = ReplayConnection(path, **kwargs)
+    return webdriver.Remote(connection, desired_capabilities={}), connection
+
+
+@pytest.mark.parametrize('name', ['session.replay', 'session.replay.gz'])
+def test_waiter_calls_replayed(tmpdir, name):
+    """ Verify a recorded find_element is replayed with the same polls and result """
+    path = str(tmpdir.join(name))
+    recorded = record(path, [NEW_SESSION, NOT_FOUND, NOT_FOUND, FOUND],
+                      lambda driver: waiter.find_element(driver, "user", by=ID,
+                                                         poll_frequency=0.01))
+
+    driver, connection = replay(path)
+    elem = waiter.find_element(driver, "user", by=ID, poll_frequency=0.01)
+
+    assert elem.id == recorded.id == 'element-1'
+    assert driver.session_id == 'session-1'
+    assert connection.remaining == 0
+
+
+def test_virtual_clock_replays_waits_instantly(tmpdir):
+    """ Verify a replayed wait under a virtual clock skips its sleeps, but keeps its polls """
+    path = str(tmpdir.join('session.replay'))
+    with VirtualClock():
+        record(path, [NEW_SESSION] + [NOT_FOUND] * 5 + [FOUND],
+               lambda driver: waiter.find_element(driver, "user", by=ID))
+
+    driver, connection = replay(path)
+    started = time.time()
+    with VirtualClock() as clock:
+        virtual_start = clock.now
+        elem = waiter.find_element(driver, "user", by=ID)
+
+    assert elem.id == 'element-1'
+    assert time.time() - started < 0.5
+    assert clock.now - virtual_start >= 2.5
+    assert connection.remaining == 0 and connection.repeated == 0
+    assert waiter.time is time
+
+
+def test_virtual_clock_replays_timeouts(tmpdir):
+    """ Verify a recorded 30 second timeout replays with the same number of polls """
+    path = str(tmpdir.join('session.replay'))
+    with VirtualClock(), pytest.raises(TimeoutException):
+        record(path, [NEW_SESSION] + [NOT_FOUND] * 100,
+               lambda driver: waiter.find_element(driver, "user", by=ID, timeout=30))
+
+    driver, connection = replay(path)
+    started = time.time()
+    with VirtualClock(), pytest.raises(TimeoutException):
+        waiter.find_element(driver, "user", by=ID, timeout=30)
+
+    assert time.time() - started < 1
+    assert connection.remaining == 0 and connection.repeated == 0
+
+
+def test_scripts_stored_once(tmpdir):
+    """ Verify a script sent on every poll is saved to the recording once """
+    path = str(tmpdir.join('session.replay'))
+    record(path, [NEW_SESSION, {'value': []}, {'value': []}, {'value': [[FOUND['value']]]}],
+           lambda driver: waiter.find_one(driver, ["div.a"], batch=True, poll_frequency=0.01))
+
+    with open(path) as recording:
+        assert recording.read().count('var explicitLocate') == 1
+
+    driver, connection = replay(path)
+    assert waiter.find_one(driver, ["div.a"], batch=True, poll_frequency=0.01).id == 'element-1'
+
+
+def test_extra_polls_repeat_last_response(tmpdir):
+    """ Verify a wait polling more often than recorded gets the last response again """
+    path = str(tmpdir.join('session.replay'))
+    with pytest.raises(TimeoutException):
+        record(path, [NEW_SESSION] + [NOT_FOUND] * 100,
+               lambda driver: waiter.find_element(driver, "user", by=ID, timeout=0.05,
+                                                  poll_frequency=0.02))
+
+    driver, connection = replay(path)
+    with pytest.raises(TimeoutException):
+        waiter.find_element(driver, "user", by=ID, timeout=0.05, poll_frequency=0.001)
+    assert connection.repeated > 0
+
+
+def test_divergent_command_raises(tmpdir):
+    """ Verify a command the recording doesn't have raises ReplayError """
+    path = str(tmpdir.join('session.replay'))
+    record(path, [NEW_SESSION, FOUND], lambda driver: waiter.find_element(driver, "user", by=ID))
+
+    driver, _ = replay(path)
+    with pytest.raises(ReplayError) as error:
+        waiter.find_element(driver, "password", by=ID)
+
+    assert "'[id=\"password\"]'" in str(error.value)
+    assert "'[id=\"user\"]'" in str(error.value)
+
+
+def test_session_replayed_with_other_capabilities(tmpdir):
+    """ Verify a session starts in replay whatever capabilities it requests """
+    path = str(tmpdir.join('session.replay'))
+    record(path, [NEW_SESSION, FOUND], lambda driver: waiter.find_element(driver, "user", by=ID))
+
+    driver = webdriver.Remote(ReplayConnection(path),
+                              desired_capabilities={'browserName': 'chrome'})
+
+    assert driver.session_id == 'session-1'
+    assert waiter.find_element(driver, "user", by=ID).id == 'element-1'
+
+
+def test_realtime_replay_keeps_latency(tmpdir):
+    """ Verify realtime replay delays responses by their recorded latency """
+    path = str(tmpdir.join('session.replay'))
+    record(path, [NEW_SESSION, FOUND], lambda driver: driver.title)
+
+    with mock.patch('explicit.replay.time.sleep') as sleep:
+        driver, _ = replay(path, realtime=True)
+    assert sleep.call_count == 1
@@ -0,0 +1,132 @@
+import socket
+import time
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+from selenium.common.exceptions import InvalidSessionIdException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from explicit import deadline
+from explicit.pool import DriverPool
+from explicit.runner import Runner, Task
+
+
+def test_run_returns_tasks_in_order():
+    """ Verify every workflow runs once and results come back in submission order """
+    drivers = [mock.Mock(name='driver{0}'.format(index)) for index in range(3)]
+    runner = Runner(drivers)
+
+    tasks = runner.run([lambda driver, n=n: (n, driver) for n in range(10)])
+
+    assert [task.result[0] for task in tasks] == list(range(10))
+    assert all(task.ok and task.attempts == 1 for task in tasks)
+    assert all(task.result[1] is drivers[task.worker] for task in tasks)
+    assert sum(stats['tasks'] for stats in runner.stats) == 10
+
+
+def test_idle_workers_steal_work():
+    """ Verify a worker whose queue runs dry takes tasks queued for a busy worker """
+    slow, fast = mock.Mock(name='slow'), mock.Mock(name='fast')
+    runner = Runner([slow, fast])
+
+    def workflow(driver):
+        time.sleep(0.2 if driver is slow else 0.01)
+
+    tasks = runner.run([workflow] * 10)
+
+    assert all(task.ok for task in tasks)
+    assert runner.stats[1]['stolen'] > 0
+    assert runner.stats[1]['tasks'] > runner.stats[0]['tasks']
+    assert 0 < runner.stats[0]['utilization'] <= 1
+
+
+def test_infrastructure_errors_retried_on_new_driver():
+    """ Verify infrastructure errors are retried on a replacement driver,
+        and workflow errors are not retried
+    """
+    dead, fresh = mock.Mock(name='dead'), mock.Mock(name='fresh')
+    flaky = mock.Mock(side_effect=[InvalidSessionIdException('gone'), 'done'])
+    broken = mock.Mock(side_effect=ValueError('bug'))
+    runner = Runner([dead], factory=mock.Mock(return_value=fresh))
+
+    tasks = runner.run([flaky, broken])
+
+    assert tasks[0].ok and tasks[0].result == 'done' and tasks[0].attempts == 2
+    assert flaky.call_args_list == [mock.call(dead), mock.call(fresh)]
+    assert dead.quit.called
+    assert runner.drivers == [fresh]
+    assert isinstance(tasks[1].error, ValueError) and tasks[1].attempts == 1
+
+
+def test_infrastructure_errors_not_retried_without_factory():
+    """ Verify a fixed driver isn't retried after an infrastructure error """
+    workflow = mock.Mock(side_effect=InvalidSessionIdException('gone'))
+
+    task, = Runner([mock.Mock()], retries=3).run([workflow])
+
+    assert isinstance(task.error, InvalidSessionIdException)
+    assert task.attempts == 1
+
+
+def test_retries_bounded():
+    """ Verify a task gives up after its retries are spent """
+    workflow = mock.Mock(side_effect=OSError('connection reset'))
+
+    runner = Runner([mock.Mock()], retries=1, factory=mock.Mock)
+    task, = runner.run([Task(workflow, retries=2)])
+
+    assert isinstance(task.error, OSError)
+    assert task.attempts == 3
+    assert not task.ok
+
+
+def test_refused_connections_retried():
+    """ Verify a remote end refusing connections, which Selenium reports with
+        urllib3's MaxRetryError, is retried as an infrastructure error
+    """
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    url = 'http://127.0.0.1:{0}'.format(listener.getsockname()[1])
+    listener.close()
+
+    def workflow(driver):
+        return RemoteConnection(url).execute(Command.STATUS, {})
+
+    task, = Runner([mock.Mock()], retries=2, factory=mock.Mock).run([workflow])
+
+    assert type(task.error).__name__ == 'MaxRetryError'
+    assert task.attempts == 3
+
+
+def test_no_retry_after_deadline():
+    """ Verify infrastructure errors aren't retried once the task's deadline passed """
+    def workflow(driver):
+        time.sleep(0.05)
+        raise OSError('connection reset')
+
+    task, = Runner([mock.Mock()], retries=5).run([workflow], deadline=0.01)
+
+    assert task.attempts == 1
+
+
+def test_tasks_run_inside_deadline():
+    """ Verify waits inside a task are bounded by the task's deadline """
+    task, = Runner([mock.Mock()]).run([lambda driver: deadline.remaining()], deadline=10)
+
+    assert 0 < task.result <= 10
+
+
+def test_pool_drivers_leased_per_attempt():
+    """ Verify a runner over a pool leases a driver for every attempt """
+    pool = DriverPool(lambda: mock.MagicMock(window_handles=['main']), size=2)
+    runner = Runner(pool)
+
+    tasks = runner.run([lambda driver: driver] * 4)
+
+    assert len(runner.stats) == 2
+    assert all(task.ok for task in tasks)
+    assert pool.stats()['leased'] == 0
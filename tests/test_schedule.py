@@ -0,0 +1,54 @@
+import itertools
+import random
+
+from explicit import schedule
+
+
+def take(sched, count):
+    return list(itertools.islice(sched.intervals(), count))
+
+
+def test_constant_schedule():
+    """ Verify a constant schedule always returns the same interval """
+    assert take(schedule.Constant(0.25), 4) == [0.25, 0.25, 0.25, 0.25]
+
+
+def test_delayed_schedule():
+    """ Verify a delayed schedule sleeps for the delay once, then at the interval """
+    assert take(schedule.Delayed(0.3, 0.05), 4) == [0.3, 0.05, 0.05, 0.05]
+
+
+def test_backoff_schedule_without_jitter():
+    """ Verify the backoff schedule polls fast, then backs off up to the max interval """
+    sched = schedule.Backoff(initial=0.1, factor=2, max_interval=0.5, fast_polls=2, jitter=0)
+
+    assert take(sched, 6) == [0.1, 0.1, 0.2, 0.4, 0.5, 0.5]
+
+
+def test_backoff_schedule_with_jitter():
+    """ Verify jitter spreads each interval within the configured fraction """
+    sched = schedule.Backoff(initial=0.1, factor=2, max_interval=1, fast_polls=1, jitter=0.5,
+                             rng=random.Random(1))
+    expected = [0.1, 0.2, 0.4, 0.8, 1, 1]
+
+    intervals = take(sched, 6)
+
+    assert intervals != expected
+    for interval, base in zip(intervals, expected):
+        assert base * 0.5 <= interval <= base * 1.5
+
+
+def test_backoff_schedules_restart_per_wait():
+    """ Verify each wait gets a fresh sequence of intervals """
+    sched = schedule.Backoff(initial=0.1, fast_polls=1, jitter=0)
+
+    assert take(sched, 3) == take(sched, 3)
+
+
+def test_as_schedule():
+    """ Verify poll frequencies are converted to schedules """
+    backoff = schedule.Backoff()
+
+    assert schedule.as_schedule(backoff) is backoff
+    assert take(schedule.as_schedule(0.2), 2) == [0.2, 0.2]
+    assert take(schedule.as_schedule(0), 2) == [schedule.POLL_FREQUENCY] * 2
@@ -0,0 +1,86 @@
+import pytest
+
+from explicit import waiter, CLASS_NAME, CSS, ID, LINK, NAME, PARTIAL_LINK, TAG, XPATH
+
+pytest.importorskip('lxml.html')
+pytest.importorskip('cssselect')
+
+PAGE = """<html><head><title>Rows</title></head><body>
+<table id="rows"><tbody>
+  <tr class="row odd" data-id="1"><td>One</td><td><a href="/1">Open  one</a></td></tr>
+  <tr class="row" data-id="2"><td>Two</td><td><a href="/2">Open two</a></td></tr>
+  <tr class="row odd" data-id="3"><td>Three</td><td><input name="qty"></td></tr>
+</tbody></table>
+</body></html>"""
+
+
+@pytest.fixture(scope="function")
+def snap(driver):
+    ''' Returns a snapshot of PAGE, taken with a mock driver
+    '''
+    driver.execute_script.side_effect = [None, PAGE]
+    return waiter.snapshot(driver, "table#rows", poll_frequency=0.01)
+
+
+def test_snapshot_waits_for_ready_page(driver, snap):
+    """ Verify the snapshot is taken once the page is ready, in one call per poll """
+    assert driver.execute_script.call_count == 2
+    script, by, path, root = driver.execute_script.call_args[0]
+    assert (by, path, root) == (CSS, "table#rows", None)
+
+
+@pytest.mark.parametrize("path, by, count", [
+    ("tr.row", CSS, 3),
+    ("//tr[@data-id='2']", XPATH, 1),
+    ("rows", ID, 1),
+    ("qty", NAME, 1),
+    ("td", TAG, 6),
+    ("odd", CLASS_NAME, 2),
+    ("Open one", LINK, 1),
+    ("Open", PARTIAL_LINK, 2),
+])
+def test_snapshot_resolves_locators(snap, path, by, count):
+    """ Verify every locator strategy is resolved against the snapshot """
+    assert len(snap.find_all(path, by=by)) == count
+
+
+def test_snapshot_reads_text_and_attributes(driver, snap):
+    """ Verify text and attributes are read without WebDriver commands """
+    rows = snap.find_all("tr.row")
+
+    assert [row.get_attribute("data-id") for row in rows] == ["1", "2", "3"]
+    assert [row.find_all("td")[0].text for row in rows] == ["One", "Two", "Three"]
+    assert snap.find("a").text == "Open one"
+    assert snap.find("missing") is None
+    assert driver.execute_script.call_count == 2
+
+
+def test_snapshot_fetches_live_elements(driver, element, snap):
+    """ Verify live elements are fetched for chosen nodes with one script call """
+    driver.execute_script.side_effect = [[[element], []]]
+    nodes = snap.find_all("input, a[href='/2']")
+
+    assert snap.live(nodes) == [element, None]
+    script, locators, root = driver.execute_script.call_args[0]
+    assert locators == [
+        [XPATH, "/*[local-name()='html']/*[local-name()='body'][1]/*[local-name()='table'][1]"
+                "/*[local-name()='tbody'][1]/*[local-name()='tr'][2]/*[local-name()='td'][2]"
+                "/*[local-name()='a'][1]"],
+        [XPATH, "/*[local-name()='html']/*[local-name()='body'][1]/*[local-name()='table'][1]"
+                "/*[local-name()='tbody'][1]/*[local-name()='tr'][3]/*[local-name()='td'][2]"
+                "/*[local-name()='input'][1]"],
+    ]
+
+
+def test_element_snapshot_uses_relative_paths(driver, element):
+    """ Verify snapshots beneath an element locate live nodes relative to it """
+    element.parent = driver
+    driver.execute_script.side_effect = ['<ul><li>One</li><li>Two</li></ul>', [[element]]]
+
+    snap = waiter.snapshot(element)
+    node = snap.find_all("li")[1]
+
+    assert node.live() is element
+    script, locators, root = driver.execute_script.call_args[0]
+    assert locators == [[XPATH, "./*[local-name()='li'][2]"]]
+    assert root is element
@@ -0,0 +1,82 @@
+import json
+
+try:
+    import mock
+except ImportError:
+    from unittest import mock
+
+import pytest
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from explicit import metrics, trace, waiter
+
+
+@pytest.fixture(scope="function")
+def tracer():
+    ''' Starts a tracer for the test, and returns it
+    '''
+    yield trace.start()
+    trace.stop()
+
+
+def spans(tracer, category):
+    return [event for event in tracer.events if event.get('cat') == category]
+
+
+def test_calls_and_polls_traced(tracer, driver, element):
+    """ Verify waiter calls and their polls are recorded as nested spans """
+    driver.session_id = 'session-1'
+    driver.find_element.side_effect = [None, element]
+
+    waiter.find_element(driver, "div.mock-css-path", poll_frequency=0.01)
+
+    call, = spans(tracer, 'call')
+    polls = spans(tracer, 'poll')
+    assert call['name'] == 'find_element'
+    assert call['args']['polls'] == 2
+    assert len(polls) == 2
+    assert all(poll['tid'] == call['tid'] for poll in polls)
+    assert call['ts'] <= polls[0]['ts'] and polls[-1]['ts'] <= call['ts'] + call['dur']
+
+    lane, = [event for event in tracer.events if event['ph'] == 'M']
+    assert lane['args'] == {'name': 'session-1'} and lane['tid'] == call['tid']
+
+
+def test_sessions_get_separate_lanes(tracer, driver, element):
+    """ Verify each session is given its own lane """
+    driver.find_element.return_value = element
+    for session in ('a', 'b', 'a'):
+        driver.session_id = session
+        waiter.find_element(driver, "div.mock-css-path")
+
+    assert [call['tid'] for call in spans(tracer, 'call')] == [1, 2, 1]
+
+
+def test_commands_traced():
+    """ Verify commands sent through RemoteConnection are recorded with their session """
+    connection = RemoteConnection('http://127.0.0.1:4444')
+    with mock.patch.object(RemoteConnection, '_request', return_value={'value': None}):
+        with trace.Tracer() as tracer:
+            connection.execute('getTitle', {'sessionId': 'session-1'})
+        connection.execute('getTitle', {'sessionId': 'session-1'})
+
+    command, = spans(tracer, 'command')
+    assert command['name'] == 'getTitle'
+    assert RemoteConnection.execute is trace._original_execute
+
+
+def test_trace_saved_on_stop(tmpdir, driver, element):
+    """ Verify the trace is written as Chrome trace event JSON when tracing stops """
+    path = str(tmpdir.join('run.trace.json'))
+    driver.find_element.return_value = element
+
+    trace.start(path)
+    waiter.find_element(driver, "div.mock-css-path")
+    trace.stop()
+
+    with open(path) as trace_file:
+        data = json.load(trace_file)
+    assert [event['name'] for event in data['traceEvents'] if event['ph'] == 'X'] == [
+        'poll', 'find_element']
+    assert trace.tracer() is None
+    assert metrics.current() is None
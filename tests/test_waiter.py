@@ -3,9 +3,15 @@ try:
 except ImportError:
     from unittest import mock
 
+import pytest
+from selenium.common.exceptions import (
+    NoSuchElementException, NoSuchFrameException, StaleElementReferenceException, TimeoutException,
+    WebDriverException)
 from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.webelement import WebElement
 
-from explicit import waiter, CSS, ID, XPATH
+from explicit import ratelimit, schedule, waiter, CSS, ID, XPATH
+from explicit.history import LocatorHistory
 
 
 def test_find_element_with_defaults(driver, element):
@@ -162,3 +168,524 @@ def test_find_one_with_non_defaults(driver, element):
                                    mock.call.find_elements_by_id(id_2),
                                    mock.call.find_elements_by_id(id_1),
                                    mock.call.find_elements_by_id(id_2)]
+
+
+def test_find_one_batched(driver, element):
+    """ Verify the waiter resolves all locators in one script call per poll
+        when batching is enabled
+    """
+    driver.execute_script.side_effect = [[[], []], [[element, ], []]]
+
+    id_1 = 'mock_1'
+    id_2 = 'mock_2'
+
+    elem = waiter.find_one(driver, [id_1, id_2], elem_type=ID, batch=True)
+
+    assert elem is element
+    assert driver.execute_script.call_count == 2
+    assert not driver.find_elements_by_id.called
+    script, locators, root = driver.execute_script.call_args[0]
+    assert locators == [[ID, id_1], [ID, id_2]]
+    assert root is None
+
+
+def test_find_one_batched_from_element(driver, element):
+    """ Verify batched find_one searches beneath an element, using the
+        element's parent driver to run the script
+    """
+    child = mock.create_autospec(WebElement)
+    element.parent = driver
+    driver.execute_script.return_value = [[child, ], [child, ]]
+
+    elems = waiter.find_one(element, ['div.one', 'div.two'], batch=True)
+
+    assert elems == [child, child]
+    script, locators, root = driver.execute_script.call_args[0]
+    assert locators == [[CSS, 'div.one'], [CSS, 'div.two']]
+    assert root is element
+
+
+def test_find_element_observed(driver, element):
+    """ Verify the waiter can wait for an element with an in-browser observer
+    """
+    mock_css_path = "div.mock-css-path"
+
+    driver.execute_async_script.side_effect = [None, [element, element]]
+
+    elem = waiter.find_element(driver, mock_css_path, observe=True, poll_frequency=0.01)
+
+    assert elem is element
+    assert driver.execute_async_script.call_count == 2
+    assert not driver.find_element.called
+    script, by, path, root, window = driver.execute_async_script.call_args[0]
+    assert (by, path, root) == (CSS, mock_css_path, None)
+    assert 0 < window <= waiter.OBSERVE_WINDOW * 1000
+
+
+def test_find_elements_observed_falls_back_to_polling(driver, element):
+    """ Verify the observed wait falls back to polling when the driver
+        can't execute async scripts
+    """
+    mock_xpath_path = "div[@id=mock-id]"
+
+    driver.execute_async_script.side_effect = WebDriverException("unsupported")
+    driver.find_elements.side_effect = [[], [element, element]]
+
+    elem_list = waiter.find_elements(driver, mock_xpath_path, by=XPATH, observe=True,
+                                     poll_frequency=0.01)
+
+    assert elem_list == [element, element]
+    assert driver.execute_async_script.call_count == 1
+    assert driver.find_elements.call_args_list == [mock.call(XPATH, mock_xpath_path),
+                                                   mock.call(XPATH, mock_xpath_path)]
+
+
+def test_find_element_with_poll_schedule(driver, element):
+    """ Verify the waiter sleeps according to a poll schedule """
+    mock_css_path = "div.mock-css-path"
+    sched = schedule.Backoff(initial=0.01, factor=3, max_interval=1, fast_polls=2, jitter=0)
+
+    driver.find_element.side_effect = [None, None, None, None, element]
+
+    with mock.patch('explicit.waiter.time.sleep') as sleep:
+        elem = waiter.find_element(driver, mock_css_path, poll_frequency=sched)
+
+    assert elem is element
+    assert driver.find_element.call_count == 5
+    assert sleep.call_args_list == [mock.call(0.01), mock.call(0.01),
+                                    mock.call(0.03), mock.call(0.09)]
+
+
+def test_find_one_with_poll_schedule(driver, element):
+    """ Verify find_one accepts a poll schedule """
+    driver.find_elements_by_css_selector.side_effect = [[], [element, ]]
+
+    with mock.patch('explicit.waiter.time.sleep') as sleep:
+        elem = waiter.find_one(driver, ['div.mock_1'], poll_frequency=schedule.Constant(0.2))
+
+    assert elem is element
+    assert sleep.call_args_list == [mock.call(0.2)]
+
+
+def test_find_write_many_with_js(driver, element):
+    """ Verify the waiter can locate and fill several fields with one script
+        call per poll
+    """
+    other = mock.create_autospec(WebElement)
+    driver.execute_script.side_effect = [None, [element, other]]
+
+    fields = {"input.user": "my_username", (ID, "password"): "my_password"}
+    elems = waiter.find_write_many(driver, fields, poll_frequency=0.01)
+
+    assert elems == {"input.user": element, (ID, "password"): other}
+    assert driver.execute_script.call_count == 2
+    script, fill, clear_first, root = driver.execute_script.call_args[0]
+    assert fill == [[CSS, "input.user", "my_username"], [ID, "password", "my_password"]]
+    assert clear_first is True
+    assert root is None
+    assert not element.send_keys.called
+
+
+def test_find_write_many_with_send_keys(driver, element):
+    """ Verify the waiter can fill several fields with real key presses
+    """
+    other = mock.create_autospec(WebElement)
+    driver.execute_script.side_effect = [[[element], []], [[element], [other]]]
+
+    fields = {"user": "my_username", "password": "my_password"}
+    waiter.find_write_many(driver, fields, by=ID, clear_first=False, send_enter=True,
+                           poll_frequency=0.01, use_js=False)
+
+    assert driver.execute_script.call_args[0][1] == [[ID, "user"], [ID, "password"]]
+    assert not element.clear.called
+    assert element.send_keys.call_args_list == [mock.call("my_username")]
+    assert other.send_keys.call_args_list == [mock.call("my_password"), mock.call(Keys.ENTER)]
+
+
+@pytest.mark.parametrize("use_js", [True, False])
+def test_find_write_many_with_no_fields(driver, use_js):
+    """ Verify no fields are written, and nothing waited for, without polling
+    """
+    assert waiter.find_write_many(driver, {}, send_enter=True, use_js=use_js) == {}
+    assert not driver.mock_calls
+
+
+def test_wait_all(driver, element):
+    """ Verify the waiter waits for every locator and condition in one poll loop
+    """
+    header, footer = element, mock.create_autospec(WebElement)
+    driver.execute_script.side_effect = [[[header], []], [[header], [footer]]]
+    condition = mock.Mock(side_effect=[True, "ready"])
+
+    found = waiter.wait_all(driver, ["div.header", (ID, "footer"), condition],
+                            poll_frequency=0.01)
+
+    assert found == {"div.header": [header], (ID, "footer"): [footer], condition: "ready"}
+    assert driver.execute_script.call_count == 2
+    assert driver.execute_script.call_args[0][1] == [[CSS, "div.header"], [ID, "footer"]]
+    assert condition.call_args_list == [mock.call(driver), mock.call(driver)]
+
+
+def test_wait_all_with_duplicate_locators(driver, element):
+    """ Verify a locator given twice is satisfied by its single match
+    """
+    driver.execute_script.return_value = [[element]]
+
+    found = waiter.wait_all(driver, ["div.header", "div.header"], timeout=0.05)
+
+    assert found == {"div.header": [element]}
+    assert driver.execute_script.call_args[0][1] == [[CSS, "div.header"]]
+
+
+def test_wait_any(driver, element):
+    """ Verify the waiter returns as soon as any locator is found
+    """
+    driver.execute_script.side_effect = [[[], []], [[], [element]]]
+
+    found = waiter.wait_any(driver, ["div.spinner", "div.results"], poll_frequency=0.01)
+
+    assert found == {"div.results": [element]}
+    assert driver.execute_script.call_count == 2
+
+
+def test_wait_all_with_no_locators(driver):
+    """ Verify waiting for nothing returns at once
+    """
+    assert waiter.wait_all(driver, []) == {}
+    assert not driver.mock_calls
+
+
+def test_wait_any_with_no_locators(driver):
+    """ Verify waiting for any of nothing raises rather than timing out
+    """
+    with pytest.raises(ValueError):
+        waiter.wait_any(driver, [])
+    assert not driver.mock_calls
+
+
+def test_find_one_short_circuit(driver, element):
+    """ Verify a short-circuited find_one tries the most matched locator first,
+        and stops polling locators at the first match
+    """
+    hist = LocatorHistory()
+    locators = ['div.mock_1', 'div.mock_2', 'div.mock_3']
+    hist.record(locators, CSS, 'div.mock_3')
+
+    driver.find_elements_by_css_selector.side_effect = [[], [], [], [element, ]]
+
+    elem = waiter.find_one(driver, locators, short_circuit=True, history=hist,
+                           poll_frequency=0.01)
+
+    assert elem is element
+    assert driver.method_calls == [mock.call.find_elements_by_css_selector('div.mock_3'),
+                                   mock.call.find_elements_by_css_selector('div.mock_1'),
+                                   mock.call.find_elements_by_css_selector('div.mock_2'),
+                                   mock.call.find_elements_by_css_selector('div.mock_3')]
+    assert hist.hits(locators, CSS) == {'div.mock_3': 2}
+
+
+def test_find_texts(driver):
+    """ Verify the waiter reads every element's text with one script call per poll
+    """
+    driver.execute_script.side_effect = [None, {"total": 2, "values": ["One", "Two"]}]
+
+    texts = waiter.find_texts(driver, "td.name", poll_frequency=0.01)
+
+    assert texts == ["One", "Two"]
+    assert driver.execute_script.call_count == 2
+    script, by, path, names, root, start, count = driver.execute_script.call_args[0]
+    assert (by, path, names, root, start, count) == (CSS, "td.name", None, None, 0, None)
+
+
+def test_find_attrs(driver):
+    """ Verify the waiter reads every element's attributes with one script call
+    """
+    driver.execute_script.return_value = {"total": 2, "values": [["/1", "1"], ["/2", None]]}
+
+    attrs = waiter.find_attrs(driver, "a", ["href", "data-id"])
+
+    assert attrs == [{"href": "/1", "data-id": "1"}, {"href": "/2", "data-id": None}]
+    assert driver.execute_script.call_args[0][3] == ["href", "data-id"]
+
+
+def test_iter_attrs_reads_in_chunks(driver):
+    """ Verify the lazy reader fetches one chunk per script call, on demand
+    """
+    driver.execute_script.side_effect = [{"total": 5, "values": [["1"], ["2"]]},
+                                         {"total": 5, "values": [["3"], ["4"]]},
+                                         {"total": 5, "values": [["5"]]}]
+
+    rows = waiter.iter_attrs(driver, "tr", ["data-id"], chunk_size=2)
+
+    assert next(rows) == {"data-id": "1"}
+    assert driver.execute_script.call_count == 1
+    assert [row["data-id"] for row in rows] == ["2", "3", "4", "5"]
+    assert [c[0][5:] for c in driver.execute_script.call_args_list] == [(0, 2), (2, 2), (4, 2)]
+
+
+def test_iter_texts_stops_when_elements_vanish(driver):
+    """ Verify the lazy reader stops if the elements disappear between chunks
+    """
+    driver.execute_script.side_effect = [{"total": 4, "values": ["a", "b"]}, None]
+
+    assert list(waiter.iter_texts(driver, "li", chunk_size=2)) == ["a", "b"]
+
+
+def test_iter_texts_rejects_empty_chunks(driver):
+    """ Verify a chunk size below 1 is rejected up front
+    """
+    with pytest.raises(ValueError):
+        waiter.iter_texts(driver, "li", chunk_size=0)
+
+    assert not driver.execute_script.called
+
+
+def test_iter_texts_later_chunks_throttled(driver):
+    """ Verify chunks read after the wait still take rate limit tokens
+    """
+    driver.execute_script.side_effect = [{"total": 4, "values": ["a", "b"]},
+                                         {"total": 4, "values": ["c", "d"]}]
+    limiter = ratelimit.enable(rate=1000)
+    try:
+        with mock.patch.object(limiter, 'acquire', wraps=limiter.acquire) as acquire:
+            assert list(waiter.iter_texts(driver, "li", chunk_size=2)) == ["a", "b", "c", "d"]
+    finally:
+        ratelimit.disable()
+
+    assert acquire.call_count == 2
+
+
+def test_find_write_relocates_stale_element(driver, element):
+    """ Verify a write to an element which went stale is retried on a fresh lookup
+    """
+    stale = mock.create_autospec(WebElement)
+    stale.send_keys.side_effect = StaleElementReferenceException()
+    driver.find_element.side_effect = [stale, element]
+
+    elem = waiter.find_write(driver, "input.name", "mock write string")
+
+    assert elem is element
+    assert driver.find_element.call_count == 2
+    assert element.send_keys.call_args == mock.call("mock write string")
+
+
+def test_find_write_gives_up_after_retries(driver):
+    """ Verify the stale error is raised once the retries are spent
+    """
+    stale = mock.create_autospec(WebElement)
+    stale.clear.side_effect = StaleElementReferenceException()
+    driver.find_element.return_value = stale
+
+    with pytest.raises(StaleElementReferenceException):
+        waiter.find_write(driver, "input.name", "mock write string", retries=2)
+
+    assert driver.find_element.call_count == 3
+
+
+def test_find_click_waits_for_clickable(driver, element):
+    """ Verify find_click waits for the element to be displayed and enabled
+    """
+    driver.find_element.return_value = element
+    element.is_displayed.return_value = True
+    element.is_enabled.side_effect = [False, False, True, True]
+
+    elem = waiter.find_click(driver, "button.submit", poll_frequency=0.01)
+
+    # Three polls, then the check repeated before clicking
+    assert elem is element
+    assert element.is_enabled.call_count == 4
+    assert element.click.call_count == 1
+
+
+def test_find_click_relocates_element_going_stale_while_waiting(driver, element):
+    """ Verify an element going stale while waiting to be clickable is located again
+    """
+    stale = mock.create_autospec(WebElement)
+    stale.is_displayed.side_effect = StaleElementReferenceException()
+    driver.find_element.side_effect = [stale, element]
+
+    assert waiter.find_click(driver, "button.submit") is element
+    assert not stale.click.called
+    assert element.click.called
+
+
+def test_find_select_chooses_option(driver, element):
+    """ Verify find_select selects an option by value
+    """
+    option = mock.create_autospec(WebElement)
+    option.is_selected.return_value = False
+    driver.find_element.return_value = element
+    element.tag_name = "select"
+    element.get_attribute.return_value = None
+    element.find_elements.return_value = [option]
+
+    waiter.find_select(driver, "select.country", "nz", select_by="value")
+
+    assert element.find_elements.call_args == mock.call(CSS, 'option[value ="nz"]')
+    assert option.click.called
+
+
+def test_find_select_missing_option_raises(driver, element):
+    """ Verify selecting an option the select doesn't have fails straight away
+    """
+    driver.find_element.return_value = element
+    element.tag_name = "select"
+    element.get_attribute.return_value = None
+    element.find_elements.return_value = []
+
+    with pytest.raises(NoSuchElementException):
+        waiter.find_select(driver, "select.country", "xx", select_by="value", timeout=1)
+
+
+class FramedPage(object):
+    ''' Fakes the frame switching and search script of a page with nested frames
+    '''
+    def __init__(self, tree, target):
+        self.tree = tree
+        self.target = target
+        self.current = []
+        self.scripts = 0
+        self.switch_to = mock.Mock()
+        self.switch_to.default_content.side_effect = lambda: self.current.clear()
+        self.switch_to.frame.side_effect = self.current.append
+        self.switch_to.parent_frame.side_effect = self.current.pop
+
+    def execute_script(self, script, by, path):
+        self.scripts += 1
+        frames = self.tree.get(tuple(self.current), [])
+        found = [self.target] if tuple(self.current) == self.target[0] else []
+        return {'found': found, 'frames': frames}
+
+
+def test_find_element_in_frames_searches_nested_frames():
+    """ Verify frames are searched depth first, and the frame path returned
+    """
+    page = FramedPage({(): ['ad', 'widget'], ('widget',): ['inner']},
+                      (('widget', 'inner'), 'button'))
+
+    elem, frame_path = waiter.find_element_in_frames(page, "button.buy")
+
+    assert elem == page.target
+    assert frame_path == ['widget', 'inner']
+    assert page.current == ['widget', 'inner']
+    assert page.scripts == 4
+
+
+def test_find_element_in_frames_retries_last_frame_first():
+    """ Verify the frame the element was last found in is searched first
+    """
+    page = FramedPage({(): ['ad', 'widget']}, (('widget',), 'button'))
+    search = waiter._FrameSearch(CSS, "button.buy")
+
+    assert search(page)
+    page.scripts = 0
+
+    assert search(page) == [page.target]
+    assert page.scripts == 1
+    assert search.frame_path == ['widget']
+
+
+def test_find_element_in_frames_retries_after_frame_detaches():
+    """ Verify a frame detaching mid-search is retried on the next poll, from the top
+    """
+    page = FramedPage({(): ['widget']}, (('widget',), 'button'))
+    search_frame = page.execute_script
+    detached = []
+
+    def execute_script(script, by, path):
+        if page.current and not detached:
+            detached.append(True)
+            raise NoSuchFrameException()
+        return search_frame(script, by, path)
+    page.execute_script = execute_script
+
+    elem, frame_path = waiter.find_element_in_frames(page, "button.buy", poll_frequency=0.01)
+
+    assert elem == page.target
+    assert frame_path == ['widget']
+    assert detached
+
+
+def test_switch_to_frame_path(driver):
+    """ Verify switching into a frame path starts from the top level document
+    """
+    waiter.switch_to_frame_path(driver, ['outer', 'inner'])
+
+    assert driver.switch_to.mock_calls == [mock.call.default_content(), mock.call.frame('outer'),
+                                           mock.call.frame('inner')]
+
+
+def test_find_element_ready_first(driver, element):
+    """ Verify readiness and presence are checked together, with one script per poll
+    """
+    driver.execute_script.side_effect = [None, [], [element]]
+
+    elem = waiter.find_element(driver, "div.results", ready_first=True, poll_frequency=0.01)
+
+    assert elem is element
+    assert driver.execute_script.call_count == 3
+    assert driver.execute_script.call_args[0][1:] == (CSS, "div.results", None)
+    assert not driver.find_element.called
+
+
+def test_find_click_ready_first(driver, element):
+    """ Verify the step helpers locate their element once the page is ready
+    """
+    driver.execute_script.side_effect = [None, [element]]
+
+    assert waiter.find_click(driver, "button.buy", ready_first=True, wait_for=None,
+                             poll_frequency=0.01) is element
+
+    assert driver.execute_script.call_count == 2
+    assert element.click.called
+    assert not driver.find_element.called
+
+
+def test_wait_ready(driver):
+    """ Verify wait_ready polls until the page is loaded and requests have settled
+    """
+    driver.execute_script.side_effect = [
+        {"ready": False, "state": "interactive", "pending": 0},
+        {"ready": False, "state": "complete", "pending": 2},
+        {"ready": True, "state": "complete", "pending": 0}]
+
+    readiness = waiter.wait_ready(driver, poll_frequency=0.01)
+
+    assert readiness == {"ready": True, "state": "complete", "pending": 0}
+    assert driver.execute_script.call_count == 3
+
+
+def test_wait_gone_checks_all_locators_in_one_script(driver):
+    """ Verify wait_gone polls every locator with a single script call
+    """
+    driver.execute_script.side_effect = [False, False, True]
+
+    assert waiter.wait_gone(driver, ["div.spinner", (ID, "overlay")], poll_frequency=0.01)
+
+    assert driver.execute_script.call_count == 3
+    _, targets, visible_only, root = driver.execute_script.call_args[0]
+    assert targets == [[CSS, "div.spinner"], [ID, "overlay"]]
+    assert (visible_only, root) == (False, None)
+
+
+def test_wait_invisible_times_out(driver):
+    """ Verify wait_invisible raises once the timeout passes with an element still displayed
+    """
+    driver.execute_script.return_value = False
+
+    with pytest.raises(TimeoutException):
+        waiter.wait_invisible(driver, "div.modal", timeout=0.05, poll_frequency=0.01)
+
+    assert driver.execute_script.call_args[0][1:] == ([[CSS, "div.modal"]], True, None)
+
+
+def test_wait_gone_observed_falls_back_to_polling(driver):
+    """ Verify the observed disappearance wait falls back to the polling script
+    """
+    driver.execute_async_script.side_effect = WebDriverException("unsupported")
+    driver.execute_script.side_effect = [False, True]
+
+    assert waiter.wait_gone(driver, "div.spinner", observe=True, poll_frequency=0.01)
+
+    assert driver.execute_async_script.call_count == 1
+    assert driver.execute_script.call_count == 2